@@ -8,16 +8,16 @@ from sqlalchemy import pool
 
 from alembic import context
 
-# Add backend directory to path so we can import our models
-backend_path = Path(__file__).parent.parent / "backend"
-sys.path.insert(0, str(backend_path))
+# Add project root to path so we can import the backend package
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
 # Import our database models
-from db_models import Base
+from backend.db_models import Base
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
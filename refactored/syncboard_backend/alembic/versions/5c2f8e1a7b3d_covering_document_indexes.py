@@ -0,0 +1,35 @@
+"""Covering and recency indexes on documents
+
+Revision ID: 5c2f8e1a7b3d
+Revises: 433d6fa5c900
+Create Date: 2026-10-15 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2f8e1a7b3d'
+down_revision: Union[str, Sequence[str], None] = '433d6fa5c900'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('idx_doc_owner_cluster', table_name='documents')
+    op.create_index(
+        'idx_doc_owner_cluster', 'documents', ['owner_username', 'cluster_id'], unique=False,
+        postgresql_include=['source_type', 'skill_level', 'ingested_at']
+    )
+    op.create_index('idx_doc_cluster_recent', 'documents', ['cluster_id', 'ingested_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_doc_cluster_recent', table_name='documents')
+    op.drop_index('idx_doc_owner_cluster', table_name='documents')
+    op.create_index('idx_doc_owner_cluster', 'documents', ['owner_username', 'cluster_id'], unique=False)
@@ -0,0 +1,81 @@
+"""Normalize concept names into a concept_terms dictionary table
+
+Revision ID: a3b9d7e4f1c6
+Revises: 5c2f8e1a7b3d
+Create Date: 2026-10-15 10:48:55.901447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3b9d7e4f1c6'
+down_revision: Union[str, Sequence[str], None] = '5c2f8e1a7b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('concept_terms',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name', 'category', name='uq_concept_terms_name_category')
+    )
+    op.create_index(op.f('ix_concept_terms_name'), 'concept_terms', ['name'], unique=False)
+    op.create_index(op.f('ix_concept_terms_category'), 'concept_terms', ['category'], unique=False)
+
+    # One term per distinct (name, category): every row keeps its category
+    op.execute(
+        "INSERT INTO concept_terms (name, category) "
+        "SELECT DISTINCT name, category FROM concepts"
+    )
+
+    op.add_column('concepts', sa.Column('term_id', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE concepts SET term_id = "
+        "(SELECT concept_terms.id FROM concept_terms "
+        "WHERE concept_terms.name = concepts.name AND concept_terms.category = concepts.category)"
+    )
+
+    op.drop_index(op.f('ix_concepts_name'), table_name='concepts')
+    op.drop_index(op.f('ix_concepts_category'), table_name='concepts')
+    op.drop_index('idx_concept_name_category', table_name='concepts')
+    with op.batch_alter_table('concepts') as batch_op:
+        batch_op.alter_column('term_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_concepts_term_id', 'concept_terms', ['term_id'], ['id'])
+        batch_op.create_index(batch_op.f('ix_concepts_term_id'), ['term_id'], unique=False)
+        batch_op.drop_column('name')
+        batch_op.drop_column('category')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('concepts') as batch_op:
+        batch_op.add_column(sa.Column('name', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('category', sa.String(length=100), nullable=True))
+
+    op.execute(
+        "UPDATE concepts SET "
+        "name = (SELECT concept_terms.name FROM concept_terms WHERE concept_terms.id = concepts.term_id), "
+        "category = (SELECT concept_terms.category FROM concept_terms WHERE concept_terms.id = concepts.term_id)"
+    )
+
+    with op.batch_alter_table('concepts') as batch_op:
+        batch_op.alter_column('name', existing_type=sa.String(length=255), nullable=False)
+        batch_op.alter_column('category', existing_type=sa.String(length=100), nullable=False)
+        batch_op.drop_index(batch_op.f('ix_concepts_term_id'))
+        batch_op.drop_constraint('fk_concepts_term_id', type_='foreignkey')
+        batch_op.drop_column('term_id')
+
+    op.create_index('idx_concept_name_category', 'concepts', ['name', 'category'], unique=False)
+    op.create_index(op.f('ix_concepts_category'), 'concepts', ['category'], unique=False)
+    op.create_index(op.f('ix_concepts_name'), 'concepts', ['name'], unique=False)
+    op.drop_index(op.f('ix_concept_terms_category'), table_name='concept_terms')
+    op.drop_index(op.f('ix_concept_terms_name'), table_name='concept_terms')
+    op.drop_table('concept_terms')
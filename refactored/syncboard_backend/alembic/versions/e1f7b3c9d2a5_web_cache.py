@@ -0,0 +1,35 @@
+"""Add web_cache table for conditional GETs of web articles
+
+Revision ID: e1f7b3c9d2a5
+Revises: a3b9d7e4f1c6
+Create Date: 2026-10-15 13:02:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f7b3c9d2a5'
+down_revision: Union[str, Sequence[str], None] = 'a3b9d7e4f1c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('web_cache',
+    sa.Column('url', sa.String(length=2048), nullable=False),
+    sa.Column('etag', sa.String(length=512), nullable=True),
+    sa.Column('last_modified', sa.String(length=64), nullable=True),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('url')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('web_cache')
@@ -3,10 +3,12 @@ Real AI generation with RAG (Retrieval Augmented Generation).
 Uses OpenAI to generate content based on user's knowledge bank.
 """
 
-import os
+import asyncio
 import logging
 from typing import Dict, List, Optional
-import openai
+from openai import AsyncOpenAI
+
+from .dependencies import get_llm_provider
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +19,10 @@ MODELS = {
     "gpt-4": "gpt-4-turbo-preview",
 }
 
-# Initialize OpenAI client
-openai.api_key = os.getenv("OPENAI_API_KEY")
+
+def _get_client() -> AsyncOpenAI:
+    """Return the AsyncOpenAI client of the shared provider (pooled connections)."""
+    return get_llm_provider().client
 
 
 async def generate_with_rag(
@@ -44,7 +48,9 @@ async def generate_with_rag(
         Generated text response
     """
     # Get relevant documents using semantic search
-    search_results = vector_store.search(prompt, top_k=top_k, allowed_doc_ids=allowed_doc_ids)
+    search_results = await asyncio.to_thread(
+        vector_store.search, prompt, top_k=top_k, allowed_doc_ids=allowed_doc_ids
+    )
 
     # Filter to only user's documents
     relevant_docs = []
@@ -82,7 +88,7 @@ Please answer this question: {prompt}"""
 
     # Call OpenAI API
     try:
-        response = openai.chat.completions.create(
+        response = await _get_client().chat.completions.create(
             model=MODELS.get(model, "gpt-4o-mini"),
             messages=[
                 {"role": "system", "content": system_message},
@@ -19,6 +19,7 @@ from .db_models import (
     DBDocument,
     DBCluster,
     DBConcept,
+    DBConceptTerm,
     DBUser,
     DBVectorDocument
 )
@@ -251,17 +252,18 @@ class AnalyticsService:
             List of concepts with their occurrence counts
         """
         query = self.db.query(
-            DBConcept.name,  # FIX: Field is 'name' not 'concept_text'
+            DBConceptTerm.name,
             func.count(DBConcept.id).label('count')
-        )
+        ).select_from(DBConcept).join(DBConceptTerm, DBConcept.term_id == DBConceptTerm.id)
 
         if username:
-            query = query.join(DBDocument).filter(
+            query = query.join(DBDocument, DBConcept.document_id == DBDocument.id).filter(
                 DBDocument.owner_username == username
             )
 
+        # Group by name: a name saved under several categories is one concept here
         results = query.group_by(
-            DBConcept.name  # FIX: Field is 'name' not 'concept_text'
+            DBConceptTerm.name
         ).order_by(
             func.count(DBConcept.id).desc()
         ).limit(limit).all()
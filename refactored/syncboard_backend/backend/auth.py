@@ -2,17 +2,30 @@
 Authentication Module for SyncBoard 3.0 Knowledge Bank.
 
 Provides:
-- Password hashing (bcrypt with unique salts)
+- Password hashing (Argon2id when argon2-cffi is installed, bcrypt otherwise)
 - JWT token creation and verification
 - Secure authentication helpers
 """
 
 import os
+import hmac
+import time
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 
-from .constants import JWT_ALGORITHM, DEFAULT_TOKEN_EXPIRE_MINUTES
+from .constants import (
+    JWT_ALGORITHM,
+    DEFAULT_TOKEN_EXPIRE_MINUTES,
+    PASSWORD_VERIFY_CACHE_SIZE,
+    PASSWORD_VERIFY_CACHE_TTL_SECONDS,
+    TOKEN_CACHE_SIZE,
+)
 
 # =============================================================================
 # Configuration
@@ -27,8 +40,39 @@ if not SECRET_KEY:
 
 TOKEN_EXPIRE_MINUTES = int(os.environ.get('SYNCBOARD_TOKEN_EXPIRE_MINUTES', str(DEFAULT_TOKEN_EXPIRE_MINUTES)))
 
-# Password hashing configuration (bcrypt)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# JWT signing key, built once. Given a plain string, python-jose re-parses
+# it (including a failed json.loads attempt) and rebuilds the key per call.
+_SIGNING_KEY = jwk.construct(SECRET_KEY, JWT_ALGORITHM)
+
+# Password hashing configuration. Argon2id (memory-hard, C implementation
+# that releases the GIL) is preferred when argon2-cffi is installed; bcrypt
+# stays in the list so existing hashes verify, and is upgraded on login.
+try:
+    import argon2  # noqa: F401
+    _PASSWORD_SCHEMES = ["argon2", "bcrypt"]
+except ImportError:
+    _PASSWORD_SCHEMES = ["bcrypt"]
+
+pwd_context = CryptContext(
+    schemes=_PASSWORD_SCHEMES,
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=2,
+)
+
+# Recently verified (hash, password) pairs -> expiry, so a client logging in
+# again within the TTL skips the KDF. Keys are HMACs under a random
+# per-process key: no plaintext or fast unsalted password digest is kept.
+# Only successes are cached, so guessing still pays the full KDF cost.
+_verify_cache_key = secrets.token_bytes(32)
+_verify_cache: "OrderedDict[bytes, float]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+# Verified JWT payloads by token: authenticated requests re-send the same
+# token, so the signature check and JSON parse run once per token
+_token_cache: "OrderedDict[str, dict]" = OrderedDict()
+_token_cache_lock = threading.Lock()
 
 # =============================================================================
 # Password Hashing
@@ -36,7 +80,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hash_password(password: str) -> str:
     """
-    Hash password using bcrypt with automatic per-user salt generation.
+    Hash password using Argon2id (or bcrypt) with automatic per-user salt generation.
 
     Security improvements over previous implementation:
     - Each password gets a unique salt (prevents rainbow table attacks)
@@ -47,7 +91,7 @@ def hash_password(password: str) -> str:
         password: Plain text password
 
     Returns:
-        Bcrypt hash string
+        Password hash string
     """
     return pwd_context.hash(password)
 
@@ -65,6 +109,54 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: Optional[str]
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and upgrade its hash if it uses a deprecated scheme.
+
+    A missing hash (unknown user) still runs a dummy verification, so the
+    response time doesn't reveal whether the username exists.
+
+    Successful verifications are remembered for
+    PASSWORD_VERIFY_CACHE_TTL_SECONDS, so repeat logins skip the KDF.
+
+    Args:
+        plain_password: The plain text password to verify
+        hashed_password: The stored hash, or None if the user doesn't exist
+
+    Returns:
+        (matches, new_hash) - new_hash is set when the stored hash should be replaced
+    """
+    if not hashed_password:
+        pwd_context.dummy_verify()
+        return False, None
+
+    key = _verify_cache_entry(plain_password, hashed_password)
+    now = time.monotonic()
+    with _verify_cache_lock:
+        expires = _verify_cache.pop(key, None)
+        if expires is not None and expires > now:
+            _verify_cache[key] = expires
+            return True, None
+
+    valid, new_hash = pwd_context.verify_and_update(plain_password, hashed_password)
+    if valid:
+        key = _verify_cache_entry(plain_password, new_hash or hashed_password)
+        with _verify_cache_lock:
+            _verify_cache[key] = now + PASSWORD_VERIFY_CACHE_TTL_SECONDS
+            while len(_verify_cache) > PASSWORD_VERIFY_CACHE_SIZE:
+                _verify_cache.popitem(last=False)
+    return valid, new_hash
+
+
+def _verify_cache_entry(plain_password: str, hashed_password: str) -> bytes:
+    """Key a verification cache entry; changes whenever the stored hash does."""
+    message = hashed_password.encode() + b"\0" + plain_password.encode()
+    return hmac.new(_verify_cache_key, message, hashlib.sha256).digest()
+
 # =============================================================================
 # JWT Token Management
 # =============================================================================
@@ -89,7 +181,7 @@ def create_access_token(data: dict) -> str:
     expire = datetime.utcnow() + timedelta(minutes=TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
 
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=JWT_ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -106,8 +198,25 @@ def decode_access_token(token: str) -> dict:
     Raises:
         ValueError: If token is invalid or expired
     """
+    with _token_cache_lock:
+        payload = _token_cache.get(token)
+        if payload is not None:
+            # Expiry is the only check that can change after verification
+            if payload["exp"] > time.time():
+                _token_cache.move_to_end(token)
+                return dict(payload)
+            del _token_cache[token]
+            raise ValueError('Invalid token')
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        return payload
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=[JWT_ALGORITHM])
     except JWTError:
         raise ValueError('Invalid token')
+
+    # Only tokens that expire are cached (ours always carry exp)
+    if isinstance(payload.get("exp"), (int, float)):
+        with _token_cache_lock:
+            _token_cache[token] = dict(payload)
+            if len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return payload
@@ -6,13 +6,20 @@ Analyzes knowledge bank and suggests viable projects.
 import os
 import json
 import logging
-from typing import List, Dict, Optional
+from collections import defaultdict
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Mapping, Optional
+
+from pydantic import TypeAdapter
 
 from .llm_providers import LLMProvider, OpenAIProvider
 from .models import Cluster, DocumentMetadata, BuildSuggestion
 
 logger = logging.getLogger(__name__)
 
+# Validates a whole suggestion list in one pydantic-core call
+_SUGGESTION_LIST_ADAPTER = TypeAdapter(List[BuildSuggestion])
+
 
 class BuildSuggester:
     """Generate project suggestions from knowledge bank."""
@@ -37,7 +44,7 @@ class BuildSuggester:
         self,
         clusters: Dict[int, Cluster],
         metadata: Dict[int, DocumentMetadata],
-        documents: Dict[int, str],
+        documents: Mapping[int, str],
         max_suggestions: int = 5
     ) -> List[BuildSuggestion]:
         """
@@ -63,9 +70,7 @@ class BuildSuggester:
             )
 
             # Convert to BuildSuggestion objects
-            suggestions = []
-            for data in suggestions_data[:max_suggestions]:
-                suggestions.append(BuildSuggestion(**data))
+            suggestions = _SUGGESTION_LIST_ADAPTER.validate_python(suggestions_data[:max_suggestions])
 
             logger.info(f"Generated {len(suggestions)} build suggestions")
             return suggestions
@@ -73,6 +78,43 @@ class BuildSuggester:
         except Exception as e:
             logger.error(f"Build suggestion failed: {e}")
             return []
+
+    async def stream_suggestions(
+        self,
+        clusters: Dict[int, Cluster],
+        metadata: Dict[int, DocumentMetadata],
+        max_suggestions: int = 5
+    ) -> AsyncIterator[BuildSuggestion]:
+        """
+        Yield build suggestions as the provider produces them.
+
+        Args:
+            clusters: User's content clusters
+            metadata: Document metadata
+            max_suggestions: Number of suggestions to yield
+
+        Yields:
+            BuildSuggestion objects, first one as soon as it is complete
+        """
+        knowledge_summary = self._summarize_knowledge(clusters, metadata)
+        count = 0
+
+        # aclosing: stopping early (or being closed) closes the provider
+        # stream now rather than whenever it is garbage collected
+        async with aclosing(
+            self.provider.stream_build_suggestions(knowledge_summary, max_suggestions)
+        ) as stream:
+            async for data in stream:
+                try:
+                    suggestion = BuildSuggestion.model_validate(data)
+                except Exception as e:
+                    logger.warning(f"Skipping invalid build suggestion: {e}")
+                    continue
+
+                yield suggestion
+                count += 1
+                if count >= max_suggestions:
+                    break
     
     def _summarize_knowledge(
         self,
@@ -84,6 +126,11 @@ class BuildSuggester:
         if not clusters:
             return "Empty knowledge bank"
         
+        # Group docs by cluster in one pass instead of rescanning per cluster
+        docs_by_cluster: Dict[int, List[DocumentMetadata]] = defaultdict(list)
+        for meta in metadata.values():
+            docs_by_cluster[meta.cluster_id].append(meta)
+        
         lines = []
         
         for cluster_id, cluster in clusters.items():
@@ -93,10 +140,7 @@ class BuildSuggester:
             lines.append(f"  - Primary concepts: {', '.join(cluster.primary_concepts[:5])}")
             
             # Sample doc concepts from this cluster
-            cluster_docs = [
-                meta for meta in metadata.values()
-                if meta.cluster_id == cluster_id
-            ][:3]  # First 3 docs
+            cluster_docs = docs_by_cluster.get(cluster_id, [])[:3]  # First 3 docs
             
             if cluster_docs:
                 lines.append(f"  - Sample concepts:")
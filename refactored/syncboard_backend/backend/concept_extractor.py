@@ -5,10 +5,22 @@ Analyzes content and extracts topics, concepts, skills, and metadata.
 
 import os
 import json
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# BLAKE3 (SIMD-accelerated) for cache keys; stdlib BLAKE2b otherwise
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
 
 from .llm_providers import LLMProvider, OpenAIProvider
+from .semantic_cache import SemanticCache
+from .singleflight import SingleFlight
+from .constants import DEFAULT_OPENAI_MAX_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
@@ -16,13 +28,41 @@ logger = logging.getLogger(__name__)
 class ConceptExtractor:
     """Extract concepts from content using configurable LLM provider."""
 
-    def __init__(self, llm_provider: Optional[LLMProvider] = None):
+    def __init__(
+        self,
+        llm_provider: Optional[LLMProvider] = None,
+        batch_threshold: int = 50,
+        max_concurrency: Optional[int] = None,
+        cache_maxsize: int = 1000,
+        semantic_cache: Optional[SemanticCache] = None
+    ):
         """
         Initialize concept extractor.
 
         Args:
             llm_provider: LLM provider to use (defaults to OpenAIProvider)
+            batch_threshold: extract_many() uses the provider's batch API above this size
+            max_concurrency: Maximum concurrent extractions in extract_many()
+                (defaults to OPENAI_MAX_CONCURRENCY env var)
+            cache_maxsize: Maximum number of cached extraction results (LRU)
+            semantic_cache: Near-duplicate cache. Off by default: each miss
+                costs an extra embeddings call. Set SEMANTIC_CACHE_ENABLED=true
+                to use one when the provider offers embed_text()
         """
+        self.batch_threshold = batch_threshold
+        if max_concurrency is None:
+            max_concurrency = int(os.environ.get(
+                "OPENAI_MAX_CONCURRENCY", str(DEFAULT_OPENAI_MAX_CONCURRENCY)
+            ))
+        self.max_concurrency = max_concurrency
+
+        # Exact-match LRU cache: content hash -> extraction result
+        self.cache_maxsize = cache_maxsize
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._cache_lock = asyncio.Lock()
+        # Concurrent cache misses for the same content share one LLM call
+        self._flights = SingleFlight()
+
         if llm_provider is None:
             # Default to OpenAI provider
             api_key = os.environ.get("OPENAI_API_KEY")
@@ -32,13 +72,32 @@ class ConceptExtractor:
         else:
             self.provider = llm_provider
 
-    async def extract(self, content: str, source_type: str) -> Dict:
+        # Semantic cache needs embeddings; skip it for providers without them
+        if (
+            semantic_cache is None
+            and hasattr(self.provider, "embed_text")
+            and os.environ.get("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+        ):
+            semantic_cache = SemanticCache(maxsize=cache_maxsize)
+        self.semantic_cache = semantic_cache
+
+    async def extract(
+        self,
+        content: str,
+        source_type: str,
+        allow_cache: bool = True,
+        owner: Optional[str] = None
+    ) -> Dict:
         """
         Extract concepts from content.
 
         Args:
             content: Full text content
             source_type: "youtube", "pdf", "text", "url", "audio", "image"
+            allow_cache: Serve from / store into the exact and semantic caches
+            owner: Uploading user. The semantic cache is partitioned by owner
+                (a near-duplicate is not the same text, so another user's
+                result must not be served) and is skipped without one
 
         Returns:
             {
@@ -51,8 +110,46 @@ class ConceptExtractor:
                 "suggested_cluster": "Docker & Deployment"
             }
         """
-        # NOTE: Caching removed - was broken (lru_cache on instance methods doesn't work)
-        # TODO: Implement proper caching with Redis or similar if needed
+        # Only the first 2000 chars reach the LLM; slice once and reuse
+        sample = content[:2000]
+        content_hash = self._compute_content_hash(sample, source_type)
+
+        if allow_cache:
+            async with self._cache_lock:
+                if content_hash in self._cache:
+                    self._cache.move_to_end(content_hash)
+                    logger.debug(f"Concept cache hit for {source_type} content")
+                    return self._cache[content_hash]
+
+            return await self._flights.do(
+                content_hash,
+                lambda: self._extract_uncached(content, sample, source_type, content_hash, allow_cache, owner)
+            )
+
+        return await self._extract_uncached(content, sample, source_type, content_hash, allow_cache, owner)
+
+    async def _extract_uncached(
+        self,
+        content: str,
+        sample: str,
+        source_type: str,
+        content_hash: str,
+        allow_cache: bool,
+        owner: Optional[str] = None
+    ) -> Dict:
+        """Extract concepts after an exact-cache miss (semantic cache, then provider)."""
+        embedding = None
+        namespace = (owner, source_type)
+
+        if allow_cache and owner is not None and self.semantic_cache is not None:
+            embedding = await self._embed_sample(sample)
+            if embedding is not None:
+                cached = self.semantic_cache.lookup(namespace, embedding)
+                if cached is not None:
+                    # Not written to the exact cache: that one is shared by
+                    # all users and keyed by this (different) content
+                    logger.debug(f"Semantic concept cache hit for {source_type} content")
+                    return cached
 
         try:
             # Delegate to LLM provider
@@ -60,6 +157,12 @@ class ConceptExtractor:
 
             logger.info(f"Extracted {len(result.get('concepts', []))} concepts from {source_type}")
 
+            # Providers return an empty result on failure - don't pin it in the cache
+            if allow_cache and result.get("concepts"):
+                await self._cache_result(content_hash, result)
+                if embedding is not None:
+                    self.semantic_cache.store(namespace, embedding, result)
+
             return result
 
         except Exception as e:
@@ -70,3 +173,74 @@ class ConceptExtractor:
                 "primary_topic": "uncategorized",
                 "suggested_cluster": "General"
             }
+
+
+    async def _cache_result(self, content_hash: str, result: Dict) -> None:
+        """Store a result in the exact-match LRU cache."""
+        async with self._cache_lock:
+            self._cache[content_hash] = result
+            self._cache.move_to_end(content_hash)
+            if len(self._cache) > self.cache_maxsize:
+                self._cache.popitem(last=False)
+
+    async def _embed_sample(self, sample: str) -> Optional[List[float]]:
+        """Embed the extraction sample, or None if embedding fails."""
+        try:
+            return await self.provider.embed_text(sample)
+        except Exception as e:
+            logger.warning(f"Embedding failed, skipping semantic cache: {e}")
+            return None
+
+    def _compute_content_hash(self, sample: str, source_type: str) -> str:
+        """
+        Compute the cache key for a piece of content.
+
+        Keys are truncated to 128 bits, plenty for a bounded in-memory cache.
+
+        Args:
+            sample: Already-truncated extraction sample (first 2000 chars)
+            source_type: Content source type
+        """
+        hasher = _blake3() if _blake3 is not None else hashlib.blake2b(digest_size=16)
+        hasher.update(source_type.encode("utf-8"))
+        hasher.update(b":")
+        hasher.update(sample.encode("utf-8"))
+        return hasher.hexdigest(16) if _blake3 is not None else hasher.hexdigest()
+
+    async def extract_many(self, items: List[Tuple[str, str]], owner: Optional[str] = None) -> List[Dict]:
+        """
+        Extract concepts for many documents at once.
+
+        Large inputs are submitted through the provider's batch API when it
+        offers one (cheaper, latency amortized across the whole batch).
+        Smaller inputs, or a failed batch, fall back to concurrent extract()
+        calls bounded by max_concurrency.
+
+        Args:
+            items: List of (content, source_type) tuples
+            owner: Uploading user, passed on to extract()
+
+        Returns:
+            Extraction results in the same order as items
+        """
+        if not items:
+            return []
+
+        batch_extract = getattr(self.provider, "extract_concepts_batch", None)
+        if batch_extract is not None and len(items) > self.batch_threshold:
+            try:
+                results = await batch_extract(items)
+                logger.info(f"Batch-extracted concepts for {len(items)} documents")
+                return results
+            except Exception as e:
+                logger.warning(f"Batch extraction failed, falling back to concurrent calls: {e}")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _bounded_extract(content: str, source_type: str) -> Dict:
+            async with semaphore:
+                return await self.extract(content, source_type, owner=owner)
+
+        return list(await asyncio.gather(
+            *(_bounded_extract(content, source_type) for content, source_type in items)
+        ))
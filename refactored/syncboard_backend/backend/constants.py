@@ -13,6 +13,13 @@ import os
 MAX_UPLOAD_SIZE_BYTES = 50 * 1024 * 1024  # 50MB max file upload
 MAX_TEXT_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB max text content
 MAX_DESCRIPTION_LENGTH = 5000  # 5000 chars for descriptions
+MAX_BATCH_IMAGES = 20  # Images per /upload_images request
+DEFAULT_MAX_CONCURRENT_INGESTS = 8  # Uploads downloading/parsing/OCRing at once
+PERSIST_LOCK_STRIPES = 64  # Striped locks ordering database writes of the same rows
+DEFAULT_PERSIST_FLUSH_INTERVAL = 0.1  # Seconds to batch database writes after a change
+DEFAULT_THREAD_POOL_SIZE = 32  # Worker threads for blocking work offloaded from the event loop
+HEALTH_CHECK_CACHE_TTL = 5.0  # Seconds /health reuses its disk and database probes
+OCR_DRAFT_SIZE = (1600, 1600)  # JPEGs larger than this are decoded downscaled for OCR
 
 # =============================================================================
 # Pagination & Search Defaults
@@ -29,6 +36,21 @@ MAX_SUGGESTIONS = 10  # Maximum build suggestions
 DEFAULT_VECTOR_DIM = 256  # Default vector dimension
 SNIPPET_LENGTH = 500  # Character length for search result snippets
 
+# =============================================================================
+# LLM Provider Configuration
+# =============================================================================
+
+DEFAULT_OPENAI_MAX_CONCURRENCY = 10  # Concurrent OpenAI requests per provider
+DEFAULT_OPENAI_RPM_LIMIT = 500  # Requests per minute budget
+DEFAULT_OPENAI_TPM_LIMIT = 200000  # Tokens per minute budget
+OPENAI_MAX_CONNECTIONS = 100  # Shared HTTP connection pool size
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 50  # Idle connections kept open for reuse
+LLM_CONTEXT_WINDOW = 128000  # Conservative context size for prompt budgeting
+CONCEPT_MAX_TOKENS = 350  # Output budget for concept extraction (~10 concepts)
+SUGGESTION_MAX_TOKENS = 2000  # Output budget cap for build suggestions
+SUGGESTION_TOKENS_PER_ITEM = 250  # Expected output tokens per build suggestion
+SUGGESTION_TOKENS_OVERHEAD = 200  # JSON wrapper / slack for build suggestions
+
 # =============================================================================
 # User & Content Limits
 # =============================================================================
@@ -45,12 +67,16 @@ MAX_URL_LENGTH = 2048
 
 DEFAULT_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 JWT_ALGORITHM = "HS256"
+PASSWORD_VERIFY_CACHE_SIZE = 128  # Recent successful logins remembered per process
+PASSWORD_VERIFY_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_SIZE = 1024  # Verified JWT payloads remembered per process
 
 # =============================================================================
 # Storage Configuration
 # =============================================================================
 
 DEFAULT_STORAGE_PATH = "storage.json"
+STORAGE_LOG_COMPACT_RECORDS = 1000  # Journal records before rewriting the snapshot
 
 # =============================================================================
 # Skill Levels
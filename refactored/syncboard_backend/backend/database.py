@@ -50,11 +50,15 @@ else:
         echo=False,
     )
 
-    # Enable foreign keys for SQLite
+    # Enable foreign keys for SQLite. WAL lets readers run alongside the
+    # persist flusher's writes, and with it synchronous=NORMAL syncs at
+    # checkpoints instead of on every commit (in-memory databases ignore both)
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_conn, connection_record):
         cursor = dbapi_conn.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
         cursor.close()
 
 # Session factory
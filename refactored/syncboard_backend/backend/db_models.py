@@ -5,8 +5,9 @@ Maps application domain models to PostgreSQL tables.
 Separate from Pydantic models (models.py) which handle API validation.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, JSON, ForeignKey, Boolean, Index
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, JSON, ForeignKey, Boolean, Index, UniqueConstraint, event, select
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, declarative_base, Session
 from datetime import datetime
 
 Base = declarative_base()
@@ -81,7 +82,15 @@ class DBDocument(Base):
 
     # Composite indexes for common queries
     __table_args__ = (
-        Index('idx_doc_owner_cluster', 'owner_username', 'cluster_id'),
+        # Covering index: per-user/per-cluster summaries read source_type,
+        # skill_level and ingested_at straight from the index (PostgreSQL
+        # index-only scan); other dialects ignore INCLUDE
+        Index(
+            'idx_doc_owner_cluster', 'owner_username', 'cluster_id',
+            postgresql_include=['source_type', 'skill_level', 'ingested_at']
+        ),
+        # "Recent documents in a cluster" without a sort step
+        Index('idx_doc_cluster_recent', 'cluster_id', 'ingested_at'),
         Index('idx_doc_source_skill', 'source_type', 'skill_level'),
         Index('idx_doc_ingested', 'ingested_at'),
     )
@@ -90,32 +99,122 @@ class DBDocument(Base):
         return f"<DBDocument(doc_id={self.doc_id}, owner='{self.owner_username}', cluster={self.cluster_id})>"
 
 
+class DBConceptTerm(Base):
+    """
+    Concept name dictionary.
+
+    Each distinct (name, category) pair is stored once; DBConcept rows
+    reference it by integer id instead of repeating the strings per
+    document. The same name under two categories is two terms, so every
+    concept keeps the category it was saved with.
+    """
+    __tablename__ = "concept_terms"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(255), nullable=False, index=True)
+    category = Column(String(100), nullable=False, index=True)  # language, framework, concept, etc.
+
+    __table_args__ = (
+        UniqueConstraint('name', 'category', name='uq_concept_terms_name_category'),
+    )
+
+    def __repr__(self):
+        return f"<DBConceptTerm(id={self.id}, name='{self.name}', category='{self.category}')>"
+
+
 class DBConcept(Base):
     """Extracted concepts/tags from documents."""
     __tablename__ = "concepts"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     document_id = Column(Integer, ForeignKey("documents.id"), nullable=False, index=True)
+    term_id = Column(Integer, ForeignKey("concept_terms.id"), nullable=False, index=True)
 
-    name = Column(String(255), nullable=False, index=True)
-    category = Column(String(100), nullable=False, index=True)  # language, framework, concept, etc.
     confidence = Column(Float, nullable=False)  # 0.0 - 1.0
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
-    # Relationships
+    # Relationships (terms are tiny and always needed, so join them eagerly)
     document = relationship("DBDocument", back_populates="concepts")
+    term = relationship("DBConceptTerm", lazy="joined")
 
     # Indexes for search
     __table_args__ = (
-        Index('idx_concept_name_category', 'name', 'category'),
         Index('idx_concept_confidence', 'confidence'),
     )
 
+    # Name/category given to the constructor, resolved to a term on flush
+    _pending_name = None
+    _pending_category = None
+
+    def __init__(self, name: str = None, category: str = None, **kwargs):
+        super().__init__(**kwargs)
+        if name is not None:
+            self.name = name
+        if category is not None:
+            self.category = category
+
+    @hybrid_property
+    def name(self):
+        return self.term.name if self.term is not None else self._pending_name
+
+    @name.setter
+    def name(self, value):
+        self._pending_name = value
+        self._pending_category = self.category
+        self.term = None
+
+    @name.expression
+    def name(cls):
+        return select(DBConceptTerm.name).where(DBConceptTerm.id == cls.term_id).scalar_subquery()
+
+    @hybrid_property
+    def category(self):
+        return self.term.category if self.term is not None else self._pending_category
+
+    @category.setter
+    def category(self, value):
+        # A new category is a different term: re-resolve on flush
+        if self.term is not None:
+            self._pending_name = self.term.name
+            self.term = None
+        self._pending_category = value
+
+    @category.expression
+    def category(cls):
+        return select(DBConceptTerm.category).where(DBConceptTerm.id == cls.term_id).scalar_subquery()
+
     def __repr__(self):
         return f"<DBConcept(name='{self.name}', category='{self.category}', conf={self.confidence:.2f})>"
 
 
+@event.listens_for(Session, "before_flush")
+def _resolve_concept_terms(session, flush_context, instances):
+    """Attach pending DBConcepts to their DBConceptTerm, creating new terms once."""
+    pending = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, DBConcept) and obj.term is None and obj._pending_name is not None
+    ]
+    if not pending:
+        return
+
+    names = {obj._pending_name for obj in pending}
+    with session.no_autoflush:
+        terms = {
+            (term.name, term.category): term
+            for term in session.query(DBConceptTerm).filter(DBConceptTerm.name.in_(names))
+        }
+
+    for obj in pending:
+        key = (obj._pending_name, obj._pending_category or "concept")
+        term = terms.get(key)
+        if term is None:
+            term = DBConceptTerm(name=key[0], category=key[1])
+            session.add(term)
+            terms[key] = term
+        obj.term = term
+
+
 class DBVectorDocument(Base):
     """
     Stores actual document content and vector data.
@@ -224,3 +323,17 @@ class DBDocumentRelationship(Base):
 
     def __repr__(self):
         return f"<DBDocumentRelationship(source={self.source_doc_id}, target={self.target_doc_id}, type='{self.relationship_type}')>"
+
+
+class DBWebCache(Base):
+    """Fetched web articles, revalidated with conditional GETs."""
+    __tablename__ = "web_cache"
+
+    url = Column(String(2048), primary_key=True)
+    etag = Column(String(512), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    text = Column(Text, nullable=False)  # Formatted extract_web_article() result
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<DBWebCache(url='{self.url}', etag='{self.etag}')>"
@@ -50,9 +50,13 @@ class DatabaseKnowledgeBankRepository:
     def _load_vector_store(self) -> None:
         """Load documents into vector store for semantic search."""
         try:
-            vector_docs = self.db.query(DBVectorDocument).all()
-            for vdoc in vector_docs:
-                self.vector_store.add_document(vdoc.content)
+            vector_docs = self.db.query(DBVectorDocument).order_by(DBVectorDocument.doc_id).all()
+            # Keep the database doc_ids: deletions leave gaps, and new IDs
+            # must continue after the highest one rather than fill them
+            self.vector_store.add_documents_batch(
+                [vdoc.content for vdoc in vector_docs],
+                [vdoc.doc_id for vdoc in vector_docs],
+            )
             logger.info(f"Loaded {len(vector_docs)} documents into vector store")
         except Exception as e:
             logger.error(f"Failed to load vector store: {e}")
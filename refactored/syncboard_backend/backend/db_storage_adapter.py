@@ -6,11 +6,20 @@ Drop-in replacement for storage.py with database persistence.
 """
 
 import logging
-from typing import Dict, Tuple
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from .models import DocumentMetadata, Cluster, Concept
-from .db_models import DBUser, DBCluster, DBDocument, DBConcept, DBVectorDocument
+from .db_models import (
+    DBUser,
+    DBCluster,
+    DBDocument,
+    DBConcept,
+    DBVectorDocument,
+    DBDocumentTag,
+    DBDocumentRelationship,
+)
 from .vector_store import VectorStore
 from .database import get_db_context
 
@@ -40,25 +49,13 @@ def load_storage_from_db(
 
     try:
         with get_db_context() as db:
-            # Load vector documents and rebuild vector store
-            # CRITICAL FIX: Load in order and verify doc_id alignment
+            # Load vector documents and rebuild vector store once, keeping
+            # the database doc_ids: deletions leave gaps, and the store then
+            # allocates new IDs after the highest one instead of reusing them
             vector_docs = db.query(DBVectorDocument).order_by(DBVectorDocument.doc_id).all()
-
             for vdoc in vector_docs:
-                # Add to vector store - returns auto-incremented ID
-                vs_doc_id = vector_store.add_document(vdoc.content)
-
-                # CRITICAL: Verify vector store ID matches database ID
-                # If mismatch, vector store queries will fail!
-                if vs_doc_id != vdoc.doc_id:
-                    logger.warning(
-                        f"Vector store ID mismatch: DB has {vdoc.doc_id}, "
-                        f"vector store assigned {vs_doc_id}. "
-                        f"This will cause search failures!"
-                    )
-
-                # Use database doc_id for consistency
                 documents[vdoc.doc_id] = vdoc.content
+            vector_store.add_documents_batch(list(documents.values()), list(documents))
 
             # Load document metadata
             db_docs = db.query(DBDocument).all()
@@ -125,19 +122,74 @@ def save_storage_to_db(
     Persist documents, metadata, clusters, and users to database.
 
     This performs a full sync - adds new items, updates existing ones.
-    Does NOT delete items that are missing (for safety).
+    Does NOT delete items that are missing (for safety). Request handlers
+    should use save_changes_to_db() to write only what they changed.
+
+    Args:
+        documents: Mapping of doc_id to full text
+        metadata: Mapping of doc_id to DocumentMetadata
+        clusters: Mapping of cluster_id to Cluster
+        users: Mapping of username to hashed password
+    """
+    save_changes_to_db(
+        documents, metadata, clusters, users,
+        doc_ids=list(documents), cluster_ids=list(clusters), usernames=list(users)
+    )
+
+
+# Keys per IN (...) lookup; stays under SQLite's bound-parameter limit
+_LOOKUP_BATCH_SIZE = 500
+
+
+def _rows_by_key(db: Session, column, keys: List) -> Dict:
+    """Load rows whose column is in keys, batching the IN lookups."""
+    rows = {}
+    for i in range(0, len(keys), _LOOKUP_BATCH_SIZE):
+        batch = keys[i:i + _LOOKUP_BATCH_SIZE]
+        for row in db.query(column.class_).filter(column.in_(batch)):
+            rows[getattr(row, column.key)] = row
+    return rows
+
+
+def save_changes_to_db(
+    documents: Dict[int, str],
+    metadata: Dict[int, DocumentMetadata],
+    clusters: Dict[int, Cluster],
+    users: Dict[str, str],
+    doc_ids: Iterable[int] = (),
+    cluster_ids: Iterable[int] = (),
+    usernames: Iterable[str] = (),
+    deleted_doc_ids: Iterable[int] = ()
+) -> None:
+    """
+    Persist only the given entries, so a write costs O(changed), not O(store).
+
+    Entries named in doc_ids/cluster_ids/usernames are upserted from the
+    in-memory state; deleted_doc_ids are removed with their concepts, tags
+    and relationships. Everything is written in one transaction.
 
     Args:
         documents: Mapping of doc_id to full text
         metadata: Mapping of doc_id to DocumentMetadata
         clusters: Mapping of cluster_id to Cluster
         users: Mapping of username to hashed password
+        doc_ids: Documents to insert or update
+        cluster_ids: Clusters to insert or update
+        usernames: Users to insert or update
+        deleted_doc_ids: Documents to delete
     """
+    doc_ids = [doc_id for doc_id in dict.fromkeys(doc_ids) if doc_id in documents]
+    cluster_ids = [cid for cid in dict.fromkeys(cluster_ids) if cid in clusters]
+    usernames = [name for name in dict.fromkeys(usernames) if name in users]
+    deleted_doc_ids = list(dict.fromkeys(deleted_doc_ids))
+
     try:
         with get_db_context() as db:
             # Sync users
-            for username, hashed_password in users.items():
-                db_user = db.query(DBUser).filter_by(username=username).first()
+            db_users = _rows_by_key(db, DBUser.username, usernames)
+            for username in usernames:
+                hashed_password = users[username]
+                db_user = db_users.get(username)
                 if not db_user:
                     db_user = DBUser(username=username, hashed_password=hashed_password)
                     db.add(db_user)
@@ -145,8 +197,10 @@ def save_storage_to_db(
                     db_user.hashed_password = hashed_password
 
             # Sync clusters
-            for cluster_id, cluster in clusters.items():
-                db_cluster = db.query(DBCluster).filter_by(id=cluster_id).first()
+            db_clusters = _rows_by_key(db, DBCluster.id, cluster_ids)
+            for cluster_id in cluster_ids:
+                cluster = clusters[cluster_id]
+                db_cluster = db_clusters.get(cluster_id)
                 if not db_cluster:
                     db_cluster = DBCluster(
                         id=cluster_id,
@@ -160,12 +214,16 @@ def save_storage_to_db(
                     db_cluster.primary_concepts = cluster.primary_concepts
                     db_cluster.skill_level = cluster.skill_level
 
-            db.commit()  # Commit users and clusters first
+            db.flush()  # Users and clusters first (documents reference them)
 
             # Sync documents and vector documents
-            for doc_id, content in documents.items():
+            db_vdocs = _rows_by_key(db, DBVectorDocument.doc_id, doc_ids)
+            db_docs = _rows_by_key(db, DBDocument.doc_id, [d for d in doc_ids if d in metadata])
+            for doc_id in doc_ids:
+                content = documents[doc_id]
+
                 # Vector document
-                db_vdoc = db.query(DBVectorDocument).filter_by(doc_id=doc_id).first()
+                db_vdoc = db_vdocs.get(doc_id)
                 if not db_vdoc:
                     db_vdoc = DBVectorDocument(doc_id=doc_id, content=content)
                     db.add(db_vdoc)
@@ -175,7 +233,7 @@ def save_storage_to_db(
                 # Document metadata
                 if doc_id in metadata:
                     meta = metadata[doc_id]
-                    db_doc = db.query(DBDocument).filter_by(doc_id=doc_id).first()
+                    db_doc = db_docs.get(doc_id)
 
                     if not db_doc:
                         db_doc = DBDocument(
@@ -191,16 +249,6 @@ def save_storage_to_db(
                         )
                         db.add(db_doc)
                         db.flush()  # Get the database ID
-
-                        # Add concepts
-                        for concept in meta.concepts:
-                            db_concept = DBConcept(
-                                document_id=db_doc.id,
-                                name=concept.name,
-                                category=concept.category,
-                                confidence=concept.confidence
-                            )
-                            db.add(db_concept)
                     else:
                         # Update existing document
                         db_doc.owner_username = meta.owner
@@ -214,17 +262,39 @@ def save_storage_to_db(
 
                         # Update concepts (simple approach: delete and recreate)
                         db.query(DBConcept).filter_by(document_id=db_doc.id).delete()
-                        for concept in meta.concepts:
-                            db_concept = DBConcept(
-                                document_id=db_doc.id,
-                                name=concept.name,
-                                category=concept.category,
-                                confidence=concept.confidence
-                            )
-                            db.add(db_concept)
+
+                    for concept in meta.concepts:
+                        db_concept = DBConcept(
+                            document_id=db_doc.id,
+                            name=concept.name,
+                            category=concept.category,
+                            confidence=concept.confidence
+                        )
+                        db.add(db_concept)
+
+            # Delete removed documents (dependents first: no ON DELETE CASCADE)
+            if deleted_doc_ids:
+                db_deleted = _rows_by_key(db, DBDocument.doc_id, deleted_doc_ids)
+                row_ids = [db_doc.id for db_doc in db_deleted.values()]
+                if row_ids:
+                    db.query(DBConcept).filter(DBConcept.document_id.in_(row_ids)).delete(synchronize_session=False)
+                    db.query(DBDocumentTag).filter(DBDocumentTag.document_id.in_(row_ids)).delete(synchronize_session=False)
+                    db.query(DBDocumentRelationship).filter(
+                        or_(
+                            DBDocumentRelationship.source_doc_id.in_(row_ids),
+                            DBDocumentRelationship.target_doc_id.in_(row_ids)
+                        )
+                    ).delete(synchronize_session=False)
+                    db.query(DBDocument).filter(DBDocument.id.in_(row_ids)).delete(synchronize_session=False)
+                db.query(DBVectorDocument).filter(
+                    DBVectorDocument.doc_id.in_(deleted_doc_ids)
+                ).delete(synchronize_session=False)
 
             db.commit()
-            logger.debug(f"Saved to database: {len(documents)} documents, {len(clusters)} clusters")
+            logger.debug(
+                f"Saved to database: {len(doc_ids)} documents, {len(cluster_ids)} clusters, "
+                f"{len(usernames)} users, {len(deleted_doc_ids)} deletions"
+            )
 
     except Exception as e:
         logger.error(f"Failed to save to database: {e}")
@@ -10,18 +10,32 @@ Provides:
 
 import os
 import asyncio
-from typing import Dict
+import logging
+from contextlib import AsyncExitStack
+from typing import Dict, Hashable, Iterable, List, Optional, Set
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
-from .models import User, DocumentMetadata, Cluster
+from .models import User, Cluster
 from .vector_store import VectorStore
+from .llm_providers import LLMProvider, OpenAIProvider
+from .local_provider import LocalConceptProvider
 from .concept_extractor import ConceptExtractor
 from .clustering import ClusteringEngine
 from .image_processor import ImageProcessor
 from .build_suggester import BuildSuggester
-from .auth import decode_access_token
-from .constants import DEFAULT_VECTOR_DIM
+from .auth import decode_access_token, pwd_context
+from .rate_limiter import estimate_tokens
+from .constants import (
+    DEFAULT_VECTOR_DIM,
+    DEFAULT_MAX_CONCURRENT_INGESTS,
+    DEFAULT_PERSIST_FLUSH_INTERVAL,
+    PERSIST_LOCK_STRIPES,
+)
+from .storage import OwnerIndexedMetadata
+from .db_storage_adapter import save_changes_to_db
+
+logger = logging.getLogger(__name__)
 
 # =============================================================================
 # OAuth2 Scheme
@@ -38,21 +52,66 @@ vector_store = VectorStore(dim=int(os.environ.get('SYNCBOARD_VECTOR_DIM', str(DE
 
 # Document storage (in-memory)
 documents: Dict[int, str] = {}
-metadata: Dict[int, DocumentMetadata] = {}
+metadata: OwnerIndexedMetadata = OwnerIndexedMetadata()  # Dict[doc_id, DocumentMetadata], indexed by owner
 clusters: Dict[int, Cluster] = {}
 users: Dict[str, str] = {}  # username -> hashed_password
 
-# Storage lock for thread safety
+# Storage lock for thread safety: guards in-memory mutation only, so hold
+# it briefly and persist with persist_changes() after releasing it
 storage_lock = asyncio.Lock()
 
+# Striped locks ordering database writes that touch the same rows
+persist_locks = [asyncio.Lock() for _ in range(PERSIST_LOCK_STRIPES)]
+
+# Entries changed since the last database flush; the background flusher
+# started by start_persist_flusher() writes them together
+dirty_doc_ids: Set[int] = set()
+dirty_cluster_ids: Set[int] = set()
+dirty_usernames: Set[str] = set()
+pending_deleted_doc_ids: Set[int] = set()
+flush_event = asyncio.Event()
+_flusher_task: Optional[asyncio.Task] = None
+
+# Bounds uploads downloading/parsing/OCRing at once, so a burst cannot
+# occupy every worker thread (storage saves share the same pool)
+ingest_semaphore = asyncio.Semaphore(
+    int(os.environ.get('SYNCBOARD_MAX_CONCURRENT_INGESTS', str(DEFAULT_MAX_CONCURRENT_INGESTS)))
+)
+
 # =============================================================================
 # Service Instances
 # =============================================================================
 
-concept_extractor = ConceptExtractor()
+# Single LLM provider so all OpenAI calls share one connection pool,
+# concurrency semaphore and rate-limit budget
+llm_provider = OpenAIProvider()
+
+# CONCEPT_PROVIDER=local extracts concepts locally, using OpenAI only as fallback
+concept_provider: LLMProvider = llm_provider
+if os.environ.get("CONCEPT_PROVIDER", "openai").lower() == "local":
+    concept_provider = LocalConceptProvider(fallback=llm_provider)
+
+concept_extractor = ConceptExtractor(llm_provider=concept_provider)
 clustering_engine = ClusteringEngine()
-image_processor = ImageProcessor()
-build_suggester = BuildSuggester()
+# SYNCBOARD_OCR_PROCESSES > 0 moves OCR into that many worker processes
+image_processor = ImageProcessor(processes=int(os.environ.get('SYNCBOARD_OCR_PROCESSES', '0')))
+build_suggester = BuildSuggester(llm_provider=llm_provider)
+
+
+def init_dependencies() -> None:
+    """
+    Eagerly load resources the services otherwise initialize lazily.
+
+    Called once from the startup handler so the first request does not pay
+    for model, tokenizer and password-hasher loading.
+    """
+    for model in {llm_provider.concept_model, llm_provider.suggestion_model, llm_provider.embedding_model}:
+        estimate_tokens("", model)
+    if isinstance(concept_provider, LocalConceptProvider):
+        concept_provider.warm_up()
+    # Loads the hash backends and builds the dummy hash that unknown-user
+    # logins verify against, otherwise paid by the first /token request
+    pwd_context.dummy_verify()
 
 # =============================================================================
 # Authentication Dependency
@@ -94,7 +153,7 @@ def get_documents() -> Dict[int, str]:
     """Get documents dictionary."""
     return documents
 
-def get_metadata() -> Dict[int, DocumentMetadata]:
+def get_metadata() -> OwnerIndexedMetadata:
     """Get metadata dictionary."""
     return metadata
 
@@ -114,6 +173,151 @@ def get_storage_lock() -> asyncio.Lock:
     """Get storage lock for thread-safe operations."""
     return storage_lock
 
+def persist_lock_for(key: Hashable) -> asyncio.Lock:
+    """Get the striped persistence lock for a row key such as ("doc", 3)."""
+    return persist_locks[hash(key) % len(persist_locks)]
+
+async def _write_changes(
+    doc_ids: List[int],
+    cluster_ids: List[int],
+    usernames: List[str],
+    deleted_doc_ids: List[int]
+) -> None:
+    """
+    Write the named entries to the database without holding storage_lock.
+
+    Holds the striped locks of every row written, so requests touching
+    different rows persist in parallel while writes to the same row commit
+    in the order their in-memory changes were made. The entries are
+    snapshotted on the event loop, after the locks are acquired, so the
+    worker thread never reads the live dicts other requests are mutating.
+    """
+    keys = (
+        [("doc", doc_id) for doc_id in doc_ids + deleted_doc_ids]
+        + [("cluster", cluster_id) for cluster_id in cluster_ids]
+        + [("user", username) for username in usernames]
+    )
+
+    async with AsyncExitStack() as stack:
+        # Acquire in one global order so overlapping requests cannot deadlock
+        for stripe in sorted({hash(key) % len(persist_locks) for key in keys}):
+            await stack.enter_async_context(persist_locks[stripe])
+
+        await asyncio.to_thread(
+            save_changes_to_db,
+            {doc_id: documents[doc_id] for doc_id in doc_ids if doc_id in documents},
+            {doc_id: metadata[doc_id] for doc_id in doc_ids if doc_id in metadata},
+            {cid: clusters[cid] for cid in cluster_ids if cid in clusters},
+            {name: users[name] for name in usernames if name in users},
+            doc_ids=doc_ids,
+            cluster_ids=cluster_ids,
+            usernames=usernames,
+            deleted_doc_ids=deleted_doc_ids
+        )
+
+def _mark_dirty(
+    doc_ids: Iterable[int] = (),
+    cluster_ids: Iterable[int] = (),
+    usernames: Iterable[str] = (),
+    deleted_doc_ids: Iterable[int] = ()
+) -> None:
+    """Queue entries for the next flush; a later delete/upsert supersedes an earlier one."""
+    for doc_id in doc_ids:
+        pending_deleted_doc_ids.discard(doc_id)
+        dirty_doc_ids.add(doc_id)
+    for doc_id in deleted_doc_ids:
+        dirty_doc_ids.discard(doc_id)
+        pending_deleted_doc_ids.add(doc_id)
+    dirty_cluster_ids.update(cluster_ids)
+    dirty_usernames.update(usernames)
+    flush_event.set()
+
+async def persist_changes(
+    doc_ids: Iterable[int] = (),
+    cluster_ids: Iterable[int] = (),
+    usernames: Iterable[str] = (),
+    deleted_doc_ids: Iterable[int] = ()
+) -> None:
+    """
+    Persist the named entries to the database.
+
+    While the background flusher runs, the entries are only marked dirty and
+    written with everything else changed in the same flush window, so a burst
+    of uploads costs one transaction instead of one per request. Without it
+    (scripts, tests) they are written immediately.
+    """
+    if _flusher_task is not None and not _flusher_task.done():
+        _mark_dirty(doc_ids, cluster_ids, usernames, deleted_doc_ids)
+        return
+    await _write_changes(
+        list(doc_ids), list(cluster_ids), list(usernames), list(deleted_doc_ids)
+    )
+
+async def flush_pending_changes() -> None:
+    """Write every entry marked dirty since the last flush in one transaction."""
+    flush_event.clear()
+    changes = (
+        list(dirty_doc_ids), list(dirty_cluster_ids),
+        list(dirty_usernames), list(pending_deleted_doc_ids)
+    )
+    if not any(changes):
+        return
+    dirty_doc_ids.clear()
+    dirty_cluster_ids.clear()
+    dirty_usernames.clear()
+    pending_deleted_doc_ids.clear()
+
+    try:
+        await _write_changes(*changes)
+    except Exception as e:
+        # Keep the entries queued so the next flush retries them, unless
+        # they were upserted/deleted again in the meantime
+        logger.error(f"Flushing changes to database failed, will retry: {e}")
+        doc_ids, cluster_ids, usernames, deleted = changes
+        dirty_doc_ids.update(d for d in doc_ids if d not in pending_deleted_doc_ids)
+        pending_deleted_doc_ids.update(d for d in deleted if d not in dirty_doc_ids)
+        dirty_cluster_ids.update(cluster_ids)
+        dirty_usernames.update(usernames)
+        flush_event.set()
+
+async def _run_persist_flusher(interval: float) -> None:
+    """Flush dirty entries, waiting `interval` after the first change to batch the rest."""
+    while True:
+        await flush_event.wait()
+        await asyncio.sleep(interval)
+        await flush_pending_changes()
+
+def start_persist_flusher() -> None:
+    """Start the background task batching database writes (call on startup)."""
+    global _flusher_task, flush_event
+    if _flusher_task is None or _flusher_task.done():
+        # Fresh event: asyncio primitives bind to the loop that first waits on them
+        flush_event = asyncio.Event()
+        interval = float(os.environ.get(
+            'SYNCBOARD_PERSIST_FLUSH_INTERVAL', str(DEFAULT_PERSIST_FLUSH_INTERVAL)
+        ))
+        _flusher_task = asyncio.create_task(_run_persist_flusher(interval))
+
+async def stop_persist_flusher() -> None:
+    """Stop the flusher and write anything still pending (call on shutdown)."""
+    global _flusher_task
+    if _flusher_task is not None:
+        _flusher_task.cancel()
+        try:
+            await _flusher_task
+        except asyncio.CancelledError:
+            pass
+        _flusher_task = None
+    await flush_pending_changes()
+
+def get_ingest_semaphore() -> asyncio.Semaphore:
+    """Get semaphore bounding concurrent upload preprocessing."""
+    return ingest_semaphore
+
+def get_llm_provider() -> OpenAIProvider:
+    """Get shared LLM provider instance."""
+    return llm_provider
+
 def get_concept_extractor() -> ConceptExtractor:
     """Get concept extractor instance."""
     return concept_extractor
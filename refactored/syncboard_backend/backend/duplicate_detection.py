@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
-from .db_models import DBDocument, DBVectorDocument
+from .db_models import DBDocument, DBConcept, DBVectorDocument
 from .vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
@@ -56,78 +56,35 @@ class DuplicateDetector:
             return []
 
         doc_ids = [doc.doc_id for doc in user_docs]
+        docs_by_id = {doc.doc_id: doc for doc in user_docs}
+
+        # Score all of the user's pairs at once, instead of ranking the
+        # whole store once per document
+        similar = self.vector_store.similar_pairs(doc_ids, similarity_threshold)
+        top_k = min(20, len(doc_ids))
 
-        # Find duplicates using vector similarity
         duplicate_groups = []
 
         # Track which documents we've already grouped
         grouped_docs = set()
 
-        for i, doc_id1 in enumerate(doc_ids):
+        for doc_id1 in doc_ids:
             if doc_id1 in grouped_docs:
                 continue
 
-            # Find similar documents
-            similar_docs = self.vector_store.search_by_doc_id(
-                doc_id1,
-                top_k=min(20, len(doc_ids))
-            )
-
-            # Filter by similarity threshold and user's documents
             duplicates = []
-            for sim_doc_id, similarity in similar_docs:
-                if (
-                    sim_doc_id != doc_id1
-                    and sim_doc_id in doc_ids
-                    and sim_doc_id not in grouped_docs
-                    and similarity >= similarity_threshold
-                ):
+            for sim_doc_id, similarity in similar.get(doc_id1, [])[:top_k]:
+                if sim_doc_id not in grouped_docs:
                     duplicates.append({
-                        "doc_id": sim_doc_id,
-                        "similarity": float(similarity)
+                        **self._doc_summary(docs_by_id[sim_doc_id]),
+                        "similarity": similarity
                     })
                     grouped_docs.add(sim_doc_id)
 
             if duplicates:
-                # Get document metadata
-                main_doc = next((d for d in user_docs if d.doc_id == doc_id1), None)
-
-                duplicate_ids = [d["doc_id"] for d in duplicates]
-                duplicate_docs_meta = [
-                    d for d in user_docs if d.doc_id in duplicate_ids
-                ]
-
                 group = {
-                    "primary_doc": {
-                        "doc_id": doc_id1,
-                        "source_type": main_doc.source_type if main_doc else None,
-                        "skill_level": main_doc.skill_level if main_doc else None,
-                        "cluster_id": main_doc.cluster_id if main_doc else None,
-                        "created_at": main_doc.created_at.isoformat() if main_doc and main_doc.created_at else None
-                    },
-                    "duplicates": [
-                        {
-                            "doc_id": dup["doc_id"],
-                            "similarity": dup["similarity"],
-                            "source_type": next(
-                                (d.source_type for d in duplicate_docs_meta if d.doc_id == dup["doc_id"]),
-                                None
-                            ),
-                            "skill_level": next(
-                                (d.skill_level for d in duplicate_docs_meta if d.doc_id == dup["doc_id"]),
-                                None
-                            ),
-                            "cluster_id": next(
-                                (d.cluster_id for d in duplicate_docs_meta if d.doc_id == dup["doc_id"]),
-                                None
-                            ),
-                            "created_at": next(
-                                (d.created_at.isoformat() for d in duplicate_docs_meta if d.doc_id == dup["doc_id"] and d.created_at),
-                                None
-                            )
-                        }
-                        for dup in duplicates
-                    ],
+                    "primary_doc": self._doc_summary(docs_by_id[doc_id1]),
+                    "duplicates": duplicates,
                     "group_size": len(duplicates) + 1
                 }
 
@@ -142,6 +99,17 @@ class DuplicateDetector:
 
         return duplicate_groups
 
+    @staticmethod
+    def _doc_summary(doc: DBDocument) -> Dict[str, Any]:
+        """Metadata shown for a document in a duplicate group."""
+        return {
+            "doc_id": doc.doc_id,
+            "source_type": doc.source_type,
+            "skill_level": doc.skill_level,
+            "cluster_id": doc.cluster_id,
+            "created_at": doc.created_at.isoformat() if doc.created_at else None
+        }
+
     def get_duplicate_content(
         self,
         doc_id1: int,
@@ -230,34 +198,23 @@ class DuplicateDetector:
         if len(docs) != len(all_doc_ids):
             raise ValueError("One or more documents not found or not owned by user")
 
-        # Delete the duplicate documents
-        deleted_count = 0
-        for doc_id in delete_doc_ids:
-            # Get the document to find its internal ID
-            doc = self.db.query(DBDocument).filter(
-                DBDocument.doc_id == doc_id
-            ).first()
-
-            if not doc:
-                continue
+        # Delete the duplicates with one statement per table instead of
+        # three queries per document (the ownership query loaded them)
+        delete_ids = set(delete_doc_ids)
+        internal_ids = [doc.id for doc in docs if doc.doc_id in delete_ids]
+        deleted_count = len(internal_ids)
 
-            # Delete from vector documents
+        if internal_ids:
             self.db.query(DBVectorDocument).filter(
-                DBVectorDocument.doc_id == doc_id
-            ).delete()
-
-            # Delete concepts - FIXED: Use document_id (foreign key to documents.id)
-            from .db_models import DBConcept
+                DBVectorDocument.doc_id.in_(delete_ids)
+            ).delete(synchronize_session=False)
+            # document_id references documents.id, not doc_id
             self.db.query(DBConcept).filter(
-                DBConcept.document_id == doc.id  # FIX: document_id references documents.id, not doc_id
-            ).delete()
-
-            # Delete document
+                DBConcept.document_id.in_(internal_ids)
+            ).delete(synchronize_session=False)
             self.db.query(DBDocument).filter(
-                DBDocument.doc_id == doc_id
-            ).delete()
-
-            deleted_count += 1
+                DBDocument.id.in_(internal_ids)
+            ).delete(synchronize_session=False)
 
         self.db.commit()
 
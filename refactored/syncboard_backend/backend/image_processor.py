@@ -3,26 +3,210 @@ Image processing and OCR for visual content ingestion.
 """
 
 import base64
+import hashlib
 import logging
+import math
+import multiprocessing
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
 from io import BytesIO
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
+
+# OCR is parallelized across images, not inside Tesseract: OpenMP threads
+# per engine oversubscribe the cores. Must be set before Tesseract loads.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+import numpy as np
 from PIL import Image
 import pytesseract
 
+# In-process Tesseract (no subprocess or traineddata reload per image);
+# pytesseract otherwise
+try:
+    from tesserocr import PyTessBaseAPI, PSM
+except ImportError:
+    PyTessBaseAPI = None
+
+# BLAKE3 (SIMD-accelerated) for cache keys; stdlib BLAKE2b otherwise
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+from .constants import OCR_DRAFT_SIZE
+
+# Formats stored byte-for-byte as uploaded (Pillow format -> file extension)
+STORED_IMAGE_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+
 logger = logging.getLogger(__name__)
 
 
 class ImageProcessor:
     """Process images for ingestion."""
     
-    def __init__(self):
+    def __init__(self, binarize: bool = False, cache_maxsize: int = 1024, processes: int = 0):
+        """
+        Initialize image processor.
+
+        Args:
+            binarize: Otsu-threshold images to black/white before OCR
+            cache_maxsize: Maximum number of cached OCR results (LRU)
+            processes: OCR in this many worker processes instead of threads
+                (0 = in-process); image bytes are passed via shared memory
+        """
+        self.binarize = binarize
+        self.processes = processes
+
+        # OCR results by image content hash; re-ingested images skip Tesseract
+        self.cache_maxsize = cache_maxsize
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         # Windows users may need to set tesseract path
         tesseract_cmd = os.environ.get("TESSERACT_CMD")
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+        # One long-lived tesserocr API per worker thread (they are not thread-safe)
+        self._local = threading.local()
+        self._apis = []
+        self._apis_lock = threading.Lock()
+        # Long-lived OCR workers, so per-thread engines are reused across batches
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_api(self):
+        """Return this thread's tesserocr API, creating it on first use."""
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = PyTessBaseAPI(lang="eng", psm=PSM.AUTO)
+            self._local.api = api
+            with self._apis_lock:
+                self._apis.append(api)
+        return api
+
+    @staticmethod
+    def _image_hash(image_bytes: bytes) -> bytes:
+        """Compute the 128-bit OCR cache key for raw image bytes."""
+        if _blake3 is not None:
+            return _blake3(image_bytes).digest(16)
+        return hashlib.blake2b(image_bytes, digest_size=16).digest()
+
+    @staticmethod
+    def _otsu_threshold(gray: np.ndarray) -> int:
+        """Return the Otsu threshold of a uint8 grayscale image."""
+        hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+        levels = np.arange(256)
+        weight_bg = np.cumsum(hist)
+        weight_fg = weight_bg[-1] - weight_bg
+        sum_bg = np.cumsum(hist * levels)
+        mean_bg = np.divide(sum_bg, weight_bg, out=np.zeros(256), where=weight_bg > 0)
+        mean_fg = np.divide(sum_bg[-1] - sum_bg, weight_fg, out=np.zeros(256), where=weight_fg > 0)
+        between_variance = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+        return int(np.argmax(between_variance))
+
+    def _preprocess(self, image: Image.Image) -> Image.Image:
+        """Reduce an image to the single-channel input Tesseract works on."""
+        # Grayscale: a third of the RGB pixel data, and Tesseract converts anyway
+        if image.mode != 'L':
+            image = image.convert('L')
+
+        if self.binarize:
+            gray = np.asarray(image)
+            threshold = self._otsu_threshold(gray)
+            image = Image.fromarray(np.where(gray > threshold, 255, 0).astype(np.uint8), mode='L')
+
+        return image
+
+    def _ocr(self, image: Image.Image, dpi: Optional[int] = None) -> str:
+        """Run OCR on a preprocessed PIL image."""
+        if PyTessBaseAPI is None:
+            config = f"--dpi {dpi}" if dpi else ""
+            return pytesseract.image_to_string(image, config=config)
+
+        api = self._get_api()
+        api.SetImage(image)
+        if dpi:
+            # Known resolution: skip Tesseract's DPI estimation
+            api.SetSourceResolution(dpi)
+        return api.GetUTF8Text()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the OCR worker pool, creating it on first use."""
+        with self._apis_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    thread_name_prefix="ocr"
+                )
+            return self._executor
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Return the OCR worker processes, starting them on first use."""
+        with self._apis_lock:
+            if self._process_pool is None:
+                # spawn: forking a threaded server process is unsafe
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_ocr_worker,
+                    initargs=(self.binarize,)
+                )
+            return self._process_pool
+
+    def _recognize_in_process(self, image_bytes: bytes) -> str:
+        """Run _recognize() in a worker process, handing it the bytes via shared memory."""
+        shm = shared_memory.SharedMemory(create=True, size=max(len(image_bytes), 1))
+        try:
+            shm.buf[:len(image_bytes)] = image_bytes
+            future = self._get_process_pool().submit(_ocr_shared_image, shm.name, len(image_bytes))
+            return future.result()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self) -> None:
+        """Release the OCR workers and Tesseract engines held by this processor."""
+        with self._apis_lock:
+            executor, self._executor = self._executor, None
+            process_pool, self._process_pool = self._process_pool, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if process_pool is not None:
+            process_pool.shutdown(wait=True)
+        with self._apis_lock:
+            apis, self._apis = self._apis, []
+        for api in apis:
+            api.End()
+        self._local = threading.local()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
+    def _recognize(self, image_bytes: bytes) -> str:
+        """Decode, preprocess and OCR raw image bytes (uncached; raises on failure)."""
+        with BytesIO(image_bytes) as buffer, Image.open(buffer) as image:
+            dpi = image.info.get("dpi")
+            
+            # Let libjpeg decode large JPEGs at 1/2, 1/4 or 1/8 scale directly
+            # (no-op for other formats); the DPI shrinks with the pixels
+            full_width = image.width
+            ratio = min(1.0, OCR_DRAFT_SIZE[0] / image.width, OCR_DRAFT_SIZE[1] / image.height)
+            image.draft('L', (math.ceil(image.width * ratio), math.ceil(image.height * ratio)))
+            if dpi and image.width != full_width:
+                dpi = (dpi[0] * image.width / full_width,)
+            
+            # Extract text (closing the preprocessed copy frees its pixels too)
+            with self._preprocess(image) as ocr_image:
+                return self._ocr(ocr_image, int(dpi[0]) if dpi else None).strip()
+
     def extract_text_from_image(self, image_bytes: bytes) -> str:
         """
         Extract text from image using OCR.
@@ -33,27 +217,58 @@ class ImageProcessor:
         Returns:
             Extracted text or empty string
         """
+        key = self._image_hash(image_bytes)
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                logger.debug("OCR cache hit")
+                return self._cache[key]
+
         try:
-            image = Image.open(BytesIO(image_bytes))
-            
-            # Convert to RGB if needed
-            if image.mode not in ('RGB', 'L'):
-                image = image.convert('RGB')
-            
-            # Extract text
-            text = pytesseract.image_to_string(image)
+            if self.processes:
+                text = self._recognize_in_process(image_bytes)
+            else:
+                text = self._recognize(image_bytes)
             
             logger.info(f"Extracted {len(text)} characters from image")
-            return text.strip()
             
         except Exception as e:
             logger.error(f"OCR failed: {e}")
             return ""
+        
+        with self._cache_lock:
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_maxsize:
+                self._cache.popitem(last=False)
+        return text
     
+    def extract_text_batch(self, images: List[bytes]) -> List[str]:
+        """
+        Extract text from several images in parallel.
+
+        Each worker thread owns one Tesseract engine; tesserocr releases the
+        GIL while recognizing, so images are processed concurrently. With
+        processes > 0 the threads hand each image to the process pool.
+
+        Args:
+            images: Raw image bytes for each image
+
+        Returns:
+            Extracted text per image, in input order ("" on failure)
+        """
+        if not images:
+            return []
+        if len(images) == 1:
+            return [self.extract_text_from_image(images[0])]
+        return list(self._get_executor().map(self.extract_text_from_image, images))
+
     def get_image_metadata(self, image_bytes: bytes) -> Dict:
         """
         Extract image metadata.
         
+        Only the image header is read; pixels are never decoded.
+        
         Returns:
             {
                 "width": int,
@@ -64,26 +279,30 @@ class ImageProcessor:
             }
         """
         try:
-            image = Image.open(BytesIO(image_bytes))
-            
-            return {
-                "width": image.width,
-                "height": image.height,
-                "format": image.format or "unknown",
-                "mode": image.mode,
-                "size_bytes": len(image_bytes)
-            }
+            with BytesIO(image_bytes) as buffer, Image.open(buffer) as image:
+                return {
+                    "width": image.width,
+                    "height": image.height,
+                    "format": image.format or "unknown",
+                    "mode": image.mode,
+                    "size_bytes": len(image_bytes)
+                }
         except Exception as e:
             logger.error(f"Failed to get image metadata: {e}")
             return {}
     
-    def store_image(self, image_bytes: bytes, doc_id: int) -> str:
+    def store_image(self, image_bytes: bytes, doc_id: int, format_hint: Optional[str] = None) -> str:
         """
         Store image file to disk with path traversal protection.
 
+        Web-displayable uploads (JPEG, PNG, GIF, WebP) are written as-is, with
+        no decode/re-encode round trip. Other formats, or any image when
+        format_hint is given, are re-encoded (JPEG by default).
+
         Args:
             image_bytes: Raw image bytes
             doc_id: Document ID
+            format_hint: Force re-encoding to this format ("jpeg" or "png")
 
         Returns:
             File path where image was saved
@@ -95,12 +314,29 @@ class ImageProcessor:
         if not isinstance(doc_id, int) or doc_id < 0:
             raise ValueError(f"Invalid doc_id: {doc_id}")
 
+        try:
+            # Header-only read: identifies the format without decoding pixels
+            with BytesIO(image_bytes) as buffer, Image.open(buffer) as image:
+                source_format = image.format
+        except Exception as e:
+            logger.error(f"Failed to save image: {e}")
+            return ""
+
+        if format_hint is None and source_format in STORED_IMAGE_EXTENSIONS:
+            target_format = None
+            extension = STORED_IMAGE_EXTENSIONS[source_format]
+        else:
+            target_format = (format_hint or "jpeg").upper()
+            if target_format not in ("JPEG", "PNG"):
+                raise ValueError(f"Unsupported image format: {format_hint}")
+            extension = STORED_IMAGE_EXTENSIONS[target_format]
+
         # Create images directory with absolute path
         images_dir = Path("stored_images").resolve()
         images_dir.mkdir(parents=True, exist_ok=True)
 
         # Construct filepath with validated doc_id (use abs() to ensure positive)
-        filename = f"doc_{abs(doc_id)}.png"
+        filename = f"doc_{abs(doc_id)}.{extension}"
         filepath = images_dir / filename
 
         # Security check: ensure filepath is within images_dir
@@ -113,10 +349,48 @@ class ImageProcessor:
             raise
 
         try:
-            image = Image.open(BytesIO(image_bytes))
-            image.save(str(filepath), "PNG")
+            if target_format is None:
+                with open(filepath, "wb") as f:
+                    f.write(image_bytes)
+            else:
+                with BytesIO(image_bytes) as buffer, Image.open(buffer) as image:
+                    if target_format == "JPEG":
+                        with image.convert("RGB") as rgb:
+                            rgb.save(str(filepath), "JPEG", quality=85, optimize=True)
+                    else:
+                        image.save(str(filepath), "PNG")
             logger.info(f"Saved image to {filepath}")
             return str(filepath)
         except Exception as e:
             logger.error(f"Failed to save image: {e}")
             return ""
+
+
+# =============================================================================
+# OCR worker processes (ImageProcessor(processes=N))
+# =============================================================================
+
+# Each worker process's own single-threaded engine, set up by _init_ocr_worker
+_worker_processor: Optional[ImageProcessor] = None
+
+
+def _init_ocr_worker(binarize: bool) -> None:
+    """Process pool initializer: one OCR engine per worker, OpenMP off."""
+    global _worker_processor
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    _worker_processor = ImageProcessor(binarize=binarize, cache_maxsize=0)
+
+
+def _ocr_shared_image(name: str, size: int) -> str:
+    """OCR an image the parent process placed in a shared memory block."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        image_bytes = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+    try:
+        return _worker_processor._recognize(image_bytes)
+    except Exception as e:
+        # Some library exceptions can't be unpickled in the parent, which
+        # would mark the whole pool broken; send back a plain error instead
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
@@ -21,8 +21,12 @@ Dependencies:
 """
 
 import os
+import re
+import codecs
+import asyncio
 import tempfile
 import logging
+import threading
 import subprocess
 from typing import Optional
 from pathlib import Path
@@ -38,6 +42,25 @@ if not OPENAI_API_KEY:
 WHISPER_MAX_SIZE_MB = 25
 WHISPER_MAX_SIZE_BYTES = WHISPER_MAX_SIZE_MB * 1024 * 1024
 
+# ffmpeg output settings for compress_audio_for_whisper, by container.
+# Opus at 24kbps is plenty for speech and fits ~2.5x more audio than MP3.
+WHISPER_COMPRESSION_ARGS = {
+    'mp3': ['-b:a', '64k', '-f', 'mp3'],
+    'ogg': ['-c:a', 'libopus', '-b:a', '24k', '-f', 'ogg'],
+}
+
+# Concurrent Whisper requests when transcribing a chunked file
+WHISPER_MAX_CONCURRENCY = 4
+
+# Segment length for pipelined transcription of long audio
+WHISPER_SEGMENT_SECONDS = 300
+
+# Web article download limit (pages are streamed and aborted past this)
+WEB_MAX_SIZE_MB = 10
+WEB_MAX_SIZE_BYTES = WEB_MAX_SIZE_MB * 1024 * 1024
+WEB_CHUNK_SIZE = 64 * 1024
+WEB_POOL_SIZE = 32  # Pooled connections per host for web ingest
+
 
 def download_url(url: str) -> str:
     """
@@ -73,45 +96,62 @@ def download_url(url: str) -> str:
         return extract_web_article(url)
 
 
-def compress_audio_for_whisper(input_path: Path, output_path: Path) -> None:
+def compress_audio_for_whisper(input_bytes: bytes, output_format: str = 'mp3') -> bytes:
     """
-    Compress audio file to meet Whisper's 25MB limit.
+    Compress audio to meet Whisper's 25MB limit.
     
     Compression settings optimized for speech transcription:
     - 16kHz sample rate (Whisper's recommended format)
     - Mono channel (speech doesn't need stereo)
-    - 64kbps bitrate (sufficient for clear speech)
+    - 64kbps MP3, or 24kbps Opus in an Ogg container (sufficient for clear speech)
     
     This typically reduces file size by 50-70% with no quality loss for transcription.
     
+    Audio is piped through ffmpeg's stdin/stdout, so no temporary files are
+    written. Containers that need seeking to decode (e.g. MP4/M4A with the
+    index at the end) fall back to reading the input from a temporary file.
+    
     Args:
-        input_path: Path to original audio file
-        output_path: Path to save compressed audio
+        input_bytes: Original audio file content
+        output_format: 'mp3' or 'ogg' (Opus)
+        
+    Returns:
+        Compressed audio in output_format
         
     Raises:
         Exception: If FFmpeg compression fails
     """
-    try:
-        subprocess.run([
+    def _run_ffmpeg(input_arg: str, stdin_bytes: Optional[bytes]) -> bytes:
+        return subprocess.run([
             'ffmpeg',
-            '-i', str(input_path),
+            '-loglevel', 'error',
+            '-i', input_arg,
             '-ar', '16000',      # 16kHz sample rate (Whisper optimal)
             '-ac', '1',          # Mono audio (sufficient for speech)
-            '-b:a', '64k',       # 64kbps bitrate (good quality speech)
-            '-y',                # Overwrite output file
-            str(output_path)
-        ], check=True, capture_output=True, text=True)
-        
-        original_size = input_path.stat().st_size / (1024 * 1024)  # MB
-        compressed_size = output_path.stat().st_size / (1024 * 1024)  # MB
-        
-        logger.info(
-            f"Compressed audio: {original_size:.2f}MB → {compressed_size:.2f}MB "
-            f"({100 * (1 - compressed_size/original_size):.1f}% reduction)"
-        )
-        
+            *WHISPER_COMPRESSION_ARGS[output_format],
+            'pipe:1'
+        ], input=stdin_bytes, check=True, capture_output=True).stdout
+    
+    try:
+        try:
+            compressed = _run_ffmpeg('pipe:0', input_bytes)
+        except subprocess.CalledProcessError:
+            # Input format needs a seekable file
+            with tempfile.NamedTemporaryFile() as temp_file:
+                temp_file.write(input_bytes)
+                temp_file.flush()
+                compressed = _run_ffmpeg(temp_file.name, None)
     except subprocess.CalledProcessError as e:
-        raise Exception(f"Audio compression failed: {e.stderr}")
+        raise Exception(f"Audio compression failed: {e.stderr.decode(errors='replace')}")
+    
+    original_size = len(input_bytes) / (1024 * 1024)  # MB
+    compressed_size = len(compressed) / (1024 * 1024)  # MB
+    
+    logger.info(
+        f"Compressed audio: {original_size:.2f}MB → {compressed_size:.2f}MB "
+        f"({100 * (1 - compressed_size/original_size):.1f}% reduction)"
+    )
+    return compressed
 
 
 def chunk_audio_file(audio_path: Path, chunk_duration_seconds: int = 600) -> list[Path]:
@@ -142,7 +182,7 @@ def chunk_audio_file(audio_path: Path, chunk_duration_seconds: int = 600) -> lis
         ], check=True, capture_output=True, text=True)
         
         # Find all created chunks
-        chunks = sorted(audio_path.parent.glob(f"{audio_path.stem}_chunk_*.{audio_path.suffix}"))
+        chunks = sorted(audio_path.parent.glob(f"{audio_path.stem}_chunk_*{audio_path.suffix}"))
         logger.info(f"Split audio into {len(chunks)} chunks")
         return chunks
         
@@ -155,11 +195,11 @@ def transcribe_youtube(url: str) -> str:
     Transcribe a YouTube video using OpenAI Whisper.
     
     Process:
-    1. Download audio using yt-dlp
-    2. Compress audio to meet Whisper's 25MB limit
-    3. If still too large, split into chunks
-    4. Transcribe with Whisper API
-    5. Return transcript with metadata
+    1. Download the native audio stream using yt-dlp (no transcode)
+    2. If over Whisper's 25MB limit, split into 5-minute segments
+    3. Transcribe with Whisper API (segments are compressed and uploaded
+       in an overlapping pipeline)
+    4. Return transcript with metadata
     
     ✅ FIXED: Now handles videos over 25MB by compressing audio first
     
@@ -186,18 +226,14 @@ def transcribe_youtube(url: str) -> str:
     # Create temporary directory for audio
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
-        audio_path = temp_path / "audio.mp3"
-        compressed_path = temp_path / "audio_compressed.mp3"
         
-        # Download audio with yt-dlp
+        # Download YouTube's native audio-only stream (Opus in WebM when
+        # available). Whisper accepts it directly, so there is no mp3
+        # transcode pass.
         ydl_opts = {
-            'format': 'bestaudio/best',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
-            'outtmpl': str(audio_path.with_suffix('')),
+            'format': 'bestaudio[ext=webm][acodec=opus]/bestaudio/best',
+            'postprocessors': [],
+            'outtmpl': str(temp_path / 'audio.%(ext)s'),
             'quiet': True,
             'no_warnings': True,
         }
@@ -208,48 +244,41 @@ def transcribe_youtube(url: str) -> str:
                 title = info.get('title', 'Unknown')
                 duration = info.get('duration', 0)
                 channel = info.get('channel', 'Unknown')
-                
+            
+            audio_path = next(temp_path.glob('audio.*'))
             original_size = audio_path.stat().st_size
             logger.info(
-                f"Downloaded: {title} ({duration}s, {original_size/(1024*1024):.2f}MB)"
+                f"Downloaded: {title} ({duration}s, {original_size/(1024*1024):.2f}MB, "
+                f"{audio_path.suffix.lstrip('.')})"
             )
             
         except Exception as e:
             raise Exception(f"Failed to download YouTube video: {e}")
         
-        # Check if compression is needed
+        # Long audio: split into segments and pipeline compression with
+        # Whisper uploads instead of compressing the whole file first
         if original_size > WHISPER_MAX_SIZE_BYTES:
             logger.info(
                 f"Audio file ({original_size/(1024*1024):.2f}MB) exceeds Whisper limit "
-                f"({WHISPER_MAX_SIZE_MB}MB). Compressing..."
+                f"({WHISPER_MAX_SIZE_MB}MB). Transcribing in segments..."
             )
-            compress_audio_for_whisper(audio_path, compressed_path)
-            transcription_path = compressed_path
-        else:
-            logger.info("Audio file within Whisper limit, no compression needed")
-            transcription_path = audio_path
-        
-        # Check if chunking is needed (for very long videos)
-        final_size = transcription_path.stat().st_size
-        if final_size > WHISPER_MAX_SIZE_BYTES:
-            logger.warning(
-                f"Even after compression ({final_size/(1024*1024):.2f}MB), "
-                f"file exceeds limit. Splitting into chunks..."
+            chunks = chunk_audio_file(audio_path, WHISPER_SEGMENT_SECONDS)
+            return asyncio.run(
+                transcribe_audio_chunks(chunks, title, channel, duration, url, compress=True)
             )
-            chunks = chunk_audio_file(transcription_path)
-            return transcribe_audio_chunks(chunks, title, channel, duration, url)
+        
+        logger.info("Audio file within Whisper limit, no compression needed")
         
         # Transcribe with Whisper (single file)
         try:
             client = OpenAI(api_key=OPENAI_API_KEY)
             
-            logger.info(f"Sending to Whisper API ({final_size/(1024*1024):.2f}MB)...")
-            with open(transcription_path, 'rb') as audio_file:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
+            logger.info(f"Sending to Whisper API ({original_size/(1024*1024):.2f}MB)...")
+            transcript = client.audio.transcriptions.create(
+                model="whisper-1",
+                file=(audio_path.name, audio_path.read_bytes()),
+                response_format="text"
+            )
             
             # Format result with metadata
             result = f"""YOUTUBE VIDEO TRANSCRIPT
@@ -269,13 +298,17 @@ TRANSCRIPT:
             raise Exception(f"Whisper transcription failed: {e}")
 
 
-def transcribe_audio_chunks(chunks: list[Path], title: str, channel: str, 
-                            duration: int, url: str) -> str:
+async def transcribe_audio_chunks(chunks: list[Path], title: str, channel: str, 
+                                  duration: int, url: str, compress: bool = False) -> str:
     """
     Transcribe multiple audio chunks and combine results.
     
-    Only used for very long videos (90+ minutes) where even compression
-    doesn't bring the file under 25MB.
+    Used for long videos that exceed Whisper's 25MB limit. Chunks flow
+    through a two-stage pipeline: a compressor reads (and optionally
+    compresses) chunks in order while WHISPER_MAX_CONCURRENCY uploaders
+    send finished chunks to Whisper, so ffmpeg work on one chunk overlaps
+    with uploads of the previous ones. Transcripts are reassembled by
+    sequence number.
     
     Args:
         chunks: List of audio chunk paths
@@ -283,26 +316,52 @@ def transcribe_audio_chunks(chunks: list[Path], title: str, channel: str,
         channel: Channel name
         duration: Video duration in seconds
         url: Original video URL
+        compress: Compress each chunk to Opus before upload
         
     Returns:
         Combined transcript with metadata
     """
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=OPENAI_API_KEY)
         
-        transcripts = []
-        for i, chunk_path in enumerate(chunks, 1):
-            logger.info(f"Transcribing chunk {i}/{len(chunks)}...")
-            
-            with open(chunk_path, 'rb') as audio_file:
-                transcript = client.audio.transcriptions.create(
+        transcripts: list = [None] * len(chunks)
+        # Bounded so compression runs at most one chunk ahead of each uploader
+        upload_queue: asyncio.Queue = asyncio.Queue(maxsize=WHISPER_MAX_CONCURRENCY)
+        
+        async def _compressor() -> None:
+            for i, chunk_path in enumerate(chunks):
+                audio_bytes = await asyncio.to_thread(chunk_path.read_bytes)
+                name = chunk_path.name
+                if compress:
+                    audio_bytes = await asyncio.to_thread(compress_audio_for_whisper, audio_bytes, 'ogg')
+                    name = f"{chunk_path.stem}.ogg"
+                await upload_queue.put((i, name, audio_bytes))
+            for _ in range(WHISPER_MAX_CONCURRENCY):
+                await upload_queue.put(None)
+        
+        async def _uploader() -> None:
+            while (item := await upload_queue.get()) is not None:
+                i, name, audio_bytes = item
+                logger.info(f"Transcribing chunk {i + 1}/{len(chunks)}...")
+                transcript = await client.audio.transcriptions.create(
                     model="whisper-1",
-                    file=audio_file,
+                    file=(name, audio_bytes),
                     response_format="text"
                 )
-            
-            transcripts.append(f"[Part {i}]\n{transcript}")
+                transcripts[i] = f"[Part {i + 1}]\n{transcript}"
+        
+        tasks = [asyncio.create_task(_compressor())]
+        tasks += [asyncio.create_task(_uploader()) for _ in range(WHISPER_MAX_CONCURRENCY)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the other stage blocked on the queue
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            await client.close()
         
         combined_transcript = "\n\n".join(transcripts)
         
@@ -354,7 +413,6 @@ def transcribe_tiktok(url: str) -> str:
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = Path(temp_dir)
         audio_path = temp_path / "audio.mp3"
-        compressed_path = temp_path / "audio_compressed.mp3"
         
         ydl_opts = {
             'format': 'bestaudio/best',
@@ -379,24 +437,22 @@ def transcribe_tiktok(url: str) -> str:
         except Exception as e:
             raise Exception(f"Failed to download TikTok video: {e}")
         
+        audio_bytes = audio_path.read_bytes()
+        
         # Compress if needed
         if original_size > WHISPER_MAX_SIZE_BYTES:
             logger.info("Compressing TikTok audio...")
-            compress_audio_for_whisper(audio_path, compressed_path)
-            transcription_path = compressed_path
-        else:
-            transcription_path = audio_path
+            audio_bytes = compress_audio_for_whisper(audio_bytes)
         
         # Transcribe
         try:
             client = OpenAI(api_key=OPENAI_API_KEY)
             
-            with open(transcription_path, 'rb') as audio_file:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
+            transcript = client.audio.transcriptions.create(
+                model="whisper-1",
+                file=("audio.mp3", audio_bytes),
+                response_format="text"
+            )
             
             result = f"""TIKTOK VIDEO TRANSCRIPT
 Title: {title}
@@ -413,11 +469,205 @@ TRANSCRIPT:
             raise Exception(f"TikTok transcription failed: {e}")
 
 
+# Boilerplate elements stripped before extracting article text
+WEB_STRIP_TAGS = ["script", "style", "nav", "footer", "header"]
+
+# Main content containers, in priority order (falls back to <body>)
+WEB_CONTENT_SELECTORS = ['article', 'main', '[role="main"]', '.content', '#content']
+
+# All containers in one selector group, so the document is walked once
+WEB_CONTENT_SELECTOR = ", ".join(WEB_CONTENT_SELECTORS)
+
+
+def _text_lines(chunks) -> list[str]:
+    """Split text node contents into stripped, non-empty lines in one pass."""
+    return [line for chunk in chunks for line in (part.strip() for part in chunk.split('\n')) if line]
+
+
+_SIMPLE_SELECTOR_RE = re.compile(r'^(?:(\w+)|\[(\w+)="([^"]*)"\]|\.([\w-]+)|#([\w-]+))$')
+
+
+def _compile_simple_selector(selector: str):
+    """Compile a type, [attr="value"], .class or #id selector to a (tag, attrs) predicate."""
+    match = _SIMPLE_SELECTOR_RE.match(selector)
+    if not match:
+        raise ValueError(f"Unsupported content selector: {selector}")
+    tag, attr, value, class_name, element_id = match.groups()
+    
+    if tag:
+        return lambda name, attrs: name == tag
+    if attr:
+        return lambda name, attrs: attrs.get(attr) == value
+    if class_name:
+        def has_class(name, attrs):
+            classes = attrs.get('class') or ()
+            # BeautifulSoup gives a list, selectolax the raw attribute string
+            return class_name in (classes.split() if isinstance(classes, str) else classes)
+        return has_class
+    return lambda name, attrs: attrs.get('id') == element_id
+
+
+_WEB_CONTENT_MATCHERS = [_compile_simple_selector(selector) for selector in WEB_CONTENT_SELECTORS]
+
+
+def _pick_main_content(candidates, name_and_attrs):
+    """
+    Pick the highest-priority container from a combined-selector match list.
+
+    Candidates arrive in document order from a single traversal; ranking
+    them by WEB_CONTENT_SELECTORS keeps the one-selector-at-a-time
+    priority (an <article> nested in a .content div still wins).
+    """
+    def rank(node):
+        name, attrs = name_and_attrs(node)
+        return next(i for i, matches in enumerate(_WEB_CONTENT_MATCHERS) if matches(name, attrs))
+    
+    # min() returns the first (earliest in the document) of equal rank
+    return min(candidates, key=rank, default=None)
+
+
+def _parse_article_selectolax(html: bytes) -> tuple:
+    """Extract (title, lines) with selectolax's Lexbor parser (C, ~25x faster)."""
+    from selectolax.lexbor import LexborHTMLParser
+    
+    tree = LexborHTMLParser(html)
+    
+    # Remove script and style elements
+    for node in tree.css(", ".join(WEB_STRIP_TAGS)):
+        node.decompose()
+    
+    # Get title
+    title = tree.css_first('title')
+    title_text = title.text() if title else 'Unknown'
+    
+    # Extract main content
+    main_content = _pick_main_content(
+        tree.css(WEB_CONTENT_SELECTOR), lambda node: (node.tag, node.attributes)
+    )
+    
+    if not main_content:
+        main_content = tree.body
+    
+    if not main_content:
+        return title_text, []
+    return title_text, _text_lines(
+        node.text_content for node in main_content.traverse(include_text=True) if node.tag == '-text'
+    )
+
+
+def _parse_article_bs4(html: bytes) -> tuple:
+    """Extract (title, lines) with BeautifulSoup."""
+    from bs4 import BeautifulSoup
+    
+    # C-backed lxml parser when installed
+    try:
+        import lxml  # noqa: F401
+        parser = 'lxml'
+    except ImportError:
+        parser = 'html.parser'
+    
+    soup = BeautifulSoup(html, parser)
+    
+    # Remove script and style elements
+    for script in soup(WEB_STRIP_TAGS):
+        script.decompose()
+    
+    # Get title
+    title = soup.find('title')
+    title_text = title.get_text() if title else 'Unknown'
+    
+    # Extract main content
+    main_content = _pick_main_content(
+        soup.select(WEB_CONTENT_SELECTOR), lambda node: (node.name, node.attrs)
+    )
+    
+    if not main_content:
+        main_content = soup.find('body')
+    
+    if not main_content:
+        return title_text, []
+    return title_text, _text_lines(main_content.strings)
+
+
+# Shared HTTP session for web ingest (created on first use)
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def _http_session():
+    """
+    Return the shared requests session for web ingest.
+    
+    One pooled session keeps connections (and TLS sessions) alive across
+    fetches, so repeat fetches from a host skip DNS/TCP/TLS setup. Transient
+    connection errors and 5xx responses are retried with backoff.
+    """
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        with _HTTP_SESSION_LOCK:
+            if _HTTP_SESSION is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                session = requests.Session()
+                session.headers.update({
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                })
+                adapter = HTTPAdapter(
+                    pool_connections=WEB_POOL_SIZE,
+                    pool_maxsize=WEB_POOL_SIZE,
+                    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _HTTP_SESSION = session
+    return _HTTP_SESSION
+
+
+def _load_web_cache(url: str) -> Optional[dict]:
+    """Return the cached fetch of url ({etag, last_modified, text}), if any."""
+    try:
+        from .database import get_db_context
+        from .db_models import DBWebCache
+        
+        with get_db_context() as db:
+            row = db.get(DBWebCache, url)
+            if row is None:
+                return None
+            return {"etag": row.etag, "last_modified": row.last_modified, "text": row.text}
+    except Exception as e:
+        logger.warning(f"Web cache lookup failed: {e}")
+        return None
+
+
+def _store_web_cache(url: str, etag: Optional[str], last_modified: Optional[str], text: str) -> None:
+    """Insert or refresh the cached fetch of url."""
+    try:
+        from datetime import datetime
+        from .database import get_db_context
+        from .db_models import DBWebCache
+        
+        with get_db_context() as db:
+            db.merge(DBWebCache(
+                url=url,
+                etag=etag,
+                last_modified=last_modified,
+                text=text,
+                fetched_at=datetime.utcnow()
+            ))
+    except Exception as e:
+        logger.warning(f"Web cache store failed: {e}")
+
+
 def extract_web_article(url: str) -> str:
     """
     Extract text content from a web article.
     
-    Uses BeautifulSoup to parse HTML and extract main content.
+    Parses HTML with selectolax when installed, BeautifulSoup otherwise,
+    and extracts the main content. Results are cached with the page's
+    ETag / Last-Modified validators; re-ingesting an unchanged page is a
+    conditional GET answered by 304 (no body, no parsing).
     
     Args:
         url: Web page URL
@@ -426,51 +676,57 @@ def extract_web_article(url: str) -> str:
         Extracted text content
     """
     try:
-        import requests
-        from bs4 import BeautifulSoup
+        session = _http_session()
     except ImportError:
         raise Exception(
             "Missing dependencies. Install with: "
             "pip install requests beautifulsoup4"
         )
     
+    try:
+        import selectolax  # noqa: F401
+        parse_article = _parse_article_selectolax
+    except ImportError:
+        try:
+            import bs4  # noqa: F401
+        except ImportError:
+            raise Exception(
+                "Missing dependencies. Install with: "
+                "pip install requests beautifulsoup4"
+            )
+        parse_article = _parse_article_bs4
+    
     logger.info(f"Extracting content from: {url}")
     
     try:
         # Fetch page
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-        
-        # Get title
-        title = soup.find('title')
-        title_text = title.get_text() if title else 'Unknown'
-        
-        # Extract main content
-        # Try common content containers
-        main_content = None
-        for selector in ['article', 'main', '[role="main"]', '.content', '#content']:
-            main_content = soup.select_one(selector)
-            if main_content:
-                break
-        
-        if not main_content:
-            main_content = soup.find('body')
+        headers = {}
+        cached = _load_web_cache(url)
+        if cached:
+            if cached["etag"]:
+                headers['If-None-Match'] = cached["etag"]
+            if cached["last_modified"]:
+                headers['If-Modified-Since'] = cached["last_modified"]
         
-        # Get text
-        text = main_content.get_text(separator='\n', strip=True) if main_content else ''
+        with session.get(url, headers=headers, timeout=10, stream=True) as response:
+            if cached and response.status_code == 304:
+                logger.info(f"Web page unchanged (304), using cached content: {url}")
+                return cached["text"]
+            
+            response.raise_for_status()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            
+            # Stream the body so an oversized page can't exhaust memory
+            chunks = []
+            total = 0
+            for chunk in response.iter_content(WEB_CHUNK_SIZE):
+                total += len(chunk)
+                if total > WEB_MAX_SIZE_BYTES:
+                    raise Exception(f"Page exceeds {WEB_MAX_SIZE_MB}MB limit")
+                chunks.append(chunk)
         
-        # Clean up whitespace
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        title_text, lines = parse_article(b"".join(chunks))
         text = '\n'.join(lines)
         
         result = f"""WEB ARTICLE
@@ -482,6 +738,11 @@ CONTENT:
 """
         
         logger.info(f"Extracted {len(text)} characters")
+        
+        # Only pages with validators can be revalidated later
+        if etag or last_modified:
+            _store_web_cache(url, etag, last_modified, result)
+        
         return result
         
     except Exception as e:
@@ -545,6 +806,52 @@ CODE_EXTENSIONS = {
 }
 
 
+# Byte order marks, longest first (the UTF-32 LE mark starts with UTF-16 LE's)
+TEXT_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def decode_text_bytes(content_bytes: bytes) -> str:
+    """
+    Decode uploaded text, detecting the encoding instead of guessing latin-1.
+
+    A BOM decides the codec outright; otherwise UTF-8 (the common case, one
+    C decode) is tried, and only non-UTF-8 bytes go through charset-normalizer.
+    """
+    for bom, encoding in TEXT_BOMS:
+        if content_bytes.startswith(bom):
+            return content_bytes.decode(encoding, errors='replace')
+
+    try:
+        return content_bytes.decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        from_bytes = None
+
+    if from_bytes is not None:
+        matches = from_bytes(content_bytes)
+        best = matches.best()
+        if best is not None:
+            # Latin code pages often tie on short text (e.g. French scored as
+            # Baltic cp1257); prefer Windows-1252, the usual legacy Western encoding
+            western = next((m for m in matches if 'cp1252' in m.could_be_from_charset), None)
+            if western is not None and western.coherence >= best.coherence:
+                best = western
+            return str(best)
+
+    # latin-1 maps every byte, so this never fails
+    return content_bytes.decode('latin-1')
+
+
 def ingest_upload_file(filename: str, content_bytes: bytes) -> str:
     """
     Process an uploaded file and extract text.
@@ -585,13 +892,7 @@ def ingest_upload_file(filename: str, content_bytes: bytes) -> str:
 
     # Text files
     elif file_ext in ['.txt', '.md', '.csv', '.json']:
-        try:
-            return content_bytes.decode('utf-8')
-        except UnicodeDecodeError:
-            try:
-                return content_bytes.decode('latin-1')
-            except:
-                raise Exception("Failed to decode text file")
+        return decode_text_bytes(content_bytes)
 
     # PDF files
     elif file_ext == '.pdf':
@@ -629,27 +930,95 @@ def ingest_upload_file(filename: str, content_bytes: bytes) -> str:
         raise Exception(f"Unsupported file type: {file_ext}")
 
 
+# Render scale for OCR of text-less (scanned) PDF pages: 2 x 72dpi = 144dpi
+PDF_OCR_RENDER_SCALE = 2
+
+
+def _ocr_pdf_pages(pages: list) -> list[str]:
+    """OCR rendered PDF pages (PIL images) with the shared image processor."""
+    import io
+    from .dependencies import get_image_processor
+    
+    images = []
+    for image in pages:
+        with io.BytesIO() as buffer:
+            image.save(buffer, "PNG")
+            images.append(buffer.getvalue())
+        image.close()
+    return get_image_processor().extract_text_batch(images)
+
+
+def _extract_pdf_pages_pdfium(content_bytes: bytes) -> list[str]:
+    """Extract per-page text with PDFium (C++), OCR'ing pages with no text layer."""
+    import pypdfium2 as pdfium
+    
+    pdf = pdfium.PdfDocument(content_bytes)
+    try:
+        texts = []
+        scanned = {}
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            text = textpage.get_text_bounded()
+            textpage.close()
+            if not text.strip():
+                scanned[i] = page.render(scale=PDF_OCR_RENDER_SCALE).to_pil()
+            page.close()
+            texts.append(text)
+    finally:
+        pdf.close()
+    
+    if scanned:
+        logger.info(f"OCR'ing {len(scanned)} PDF pages without a text layer")
+        try:
+            for i, text in zip(scanned, _ocr_pdf_pages(list(scanned.values()))):
+                texts[i] = text
+        except Exception as e:
+            logger.warning(f"PDF page OCR failed: {e}")
+    
+    return texts
+
+
+def _extract_pdf_pages_pypdf(content_bytes: bytes) -> list[str]:
+    """Extract per-page text with pure-Python pypdf."""
+    from pypdf import PdfReader
+    import io
+    
+    # pypdf reads pages lazily: extract before the buffer is released
+    with io.BytesIO(content_bytes) as pdf_file:
+        reader = PdfReader(pdf_file)
+        return [page.extract_text() for page in reader.pages]
+
+
 def extract_pdf_text(content_bytes: bytes) -> str:
-    """Extract text from PDF file."""
+    """
+    Extract text from PDF file.
+    
+    Uses PDFium (pypdfium2) when installed - parsing and text extraction run
+    in C++, many times faster than pypdf on large documents, and scanned
+    pages are OCR'd. Falls back to pypdf otherwise.
+    """
     try:
-        from pypdf import PdfReader
-        import io
+        import pypdfium2  # noqa: F401
+        extract_pages = _extract_pdf_pages_pdfium
     except ImportError:
-        raise Exception("Install pypdf: pip install pypdf")
+        try:
+            import pypdf  # noqa: F401
+        except ImportError:
+            raise Exception("Install pypdf: pip install pypdf")
+        extract_pages = _extract_pdf_pages_pypdf
     
     try:
-        pdf_file = io.BytesIO(content_bytes)
-        reader = PdfReader(pdf_file)
+        pages = extract_pages(content_bytes)
         
         text_parts = []
-        for i, page in enumerate(reader.pages):
-            text = page.extract_text()
+        for i, text in enumerate(pages):
             if text.strip():
                 text_parts.append(f"--- Page {i+1} ---\n{text}")
         
-        result = f"PDF DOCUMENT ({len(reader.pages)} pages)\n\n" + "\n\n".join(text_parts)
+        result = f"PDF DOCUMENT ({len(pages)} pages)\n\n" + "\n\n".join(text_parts)
         
-        logger.info(f"Extracted text from {len(reader.pages)} pages")
+        logger.info(f"Extracted text from {len(pages)} pages")
         return result
         
     except Exception as e:
@@ -677,47 +1046,36 @@ def transcribe_audio_file(content_bytes: bytes, filename: str) -> str:
     if not OPENAI_API_KEY:
         raise Exception("OPENAI_API_KEY not set")
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        
-        # Save original file
-        original_path = temp_path / f"original{Path(filename).suffix}"
-        with open(original_path, 'wb') as f:
-            f.write(content_bytes)
-        
-        original_size = len(content_bytes)
-        logger.info(f"Audio file size: {original_size/(1024*1024):.2f}MB")
+    original_size = len(content_bytes)
+    logger.info(f"Audio file size: {original_size/(1024*1024):.2f}MB")
+    
+    # Compress if needed (in memory, piped through ffmpeg)
+    if original_size > WHISPER_MAX_SIZE_BYTES:
+        logger.info("Compressing audio file...")
+        audio_file = ("audio.mp3", compress_audio_for_whisper(content_bytes))
+    else:
+        audio_file = (Path(filename).name, content_bytes)
+    
+    try:
+        client = OpenAI(api_key=OPENAI_API_KEY)
         
-        # Compress if needed
-        if original_size > WHISPER_MAX_SIZE_BYTES:
-            logger.info("Compressing audio file...")
-            compressed_path = temp_path / f"compressed{Path(filename).suffix}"
-            compress_audio_for_whisper(original_path, compressed_path)
-            transcription_path = compressed_path
-        else:
-            transcription_path = original_path
+        transcript = client.audio.transcriptions.create(
+            model="whisper-1",
+            file=audio_file,
+            response_format="text"
+        )
         
-        try:
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            
-            with open(transcription_path, 'rb') as audio_file:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format="text"
-                )
-            
-            result = f"""AUDIO FILE TRANSCRIPT
+        result = f"""AUDIO FILE TRANSCRIPT
 Filename: {filename}
 
 TRANSCRIPT:
 {transcript}
 """
-            logger.info(f"Successfully transcribed audio file ({len(transcript)} characters)")
-            return result
-            
-        except Exception as e:
-            raise Exception(f"Audio transcription failed: {e}")
+        logger.info(f"Successfully transcribed audio file ({len(transcript)} characters)")
+        return result
+        
+    except Exception as e:
+        raise Exception(f"Audio transcription failed: {e}")
 
 
 def extract_docx_text(content_bytes: bytes) -> str:
@@ -729,13 +1087,12 @@ def extract_docx_text(content_bytes: bytes) -> str:
         raise Exception("Install python-docx: pip install python-docx")
 
     try:
-        doc_file = io.BytesIO(content_bytes)
-        doc = Document(doc_file)
+        # python-docx needs a file-like object; release it as soon as it's parsed
+        with io.BytesIO(content_bytes) as doc_file:
+            doc = Document(doc_file)
 
-        text_parts = []
-        for para in doc.paragraphs:
-            if para.text.strip():
-                text_parts.append(para.text)
+        # Paragraph.text is rebuilt from runs on every access: read it once
+        text_parts = [text for text in (para.text for para in doc.paragraphs) if text.strip()]
 
         result = "WORD DOCUMENT\n\n" + "\n\n".join(text_parts)
 
@@ -869,15 +1226,7 @@ def extract_code_file(content_bytes: bytes, filename: str) -> str:
     language = CODE_EXTENSIONS.get(ext, 'Unknown')
 
     # Decode content
-    try:
-        code = content_bytes.decode('utf-8')
-    except UnicodeDecodeError:
-        # Try latin-1 as fallback
-        try:
-            code = content_bytes.decode('latin-1', errors='replace')
-            logger.warning(f"Used latin-1 fallback for {filename}")
-        except Exception as e:
-            raise Exception(f"Failed to decode {filename}: {e}")
+    code = decode_text_bytes(content_bytes)
 
     # Calculate statistics
     lines = code.split('\n')
@@ -5,16 +5,210 @@ This allows easy switching between OpenAI, Anthropic, local models, etc.
 """
 
 import os
+import re
 import json
+import asyncio
+import hashlib
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
+import httpx
 from openai import AsyncOpenAI
+
+# orjson is a faster drop-in JSON parser; fall back to stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from .constants import (
+    DEFAULT_OPENAI_MAX_CONCURRENCY,
+    DEFAULT_OPENAI_RPM_LIMIT,
+    DEFAULT_OPENAI_TPM_LIMIT,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_CONTEXT_WINDOW,
+    CONCEPT_MAX_TOKENS,
+    SUGGESTION_MAX_TOKENS,
+    SUGGESTION_TOKENS_PER_ITEM,
+    SUGGESTION_TOKENS_OVERHEAD,
+)
+from .rate_limiter import TokenBucket, estimate_message_tokens, estimate_tokens
+
 logger = logging.getLogger(__name__)
 
+# Terminal states reported by the OpenAI Batch API
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Structured output: the model is constrained to emit a single JSON object
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+# Prompt templates. The static instructions live in the system message so
+# the identical prefix is served from OpenAI's prompt cache; only the
+# variable slots are formatted per call.
+CONCEPT_SYSTEM_PROMPT = """You are a concept extraction system. Return only valid JSON.
+
+Return ONLY valid JSON (no markdown, no explanation) with this structure:
+{
+  "concepts": [
+    {"name": "concept name", "relevance": 0.9}
+  ],
+  "skill_level": "beginner|intermediate|advanced",
+  "primary_topic": "main topic in 2-4 words",
+  "suggested_cluster": "cluster name for grouping similar content"
+}
+
+Extract 3-10 concepts. Be specific. Use lowercase for names."""
+
+CONCEPT_PROMPT_TEMPLATE = """Analyze this {source_type} content and extract structured information.
+
+CONTENT:
+{sample}"""
+
+# Source types passed to extract_concepts by the upload routes
+CONCEPT_SOURCE_TYPES = ("youtube", "pdf", "text", "url", "audio", "image", "file")
+
+
+def _concept_prompt_prefix(source_type: str) -> str:
+    """Render the concept prompt up to (not including) the content sample."""
+    return CONCEPT_PROMPT_TEMPLATE.format(source_type=source_type, sample="")
+
+
+# Prompt prefixes rendered once per known source type; each request only
+# appends its sample instead of re-formatting the whole template
+CONCEPT_PROMPT_PREFIXES = {
+    source_type: _concept_prompt_prefix(source_type) for source_type in CONCEPT_SOURCE_TYPES
+}
+
+BUILD_SUGGESTION_SYSTEM_PROMPT = """You are a project advisor. Return only valid JSON objects of build suggestions.
+
+Return ONLY a JSON object with a "suggestions" array (no markdown, no explanation):
+{"suggestions": [
+  {
+    "title": "Project Name",
+    "description": "What they'll build and why it's valuable",
+    "feasibility": "high|medium|low",
+    "effort_estimate": "2-3 days",
+    "required_skills": ["skill1", "skill2"],
+    "missing_knowledge": ["gap1", "gap2"],
+    "starter_steps": ["step 1", "step 2", "step 3"],
+    "file_structure": "project/\\n  src/\\n  tests/\\n  README.md"
+  }
+]}
+
+Be specific. Reference actual content from their knowledge. Prioritize projects they can START TODAY."""
+
+BUILD_SUGGESTION_PROMPT_TEMPLATE = """Based on this user's knowledge bank, suggest {max_suggestions} practical projects they could build RIGHT NOW.
+
+KNOWLEDGE BANK:
+{knowledge_summary}"""
+
+# Matches a response wrapped in a markdown code fence (``` or ```json)
+_FENCE_RE = re.compile(r"^\s*```(?:json\s*)?(.*?)```\s*$", re.DOTALL)
+
+# Marks the end of a streamed completion in the reader -> generator queue
+_STREAM_END = object()
+
+
+def _strip_fences(text: str) -> str:
+    """Remove a surrounding markdown code fence from an LLM response, if any."""
+    match = _FENCE_RE.match(text)
+    return match.group(1).strip() if match else text.strip()
+
+
+def _http2_available() -> bool:
+    """HTTP/2 multiplexing needs the optional h2 package."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _empty_concepts() -> Dict:
+    """Fallback extraction result used when the LLM call or parsing fails."""
+    return {
+        "concepts": [],
+        "skill_level": "unknown",
+        "primary_topic": "uncategorized",
+        "suggested_cluster": "General"
+    }
+
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser for a streamed JSON array of objects.
+
+    Feed it text chunks as they arrive; it returns every element object of
+    the first array in the stream whose closing brace has been seen, so
+    callers can act on the first element long before the array is
+    complete. Anything before the array (e.g. a {"suggestions": wrapper)
+    is skipped. Tracks string/escape state so braces inside string values
+    don't confuse the depth count.
+    """
+
+    def __init__(self):
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._current: List[str] = []
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        Consume a chunk of text.
+
+        Args:
+            chunk: Next piece of the streamed response
+
+        Returns:
+            Objects completed within this chunk (possibly empty)
+        """
+        completed = []
+        for ch in chunk:
+            if self._done:
+                break
+            if not self._started:
+                if ch == "[":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            # Depth 1 is inside the top-level array; objects live at depth >= 2
+            if self._depth >= 2:
+                self._current.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                self._depth += 1
+                if self._depth == 2 and ch == "{":
+                    self._current = [ch]
+            elif ch in "]}":
+                self._depth -= 1
+                if self._depth == 1 and ch == "}":
+                    try:
+                        completed.append(_json_loads("".join(self._current)))
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping malformed streamed object: {e}")
+                    self._current = []
+                elif self._depth == 0:
+                    self._done = True
+        return completed
+
 
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
@@ -55,6 +249,21 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def stream_build_suggestions(
+        self,
+        knowledge_summary: str,
+        max_suggestions: int
+    ) -> AsyncIterator[Dict]:
+        """
+        Yield build suggestions one at a time.
+
+        Providers that support streaming override this to yield each
+        suggestion as soon as it is complete; the default just iterates
+        over generate_build_suggestions().
+        """
+        for suggestion in await self.generate_build_suggestions(knowledge_summary, max_suggestions):
+            yield suggestion
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI implementation of LLM provider."""
@@ -63,7 +272,9 @@ class OpenAIProvider(LLMProvider):
         self,
         api_key: str = None,
         concept_model: str = "gpt-5-nano",
-        suggestion_model: str = "gpt-5-mini"
+        suggestion_model: str = "gpt-5-mini",
+        embedding_model: str = "text-embedding-3-small",
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         """
         Initialize OpenAI provider.
@@ -72,14 +283,45 @@ class OpenAIProvider(LLMProvider):
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             concept_model: Model for concept extraction
             suggestion_model: Model for build suggestions
+            embedding_model: Model for text embeddings
+            http_client: HTTP client to send requests through (defaults to a
+                new pooled client owned by this provider)
         """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key required")
 
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        # One pooled HTTP client per provider so keep-alive connections,
+        # TLS sessions and DNS lookups are reused across every call
+        self.http_client = http_client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            http2=_http2_available(),
+            timeout=httpx.Timeout(600.0, connect=5.0)
+        )
+        self.client = AsyncOpenAI(api_key=self.api_key, http_client=self.http_client)
         self.concept_model = concept_model
         self.suggestion_model = suggestion_model
+        self.embedding_model = embedding_model
+
+        # Bounds in-flight requests so callers can asyncio.gather() freely
+        # without tripping 429 rate limits
+        self._semaphore = asyncio.Semaphore(
+            int(os.environ.get("OPENAI_MAX_CONCURRENCY", str(DEFAULT_OPENAI_MAX_CONCURRENCY)))
+        )
+
+        # Proactive RPM/TPM throttling: wait for budget before sending
+        # instead of burning a round-trip on a 429
+        self._rate_limiter = TokenBucket(
+            max_requests_per_minute=int(os.environ.get("OPENAI_RPM_LIMIT", str(DEFAULT_OPENAI_RPM_LIMIT))),
+            max_tokens_per_minute=int(os.environ.get("OPENAI_TPM_LIMIT", str(DEFAULT_OPENAI_TPM_LIMIT)))
+        )
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self.http_client.aclose()
 
     @retry(
         stop=stop_after_attempt(3),
@@ -92,78 +334,216 @@ class OpenAIProvider(LLMProvider):
         messages: List[Dict],
         model: str,
         temperature: float,
-        max_tokens: int
+        max_tokens: int,
+        response_format: Optional[Dict] = None
     ) -> str:
-        """Call OpenAI API with retry logic."""
-        response = await self.client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            max_tokens=max_tokens
-        )
+        """Call OpenAI API with retry logic, throttling and bounded concurrency."""
+        extra = {"response_format": response_format} if response_format else {}
+        async with self._semaphore:
+            await self._rate_limiter.acquire(
+                estimate_message_tokens(messages, model) + max_tokens
+            )
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **extra
+            )
         return response.choices[0].message.content
 
+    async def embed_text(self, text: str) -> List[float]:
+        """
+        Embed text with the configured embedding model.
+
+        Used by ConceptExtractor's semantic cache to detect near-duplicate inputs.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        async with self._semaphore:
+            await self._rate_limiter.acquire(estimate_tokens(text, self.embedding_model))
+            response = await self.client.embeddings.create(
+                model=self.embedding_model,
+                input=text
+            )
+        return response.data[0].embedding
+
+    def _concept_messages(self, content: str, source_type: str) -> List[Dict]:
+        """Build the chat messages for a concept extraction request."""
+        prefix = CONCEPT_PROMPT_PREFIXES.get(source_type)
+        if prefix is None:
+            prefix = _concept_prompt_prefix(source_type)
+
+        return [
+            {"role": "system", "content": CONCEPT_SYSTEM_PROMPT},
+            # Only the first 2000 chars are sent for concept extraction
+            {"role": "user", "content": prefix + content[:2000]}
+        ]
+
     async def extract_concepts(
         self,
         content: str,
         source_type: str
     ) -> Dict:
         """Extract concepts using OpenAI."""
-        # Truncate content for concept extraction
-        sample = content[:2000] if len(content) > 2000 else content
-
-        prompt = f"""Analyze this {source_type} content and extract structured information.
-
-CONTENT:
-{sample}
-
-Return ONLY valid JSON (no markdown, no explanation) with this structure:
-{{
-  "concepts": [
-    {{"name": "concept name", "relevance": 0.9}}
-  ],
-  "skill_level": "beginner|intermediate|advanced",
-  "primary_topic": "main topic in 2-4 words",
-  "suggested_cluster": "cluster name for grouping similar content"
-}}
-
-Extract 3-10 concepts. Be specific. Use lowercase for names."""
-
         try:
             response = await self._call_openai(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a concept extraction system. Return only valid JSON."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._concept_messages(content, source_type),
                 model=self.concept_model,
                 temperature=0.3,
-                max_tokens=500
+                max_tokens=CONCEPT_MAX_TOKENS,
+                response_format=JSON_OBJECT_FORMAT
             )
 
             # Parse JSON response
-            result = json.loads(response)
+            result = _json_loads(_strip_fences(response))
             logger.debug(f"Extracted {len(result.get('concepts', []))} concepts")
             return result
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from OpenAI: {e}")
-            return {
-                "concepts": [],
-                "skill_level": "unknown",
-                "primary_topic": "uncategorized",
-                "suggested_cluster": "General"
-            }
+            return _empty_concepts()
         except Exception as e:
             logger.error(f"Concept extraction failed: {e}")
-            return {
-                "concepts": [],
-                "skill_level": "unknown",
-                "primary_topic": "uncategorized",
-                "suggested_cluster": "General"
+            return _empty_concepts()
+
+    async def extract_concepts_batch(
+        self,
+        items: List[Tuple[str, str]],
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 60.0
+    ) -> List[Dict]:
+        """
+        Extract concepts for many documents through the OpenAI Batch API.
+
+        Uploads all prompts as one JSONL file, polls the batch with
+        exponential backoff and maps the output back to the inputs by
+        custom_id. Batch requests are billed at roughly half the price of
+        synchronous calls.
+
+        Args:
+            items: List of (content, source_type) tuples
+            poll_interval: Initial delay between status polls (seconds)
+            max_poll_interval: Upper bound for the poll delay (seconds)
+
+        Returns:
+            Extraction results in the same order as items
+
+        Raises:
+            RuntimeError: If the batch does not complete successfully
+        """
+        custom_ids = []
+        lines = []
+        for idx, (content, source_type) in enumerate(items):
+            digest = hashlib.sha256(f"{source_type}:{content[:2000]}".encode("utf-8")).hexdigest()
+            # Index prefix keeps ids unique when the same content appears twice
+            custom_id = f"{idx}-{digest[:16]}"
+            custom_ids.append(custom_id)
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.concept_model,
+                    "messages": self._concept_messages(content, source_type),
+                    "temperature": 0.3,
+                    "max_tokens": CONCEPT_MAX_TOKENS,
+                    "response_format": JSON_OBJECT_FORMAT
+                }
+            }))
+
+        batch_file = await self.client.files.create(
+            file=("concept_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted concept batch {batch.id} with {len(items)} requests")
+
+        delay = poll_interval
+        while batch.status not in BATCH_TERMINAL_STATUSES:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Concept batch {batch.id} ended with status {batch.status}")
+
+        output = await self.client.files.content(batch.output_file_id)
+
+        results: Dict[str, Dict] = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = _json_loads(line)
+                body = record["response"]["body"]
+                results[record["custom_id"]] = _json_loads(_strip_fences(body["choices"][0]["message"]["content"]))
+            except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+                logger.error(f"Failed to parse batch output line: {e}")
+
+        logger.info(f"Concept batch {batch.id} returned {len(results)}/{len(items)} results")
+        return [results.get(custom_id) or _empty_concepts() for custom_id in custom_ids]
+
+    @staticmethod
+    def _suggestion_max_tokens(max_suggestions: int) -> int:
+        """Output budget sized to the number of suggestions requested."""
+        return min(
+            SUGGESTION_MAX_TOKENS,
+            SUGGESTION_TOKENS_PER_ITEM * max_suggestions + SUGGESTION_TOKENS_OVERHEAD
+        )
+
+    def _fit_knowledge_summary(self, knowledge_summary: str, max_tokens: int) -> str:
+        """
+        Trim the knowledge summary so prompt + output fit the context window.
+
+        Whole clusters are dropped from the end so the remaining summary
+        stays well-formed.
+        """
+        # Clamped: a negative budget would make the final [:budget * 4] cut
+        # characters off the end instead of leaving nothing
+        budget = max(0, LLM_CONTEXT_WINDOW - max_tokens - estimate_tokens(
+            BUILD_SUGGESTION_SYSTEM_PROMPT + BUILD_SUGGESTION_PROMPT_TEMPLATE, self.suggestion_model
+        ))
+        if estimate_tokens(knowledge_summary, self.suggestion_model) <= budget:
+            return knowledge_summary
+
+        blocks = knowledge_summary.split("\n\nCLUSTER ")
+        while len(blocks) > 1:
+            blocks.pop()
+            trimmed = "\n\nCLUSTER ".join(blocks)
+            if estimate_tokens(trimmed, self.suggestion_model) <= budget:
+                logger.warning(f"Knowledge summary trimmed to {len(blocks)} clusters to fit context window")
+                return trimmed
+
+        # A single cluster still too large: fall back to a character cut
+        return knowledge_summary[:budget * 4]
+
+    def _suggestion_messages(
+        self,
+        knowledge_summary: str,
+        max_suggestions: int,
+        max_tokens: int
+    ) -> List[Dict]:
+        """Build the chat messages for a build suggestion request."""
+        knowledge_summary = self._fit_knowledge_summary(knowledge_summary, max_tokens)
+        return [
+            {"role": "system", "content": BUILD_SUGGESTION_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": BUILD_SUGGESTION_PROMPT_TEMPLATE.format(
+                    max_suggestions=max_suggestions,
+                    knowledge_summary=knowledge_summary
+                )
             }
+        ]
 
     async def generate_build_suggestions(
         self,
@@ -171,43 +551,19 @@ Extract 3-10 concepts. Be specific. Use lowercase for names."""
         max_suggestions: int
     ) -> List[Dict]:
         """Generate build suggestions using OpenAI."""
-        prompt = f"""Based on this user's knowledge bank, suggest {max_suggestions} practical projects they could build RIGHT NOW.
-
-KNOWLEDGE BANK:
-{knowledge_summary}
-
-Return ONLY a JSON array of suggestions (no markdown, no explanation):
-[
-  {{
-    "title": "Project Name",
-    "description": "What they'll build and why it's valuable",
-    "feasibility": "high|medium|low",
-    "effort_estimate": "2-3 days",
-    "required_skills": ["skill1", "skill2"],
-    "missing_knowledge": ["gap1", "gap2"],
-    "starter_steps": ["step 1", "step 2", "step 3"],
-    "file_structure": "project/\\n  src/\\n  tests/\\n  README.md"
-  }}
-]
-
-Be specific. Reference actual content from their knowledge. Prioritize projects they can START TODAY."""
-
+        max_tokens = self._suggestion_max_tokens(max_suggestions)
         try:
             response = await self._call_openai(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a project advisor. Return only valid JSON arrays of build suggestions."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._suggestion_messages(knowledge_summary, max_suggestions, max_tokens),
                 model=self.suggestion_model,
                 temperature=0.7,
-                max_tokens=2000
+                max_tokens=max_tokens,
+                response_format=JSON_OBJECT_FORMAT
             )
 
             # Parse JSON response
-            suggestions = json.loads(response)
+            data = _json_loads(_strip_fences(response))
+            suggestions = data.get("suggestions", []) if isinstance(data, dict) else data
             logger.info(f"Generated {len(suggestions)} build suggestions")
             return suggestions
 
@@ -218,6 +574,74 @@ Be specific. Reference actual content from their knowledge. Prioritize projects
             logger.error(f"Build suggestion generation failed: {e}")
             return []
 
+    async def stream_build_suggestions(
+        self,
+        knowledge_summary: str,
+        max_suggestions: int
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream build suggestions from OpenAI.
+
+        Requests a streamed completion and yields each suggestion object as
+        soon as its closing brace arrives, so the first suggestion is
+        available after roughly one suggestion's worth of tokens instead of
+        the whole completion.
+
+        The completion is read by a separate task into a queue, so the
+        concurrency slot is held only while OpenAI is streaming, never while
+        this generator waits on a slow or departed consumer. Errors are
+        raised to the caller.
+        """
+        max_tokens = self._suggestion_max_tokens(max_suggestions)
+        messages = self._suggestion_messages(knowledge_summary, max_suggestions, max_tokens)
+        queue: "asyncio.Queue" = asyncio.Queue()
+        reader = asyncio.create_task(self._read_suggestion_stream(messages, max_tokens, queue))
+        yielded = 0
+
+        try:
+            while (suggestion := await queue.get()) is not _STREAM_END:
+                yielded += 1
+                yield suggestion
+            # Re-raise anything the reader failed with
+            await reader
+            logger.info(f"Streamed {yielded} build suggestions")
+        finally:
+            # Closed early (client gone, enough suggestions): stop reading
+            reader.cancel()
+
+    async def _read_suggestion_stream(
+        self,
+        messages: List[Dict],
+        max_tokens: int,
+        queue: "asyncio.Queue"
+    ) -> None:
+        """Read a streamed suggestion completion into queue, then _STREAM_END."""
+        parser = JSONArrayStreamParser()
+        try:
+            async with self._semaphore:
+                await self._rate_limiter.acquire(
+                    estimate_message_tokens(messages, self.suggestion_model) + max_tokens
+                )
+                stream = await self.client.chat.completions.create(
+                    model=self.suggestion_model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=max_tokens,
+                    response_format=JSON_OBJECT_FORMAT,
+                    stream=True
+                )
+                async with stream:
+                    async for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if not delta:
+                            continue
+                        for suggestion in parser.feed(delta):
+                            queue.put_nowait(suggestion)
+        finally:
+            queue.put_nowait(_STREAM_END)
+
 
 class MockLLMProvider(LLMProvider):
     """
@@ -0,0 +1,164 @@
+"""
+Local concept extraction provider.
+
+Extracts concepts without a network round-trip or per-call cost:
+KeyBERT over a local sentence-transformers model when those packages are
+installed, otherwise a frequency-based keyphrase extractor built on
+scikit-learn. Low-confidence results, and build suggestions, are delegated
+to a fallback provider (typically OpenAIProvider).
+"""
+
+import re
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from .llm_providers import LLMProvider, _empty_concepts
+
+logger = logging.getLogger(__name__)
+
+# Vocabulary hints for the skill-level heuristic
+BEGINNER_MARKERS = {
+    "introduction", "intro", "beginner", "beginners", "basics", "basic",
+    "tutorial", "started", "first", "simple", "fundamentals", "101"
+}
+ADVANCED_MARKERS = {
+    "advanced", "internals", "optimization", "optimizing", "architecture",
+    "distributed", "scalability", "concurrency", "performance", "compiler",
+    "kernel", "production"
+}
+
+
+class LocalConceptProvider(LLMProvider):
+    """Concept extraction with local models, falling back to another provider."""
+
+    def __init__(
+        self,
+        fallback: Optional[LLMProvider] = None,
+        model_name: str = "all-MiniLM-L6-v2",
+        top_n: int = 10,
+        min_confidence: float = 0.3,
+        use_keybert: bool = True
+    ):
+        """
+        Initialize local provider.
+
+        Args:
+            fallback: Provider used for low-confidence extractions and build suggestions
+            model_name: sentence-transformers model for KeyBERT
+            top_n: Maximum concepts per document
+            min_confidence: Best-concept confidence below which fallback is used
+            use_keybert: Try KeyBERT before the frequency-based extractor
+        """
+        self.fallback = fallback
+        self.model_name = model_name
+        self.top_n = top_n
+        self.min_confidence = min_confidence
+        self._keybert = None
+        self._keybert_loaded = not use_keybert
+
+    def _get_keybert(self):
+        """Load KeyBERT lazily (optional dependency)."""
+        if not self._keybert_loaded:
+            self._keybert_loaded = True
+            try:
+                from keybert import KeyBERT
+                self._keybert = KeyBERT(model=self.model_name)
+                logger.info(f"Loaded KeyBERT with {self.model_name}")
+            except ImportError:
+                logger.info("keybert not installed, using frequency-based keyphrase extraction")
+        return self._keybert
+
+    def warm_up(self) -> None:
+        """Load the KeyBERT model now rather than on the first extraction."""
+        self._get_keybert()
+
+    def _frequency_keyphrases(self, sample: str) -> List[Tuple[str, float]]:
+        """Score 1-2 word phrases by (length-weighted) frequency."""
+        vectorizer = CountVectorizer(
+            ngram_range=(1, 2),
+            stop_words="english",
+            lowercase=True,
+            token_pattern=r"(?u)\b[a-zA-Z][a-zA-Z0-9+#.\-]+\b"
+        )
+        try:
+            counts = vectorizer.fit_transform([sample]).toarray()[0]
+        except ValueError:
+            # Empty vocabulary (no usable words)
+            return []
+
+        terms = vectorizer.get_feature_names_out()
+        weights = np.array([1.0 + 0.5 * term.count(" ") for term in terms])
+        scores = counts * weights
+
+        top = np.argsort(-scores)[:self.top_n]
+        max_score = float(scores[top[0]])
+        # Terms that barely repeat are weak evidence of a concept
+        saturation = min(1.0, max_score / 3.0)
+        return [(str(terms[i]), round(float(scores[i]) / max_score * saturation, 3)) for i in top]
+
+    def _keyphrases(self, sample: str) -> List[Tuple[str, float]]:
+        """Return (phrase, confidence) pairs, best first."""
+        keybert = self._get_keybert()
+        if keybert is not None:
+            return keybert.extract_keywords(
+                sample,
+                keyphrase_ngram_range=(1, 2),
+                stop_words="english",
+                top_n=self.top_n
+            )
+        return self._frequency_keyphrases(sample)
+
+    @staticmethod
+    def _skill_level(sample: str) -> str:
+        """Guess skill level from beginner/advanced vocabulary."""
+        words = set(re.findall(r"[a-z0-9]+", sample.lower()))
+        beginner = len(words & BEGINNER_MARKERS)
+        advanced = len(words & ADVANCED_MARKERS)
+        if advanced > beginner:
+            return "advanced"
+        if beginner > advanced:
+            return "beginner"
+        return "intermediate"
+
+    async def extract_concepts(
+        self,
+        content: str,
+        source_type: str
+    ) -> Dict:
+        """Extract concepts locally, deferring to the fallback when unsure."""
+        sample = content[:2000]
+        # KeyBERT/CountVectorizer are CPU-bound; keep them off the event loop
+        phrases = await asyncio.to_thread(self._keyphrases, sample)
+
+        if not phrases or phrases[0][1] < self.min_confidence:
+            if self.fallback is not None:
+                logger.debug("Low local extraction confidence, using fallback provider")
+                return await self.fallback.extract_concepts(content, source_type)
+            if not phrases:
+                return _empty_concepts()
+
+        top_phrase = phrases[0][0]
+        return {
+            "concepts": [
+                {"name": name, "category": "concept", "confidence": confidence}
+                for name, confidence in phrases
+            ],
+            "skill_level": self._skill_level(sample),
+            "primary_topic": top_phrase,
+            "suggested_cluster": top_phrase.title()
+        }
+
+    async def generate_build_suggestions(
+        self,
+        knowledge_summary: str,
+        max_suggestions: int
+    ) -> List[Dict]:
+        """Build suggestions need a generative model: delegate to the fallback."""
+        if self.fallback is None:
+            logger.warning("Local provider cannot generate build suggestions without a fallback")
+            return []
+        return await self.fallback.generate_build_suggestions(knowledge_summary, max_suggestions)
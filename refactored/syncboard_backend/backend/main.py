@@ -9,8 +9,12 @@ All endpoints are organized in the routers/ directory.
 """
 
 import os
+import time
 import uuid
+import shutil
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -42,10 +46,11 @@ from .routers import (
 # Import dependencies and shared state
 from . import dependencies
 from .database import init_db, check_database_health
-from .db_storage_adapter import load_storage_from_db, save_storage_to_db
+from .db_storage_adapter import load_storage_from_db, save_changes_to_db
 from .storage import load_storage
+from .responses import FastJSONResponse
 from .auth import hash_password
-from .constants import DEFAULT_STORAGE_PATH
+from .constants import DEFAULT_STORAGE_PATH, DEFAULT_THREAD_POOL_SIZE, HEALTH_CHECK_CACHE_TTL
 from .security_middleware import SecurityHeadersMiddleware, HTTPSRedirectMiddleware, get_environment
 
 # =============================================================================
@@ -63,7 +68,8 @@ TESTING = os.environ.get('TESTING') == 'true'
 app = FastAPI(
     title="SyncBoard Knowledge Bank",
     description="AI-powered knowledge management with auto-clustering",
-    version="3.0.0"
+    version="3.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Logging
@@ -139,6 +145,14 @@ async def add_request_id(request: Request, call_next):
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and load data on startup."""
+    # Worker threads for asyncio.to_thread: parsing, OCR, vector rebuilds,
+    # password hashing and database writes all run there
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(
+        max_workers=int(os.environ.get('SYNCBOARD_THREAD_POOL_SIZE', str(DEFAULT_THREAD_POOL_SIZE))),
+        thread_name_prefix="syncboard-worker",
+    ))
+    dependencies.init_dependencies()
+
     # Initialize database
     try:
         init_db()
@@ -171,16 +185,32 @@ async def startup_event():
     if not dependencies.users:
         dependencies.users['test'] = hash_password('test123')
         try:
-            save_storage_to_db(
+            # Only the new user row: the corpus is already in the database
+            save_changes_to_db(
                 dependencies.documents,
                 dependencies.metadata,
                 dependencies.clusters,
-                dependencies.users
+                dependencies.users,
+                usernames=['test']
             )
             logger.info("Created default test user in database")
         except Exception as e:
             logger.warning(f"Database save failed: {e}")
 
+    # Batch database writes from the routers in the background
+    dependencies.start_persist_flusher()
+
+# =============================================================================
+# Shutdown Event
+# =============================================================================
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared resources on shutdown."""
+    await dependencies.stop_persist_flusher()
+    await dependencies.get_llm_provider().aclose()
+    dependencies.get_image_processor().close()
+
 # =============================================================================
 # Mount Routers
 # =============================================================================
@@ -225,6 +255,57 @@ app.include_router(relationships.router)
 # Health Check Endpoint
 # =============================================================================
 
+# Disk and database probes, shared by health checks within the TTL
+_health_cache = {"ts": 0.0, "data": None}
+
+def _check_disk() -> dict:
+    """Check free disk space."""
+    try:
+        disk_usage = shutil.disk_usage("/")
+        disk_free_gb = disk_usage.free / (1024 ** 3)
+        return {
+            "disk_space_gb": round(disk_free_gb, 2),
+            "disk_healthy": disk_free_gb > 1.0  # At least 1GB free
+        }
+    except Exception as e:
+        logger.error(f"Failed to check disk space: {e}")
+        return {"disk_space_gb": "error", "disk_healthy": False}
+
+def _check_storage_file() -> dict:
+    """Check the storage file exists and report its size."""
+    try:
+        storage_path = Path(STORAGE_PATH)
+        if storage_path.exists():
+            file_size_mb = storage_path.stat().st_size / (1024 ** 2)
+            return {"storage_file_mb": round(file_size_mb, 2), "storage_file_exists": True}
+        return {"storage_file_exists": False}
+    except Exception as e:
+        logger.error(f"Failed to check storage file: {e}")
+        return {"storage_file_exists": "error"}
+
+def _check_database() -> dict:
+    """Check database connectivity."""
+    try:
+        return {"database": check_database_health()}
+    except Exception as e:
+        logger.error(f"Failed to check database health: {e}")
+        return {"database": {"database_connected": False, "error": str(e)}}
+
+async def _probe_dependencies() -> dict:
+    """Run the disk, storage file and database checks concurrently.
+
+    Each makes blocking syscalls or a query, so each runs in a worker
+    thread; the probe takes as long as the slowest check, not the sum.
+    """
+    results = {}
+    for part in await asyncio.gather(
+        asyncio.to_thread(_check_disk),
+        asyncio.to_thread(_check_storage_file),
+        asyncio.to_thread(_check_database),
+    ):
+        results.update(part)
+    return results
+
 @app.get("/health", tags=["health"])
 async def health_check():
     """
@@ -232,9 +313,9 @@ async def health_check():
 
     Returns system status and dependency health for monitoring.
     Includes disk space, vector store size, and data integrity checks.
+    Disk and database probes are cached for HEALTH_CHECK_CACHE_TTL
+    seconds so frequent liveness probes do not repeat them.
     """
-    import shutil
-
     # Basic statistics
     health_data = {
         "status": "healthy",
@@ -248,29 +329,10 @@ async def health_check():
         "dependencies": {}
     }
 
-    # Check disk space
-    try:
-        disk_usage = shutil.disk_usage("/")
-        disk_free_gb = disk_usage.free / (1024 ** 3)
-        health_data["dependencies"]["disk_space_gb"] = round(disk_free_gb, 2)
-        health_data["dependencies"]["disk_healthy"] = disk_free_gb > 1.0  # At least 1GB free
-    except Exception as e:
-        health_data["dependencies"]["disk_space_gb"] = "error"
-        health_data["dependencies"]["disk_healthy"] = False
-        logger.error(f"Failed to check disk space: {e}")
-
-    # Check storage file
-    try:
-        storage_path = Path(STORAGE_PATH)
-        if storage_path.exists():
-            file_size_mb = storage_path.stat().st_size / (1024 ** 2)
-            health_data["dependencies"]["storage_file_mb"] = round(file_size_mb, 2)
-            health_data["dependencies"]["storage_file_exists"] = True
-        else:
-            health_data["dependencies"]["storage_file_exists"] = False
-    except Exception as e:
-        health_data["dependencies"]["storage_file_exists"] = "error"
-        logger.error(f"Failed to check storage file: {e}")
+    if _health_cache["data"] is None or time.monotonic() - _health_cache["ts"] >= HEALTH_CHECK_CACHE_TTL:
+        _health_cache["data"] = await _probe_dependencies()
+        _health_cache["ts"] = time.monotonic()
+    health_data["dependencies"].update(_health_cache["data"])
 
     # Check OpenAI API
     try:
@@ -279,17 +341,6 @@ async def health_check():
     except Exception:
         health_data["dependencies"]["openai_configured"] = False
 
-    # Check database health
-    try:
-        db_health = check_database_health()
-        health_data["dependencies"]["database"] = db_health
-    except Exception as e:
-        health_data["dependencies"]["database"] = {
-            "database_connected": False,
-            "error": str(e)
-        }
-        logger.error(f"Failed to check database health: {e}")
-
     # Overall health status
     all_healthy = all([
         health_data["dependencies"].get("disk_healthy", False),
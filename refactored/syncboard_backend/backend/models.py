@@ -1,8 +1,8 @@
 """Data models and schemas for SyncBoard 3.0 Knowledge Bank."""
 
-from pydantic import BaseModel, HttpUrl, validator
-from typing import List, Optional
-from datetime import datetime
+from pydantic import BaseModel, HttpUrl, PrivateAttr, validator
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
 
 # =============================================================================
 # REMOVED: Board, BoardCreate (entire board system deleted)
@@ -35,6 +35,11 @@ class ImageUpload(BaseModel):
     description: Optional[str] = None
 
 
+class ImageBatchUpload(BaseModel):
+    """Schema for uploading several images in one request."""
+    images: List[ImageUpload]
+
+
 # =============================================================================
 # Search Models
 # =============================================================================
@@ -125,6 +130,14 @@ class Concept(BaseModel):
     confidence: float  # 0.0 to 1.0
 
 
+def iso_to_epoch(value: str) -> float:
+    """Parse an ISO 8601 timestamp to Unix seconds (naive values are UTC)."""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
 class DocumentMetadata(BaseModel):
     """Metadata for ingested document."""
     doc_id: int
@@ -139,6 +152,44 @@ class DocumentMetadata(BaseModel):
     content_length: int
     image_path: Optional[str] = None  # For images
 
+    # (ingested_at, epoch) pair so a changed ingested_at is re-parsed. None
+    # until first use: a tuple default is deep-copied on every construction
+    _ingested_at_epoch: Optional[Tuple[str, Optional[float]]] = PrivateAttr(default=None)
+    # model_dump() result, dropped whenever a field is assigned
+    _dump: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in type(self).model_fields:
+            self.__pydantic_private__['_dump'] = None
+        super().__setattr__(name, value)
+
+    def cached_dump(self) -> Dict[str, Any]:
+        """
+        model_dump(), computed once until a field is reassigned.
+
+        The returned dict is shared between callers: treat it as read-only.
+        Fields must be changed by assignment, not mutated in place.
+        """
+        # Read the private slot directly: pydantic's attribute fallback for
+        # private attributes costs about as much as a small model_dump()
+        private = self.__pydantic_private__
+        dump = private['_dump']
+        if dump is None:
+            dump = private['_dump'] = self.model_dump()
+        return dump
+
+    @property
+    def ingested_at_epoch(self) -> Optional[float]:
+        """ingested_at as Unix seconds, parsed once per value (None if invalid)."""
+        source, epoch = self._ingested_at_epoch or (None, None)
+        if source is None or source != self.ingested_at:
+            try:
+                epoch = iso_to_epoch(self.ingested_at)
+            except (TypeError, ValueError, AttributeError):
+                epoch = None
+            self._ingested_at_epoch = (self.ingested_at, epoch)
+        return epoch
+
 
 class Cluster(BaseModel):
     """Group of related documents."""
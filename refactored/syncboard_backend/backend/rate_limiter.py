@@ -0,0 +1,120 @@
+"""
+Proactive rate limiting for LLM API calls.
+
+Tracks requests-per-minute (RPM) and tokens-per-minute (TPM) budgets with a
+token bucket that refills linearly. Callers wait for capacity *before* a
+request is sent instead of reacting to a 429 afterwards, mirroring the
+openai-cookbook api_request_parallel_processor.
+"""
+
+import time
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str):
+    """Return a tiktoken encoding for the model, or None if unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def estimate_tokens(text: str, model: str) -> int:
+    """
+    Estimate the number of tokens in text for the given model.
+
+    Uses tiktoken when installed, otherwise falls back to the
+    ~4 characters per token rule of thumb.
+
+    Args:
+        text: Text to measure
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        Estimated token count
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+def estimate_message_tokens(messages: List[Dict], model: str) -> int:
+    """Estimate prompt tokens for a list of chat messages."""
+    # ~4 tokens of framing overhead per message
+    return sum(estimate_tokens(m.get("content") or "", model) + 4 for m in messages)
+
+
+class TokenBucket:
+    """
+    Dual request/token bucket for per-minute API limits.
+
+    Both budgets start full and refill linearly at limit/60 per second.
+    acquire() blocks until one request and the requested number of tokens
+    are available, then consumes them.
+    """
+
+    def __init__(self, max_requests_per_minute: int, max_tokens_per_minute: int):
+        """
+        Initialize token bucket.
+
+        Args:
+            max_requests_per_minute: RPM limit
+            max_tokens_per_minute: TPM limit
+        """
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self.available_requests = float(max_requests_per_minute)
+        self.available_tokens = float(max_tokens_per_minute)
+        self.last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add capacity accrued since the last update."""
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.available_requests = min(
+            float(self.max_requests_per_minute),
+            self.available_requests + elapsed * self.max_requests_per_minute / 60.0
+        )
+        self.available_tokens = min(
+            float(self.max_tokens_per_minute),
+            self.available_tokens + elapsed * self.max_tokens_per_minute / 60.0
+        )
+        self.last_update = now
+
+    async def acquire(self, n_tokens: int = 0) -> None:
+        """
+        Wait until capacity is available, then consume it.
+
+        Args:
+            n_tokens: Tokens the request is expected to use (prompt + completion)
+        """
+        # A request larger than the whole bucket would otherwise wait forever
+        n_tokens = min(n_tokens, self.max_tokens_per_minute)
+
+        # Holding the lock while sleeping keeps waiters in FIFO order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= n_tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= n_tokens
+                    return
+
+                request_wait = max(0.0, 1 - self.available_requests) * 60.0 / self.max_requests_per_minute
+                token_wait = max(0.0, n_tokens - self.available_tokens) * 60.0 / self.max_tokens_per_minute
+                wait = max(request_wait, token_wait)
+                logger.debug(f"Rate limit budget exhausted, waiting {wait:.2f}s")
+                await asyncio.sleep(wait)
@@ -10,7 +10,11 @@ from typing import Dict, List, Optional, Tuple
 
 from .models import DocumentMetadata, Cluster, Concept
 from .vector_store import VectorStore
-from .storage import load_storage, save_storage
+from .storage import (
+    load_storage, save_storage, append_storage_log,
+    document_record, delete_document_record, cluster_record, user_record
+)
+from .constants import STORAGE_LOG_COMPACT_RECORDS
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +50,9 @@ class KnowledgeBankRepository:
         # Async lock for thread-safe operations
         self._lock = asyncio.Lock()
 
+        # Journal records written since the last full snapshot
+        self._log_records = 0
+
         # Load existing data
         self._load_from_disk()
 
@@ -64,15 +71,31 @@ class KnowledgeBankRepository:
 
     async def _save_to_disk(self) -> None:
         """Persist data to disk atomically."""
-        save_storage(
+        # A full rewrite is O(store): run it in a worker thread. Callers
+        # hold self._lock, so the dicts are not mutated meanwhile.
+        await asyncio.to_thread(
+            save_storage,
             self.storage_path,
             self.documents,
             self.metadata,
             self.clusters,
             self.users
         )
+        self._log_records = 0
         logger.debug(f"Saved {len(self.documents)} documents to disk")
 
+    async def _log_changes(self, records: List[dict]) -> None:
+        """
+        Persist changes by appending them to the storage journal.
+
+        Rewrites the full snapshot (compacting the journal) once
+        STORAGE_LOG_COMPACT_RECORDS records have accumulated.
+        """
+        await asyncio.to_thread(append_storage_log, self.storage_path, records)
+        self._log_records += len(records)
+        if self._log_records >= STORAGE_LOG_COMPACT_RECORDS:
+            await self._save_to_disk()
+
     # =============================================================================
     # DOCUMENT OPERATIONS
     # =============================================================================
@@ -93,18 +116,16 @@ class KnowledgeBankRepository:
             Document ID
         """
         async with self._lock:
-            # Get next document ID
-            doc_id = len(self.documents)
+            # Add to vector store for search; it allocates the ID, which is
+            # never one still in use (len(self.documents) is, after a delete)
+            doc_id = await asyncio.to_thread(self.vector_store.add_document, content)
 
             # Store document and metadata
             self.documents[doc_id] = content
             self.metadata[doc_id] = metadata
 
-            # Add to vector store for search
-            self.vector_store.add_document(content)
-
             # Persist to disk
-            await self._save_to_disk()
+            await self._log_changes([document_record(doc_id, content, metadata)])
 
             logger.info(f"Added document {doc_id}: {metadata.source_type}")
             return doc_id
@@ -148,15 +169,17 @@ class KnowledgeBankRepository:
             del self.metadata[doc_id]
 
             # Remove from vector store
-            self.vector_store.remove_document(doc_id)
+            await asyncio.to_thread(self.vector_store.remove_document, doc_id)
 
             # Remove from clusters
+            records = [delete_document_record(doc_id)]
             for cluster in self.clusters.values():
                 if doc_id in cluster.doc_ids:
                     cluster.doc_ids.remove(doc_id)
+                    records.append(cluster_record(cluster))
 
             # Persist to disk
-            await self._save_to_disk()
+            await self._log_changes(records)
 
             logger.info(f"Deleted document {doc_id}")
             return True
@@ -180,7 +203,7 @@ class KnowledgeBankRepository:
             cluster.id = cluster_id
             self.clusters[cluster_id] = cluster
 
-            await self._save_to_disk()
+            await self._log_changes([cluster_record(cluster)])
 
             logger.info(f"Added cluster {cluster_id}: {cluster.name}")
             return cluster_id
@@ -210,7 +233,7 @@ class KnowledgeBankRepository:
                 return False
 
             self.clusters[cluster.id] = cluster
-            await self._save_to_disk()
+            await self._log_changes([cluster_record(cluster)])
 
             logger.info(f"Updated cluster {cluster.id}")
             return True
@@ -233,7 +256,7 @@ class KnowledgeBankRepository:
 
             if doc_id not in cluster.doc_ids:
                 cluster.doc_ids.append(doc_id)
-                await self._save_to_disk()
+                await self._log_changes([cluster_record(cluster)])
                 logger.debug(f"Added doc {doc_id} to cluster {cluster_id}")
 
             return True
@@ -252,7 +275,7 @@ class KnowledgeBankRepository:
         """
         async with self._lock:
             self.users[username] = hashed_password
-            await self._save_to_disk()
+            await self._log_changes([user_record(username, hashed_password)])
             logger.info(f"Added user: {username}")
 
     async def get_user(self, username: str) -> Optional[str]:
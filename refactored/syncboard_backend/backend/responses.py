@@ -0,0 +1,35 @@
+"""
+JSON response class for SyncBoard 3.0 Knowledge Bank.
+
+Search, export and build-suggestion responses carry dozens of documents
+with their metadata; orjson encodes them several times faster than the
+stdlib json module behind FastAPI's default JSONResponse.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+# orjson is optional: without it responses fall back to stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(content: Any) -> bytes:
+    """Encode content as compact JSON bytes, with orjson when it is installed."""
+    if orjson is None:
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+    # Non-str keys: responses such as grouped_by_cluster key by cluster ID
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -75,10 +75,7 @@ async def generate_content(
     vector_store = get_vector_store()
     
     # Get user's documents for RAG
-    user_doc_ids = [
-        doc_id for doc_id, meta in metadata.items()
-        if meta.owner == current_user.username
-    ]
+    user_doc_ids = metadata.doc_ids_for(current_user.username)
     
     try:
         response_text = await generate_with_rag(
@@ -7,16 +7,16 @@ Endpoints:
 """
 
 import os
+import asyncio
 import logging
 from fastapi import APIRouter, HTTPException, Request, status
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from ..models import User, UserCreate, Token, UserLogin
-from ..auth import hash_password, verify_password, create_access_token
+from ..auth import hash_password, verify_and_update_password, create_access_token
 from ..sanitization import sanitize_username
-from ..dependencies import get_users
-from ..db_storage_adapter import save_storage_to_db
+from ..dependencies import get_users, persist_changes
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -66,11 +66,14 @@ async def create_user(request: Request, user_create: UserCreate) -> User:
     if username in users:
         raise HTTPException(status_code=400, detail="Username already exists")
     
-    # Import global state for saving
-    from ..dependencies import documents, metadata, clusters
+    # Password hashing is deliberately slow: keep it off the event loop
+    hashed_password = await asyncio.to_thread(hash_password, user_create.password)
     
-    users[username] = hash_password(user_create.password)
-    save_storage_to_db(documents, metadata, clusters, users)
+    # A concurrent registration may have claimed the name while hashing;
+    # setdefault inserts only if it is still free, without a second probe
+    if users.setdefault(username, hashed_password) is not hashed_password:
+        raise HTTPException(status_code=400, detail="Username already exists")
+    await persist_changes(usernames=[username])
     logger.info(f"Created user: {username}")
     
     return User(username=username)
@@ -87,7 +90,8 @@ async def login(request: Request, user_login: UserLogin) -> Token:
 
     Rate limited to 5 attempts per minute in production (1000/min in tests) to prevent brute force attacks.
     
-    Security: Uses bcrypt password verification (timing-attack resistant).
+    Security: Constant-time password verification, including for unknown
+    usernames. Hashes using a deprecated scheme are upgraded on success.
     
     Args:
         request: FastAPI request object (for rate limiting)
@@ -105,11 +109,24 @@ async def login(request: Request, user_login: UserLogin) -> Token:
     users = get_users()
     stored_hash = users.get(username)
     
-    if not stored_hash or not verify_password(user_login.password, stored_hash):
+    # Password verification is deliberately slow: keep it off the event loop
+    valid, new_hash = await asyncio.to_thread(
+        verify_and_update_password, user_login.password, stored_hash
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
         )
     
+    if new_hash:
+        users[username] = new_hash
+        try:
+            await persist_changes(usernames=[username])
+            logger.info(f"Upgraded password hash for user: {username}")
+        except Exception as e:
+            # Not fatal: the old hash still verifies and is retried next login
+            logger.warning(f"Failed to persist upgraded hash for {username}: {e}")
+    
     access_token = create_access_token(data={"sub": username})
     return Token(access_token=access_token)
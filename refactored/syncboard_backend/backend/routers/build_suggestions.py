@@ -3,10 +3,16 @@ Build Suggestions Router for SyncBoard 3.0 Knowledge Bank.
 
 Endpoints:
 - POST /what_can_i_build - Analyze knowledge bank and suggest viable projects
+- POST /what_can_i_build/stream - Same, streamed as Server-Sent Events
 """
 
+import json
 import logging
+from collections.abc import Mapping
+from contextlib import aclosing
+from typing import Dict, Iterator, Tuple
 from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi.responses import StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
@@ -34,6 +40,56 @@ router = APIRouter(
     responses={401: {"description": "Unauthorized"}},
 )
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _validate_max_suggestions(value: int) -> int:
+    """Validate max_suggestions, defaulting to 5."""
+    max_suggestions = validate_positive_integer(value, "max_suggestions", max_value=MAX_SUGGESTIONS)
+    if max_suggestions < 1:
+        max_suggestions = 5
+    return max_suggestions
+
+
+class _OwnedDocuments(Mapping):
+    """Read-only view of the documents whose IDs are in doc_ids, without copying them out."""
+
+    def __init__(self, documents: Dict[int, str], doc_ids: Mapping) -> None:
+        self._documents = documents
+        self._doc_ids = doc_ids
+
+    def __getitem__(self, doc_id: int) -> str:
+        if doc_id not in self._doc_ids:
+            raise KeyError(doc_id)
+        return self._documents[doc_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return (doc_id for doc_id in self._doc_ids if doc_id in self._documents)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def _filter_user_knowledge(username: str) -> Tuple[Dict, Dict, Mapping]:
+    """Return (clusters, metadata, documents) owned by username."""
+    documents = get_documents()
+    metadata = get_metadata()
+    clusters = get_clusters()
+
+    user_metadata = {did: metadata[did] for did in metadata.doc_ids_for(username)}
+    
+    user_cluster_ids = {meta.cluster_id for meta in user_metadata.values()}
+    user_clusters = {
+        cid: clusters[cid] for cid in sorted(user_cluster_ids & clusters.keys())
+    }
+    
+    # A view: the suggester rarely reads document text, so don't build a dict
+    user_documents = _OwnedDocuments(documents, user_metadata)
+
+    return user_clusters, user_metadata, user_documents
+
+
 # =============================================================================
 # Build Suggestion Endpoint
 # =============================================================================
@@ -58,31 +114,9 @@ async def what_can_i_build(
     Returns:
         Project suggestions based on user's knowledge bank
     """
-    documents = get_documents()
-    metadata = get_metadata()
-    clusters = get_clusters()
     build_suggester = get_build_suggester()
-    
-    # Validate max_suggestions parameter
-    max_suggestions = validate_positive_integer(req.max_suggestions, "max_suggestions", max_value=MAX_SUGGESTIONS)
-    if max_suggestions < 1:
-        max_suggestions = 5
-    
-    # Filter to user's content
-    user_clusters = {
-        cid: cluster for cid, cluster in clusters.items()
-        if any(metadata[did].owner == current_user.username for did in cluster.doc_ids)
-    }
-    
-    user_metadata = {
-        did: meta for did, meta in metadata.items()
-        if meta.owner == current_user.username
-    }
-    
-    user_documents = {
-        did: doc for did, doc in documents.items()
-        if did in user_metadata
-    }
+    max_suggestions = _validate_max_suggestions(req.max_suggestions)
+    user_clusters, user_metadata, user_documents = _filter_user_knowledge(current_user.username)
     
     if not user_clusters:
         return {
@@ -103,10 +137,64 @@ async def what_can_i_build(
     )
     
     return {
-        "suggestions": [s.dict() for s in suggestions],
+        "suggestions": [s.model_dump() for s in suggestions],
         "knowledge_summary": {
             "total_docs": len(user_documents),
             "total_clusters": len(user_clusters),
-            "clusters": [c.dict() for c in user_clusters.values()]
+            "clusters": [c.model_dump() for c in user_clusters.values()]
         }
     }
+
+
+@router.post("/what_can_i_build/stream")
+@limiter.limit("3/minute")
+async def what_can_i_build_stream(
+    req: BuildSuggestionRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream project suggestions as Server-Sent Events.
+    
+    Each suggestion is sent as a `data:` event as soon as the model has
+    finished generating it, followed by a final `event: done` (or an
+    `event: error` if generation failed).
+    
+    Rate limited to 3 requests per minute (expensive operation).
+    
+    Args:
+        req: Build suggestion request with max_suggestions parameter
+        request: FastAPI request (for rate limiting)
+        current_user: Authenticated user
+    
+    Returns:
+        text/event-stream response of BuildSuggestion objects
+    """
+    build_suggester = get_build_suggester()
+    max_suggestions = _validate_max_suggestions(req.max_suggestions)
+    user_clusters, user_metadata, _ = _filter_user_knowledge(current_user.username)
+    
+    async def event_stream():
+        if user_clusters:
+            # aclosing: a client disconnect closes the provider stream (and
+            # frees its OpenAI slot) immediately, not at garbage collection
+            try:
+                async with aclosing(build_suggester.stream_suggestions(
+                    clusters=user_clusters,
+                    metadata=user_metadata,
+                    max_suggestions=max_suggestions
+                )) as suggestions:
+                    async for suggestion in suggestions:
+                        yield f"data: {json.dumps(suggestion.model_dump())}\n\n"
+            except Exception as e:
+                logger.error(f"Build suggestion streaming failed: {e}")
+                yield f"event: error\ndata: {json.dumps({'detail': 'Build suggestion generation failed'})}\n\n"
+                return
+        yield "event: done\ndata: {}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so each event is flushed immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -11,7 +11,7 @@ Endpoints:
 import logging
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 
 from ..models import User
 from ..dependencies import (
@@ -19,12 +19,12 @@ from ..dependencies import (
     get_documents,
     get_metadata,
     get_clusters,
-    get_users,
     get_storage_lock,
+    persist_changes,
 )
 from ..sanitization import sanitize_cluster_name
 from ..constants import SKILL_LEVELS
-from ..db_storage_adapter import save_storage_to_db
+from ..responses import dumps_json
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -58,17 +58,15 @@ async def get_user_clusters(
     metadata = get_metadata()
     clusters = get_clusters()
     
-    user_clusters = []
+    # Clusters holding at least one of the user's documents
+    user_cluster_ids = {
+        metadata[doc_id].cluster_id for doc_id in metadata.doc_ids_for(current_user.username)
+    }
     
-    for cluster_id, cluster in clusters.items():
-        # Check if any docs in cluster belong to user
-        has_user_docs = any(
-            metadata.get(doc_id) and metadata[doc_id].owner == current_user.username
-            for doc_id in cluster.doc_ids
-        )
-        
-        if has_user_docs:
-            user_clusters.append(cluster.dict())
+    # Look up only those clusters instead of scanning every cluster
+    user_clusters = [
+        clusters[cluster_id].model_dump() for cluster_id in sorted(user_cluster_ids & clusters.keys())
+    ]
     
     return {
         "clusters": user_clusters,
@@ -100,9 +98,6 @@ async def update_cluster(
         HTTPException 404: If cluster not found
     """
     clusters = get_clusters()
-    documents = get_documents()
-    metadata = get_metadata()
-    users = get_users()
     storage_lock = get_storage_lock()
 
     if cluster_id not in clusters:
@@ -121,11 +116,11 @@ async def update_cluster(
             if updates['skill_level'] in SKILL_LEVELS:
                 cluster.skill_level = updates['skill_level']
 
-        # Save to database
-        save_storage_to_db(documents, metadata, clusters, users)
+    # Save to database, outside the storage lock
+    await persist_changes(cluster_ids=[cluster_id])
 
     logger.info(f"Updated cluster {cluster_id}: {cluster.name}")
-    return {"message": "Cluster updated", "cluster": cluster.dict()}
+    return {"message": "Cluster updated", "cluster": cluster.model_dump()}
 
 # =============================================================================
 # Export Cluster Endpoint
@@ -140,6 +135,8 @@ async def export_cluster(
     """
     Export a cluster as JSON or Markdown.
     
+    The body is streamed a document at a time rather than built in memory.
+    
     Args:
         cluster_id: ID of cluster to export
         format: Export format ("json" or "markdown")
@@ -159,55 +156,137 @@ async def export_cluster(
         raise HTTPException(404, f"Cluster {cluster_id} not found")
     
     cluster = clusters[cluster_id]
-    
-    # Gather all documents in cluster
-    cluster_docs = []
-    for doc_id in cluster.doc_ids:
-        if doc_id in documents:
-            meta = metadata.get(doc_id)
-            cluster_docs.append({
-                "doc_id": doc_id,
-                "content": documents[doc_id],
-                "metadata": meta.dict() if meta else None
-            })
+    # Snapshot the members: requests may mutate the store while this streams
+    doc_ids = [doc_id for doc_id in cluster.doc_ids if doc_id in documents]
     
     if format == "markdown":
-        # Build markdown export
-        md_content = f"# {cluster.name}\n\n"
-        md_content += f"**Skill Level:** {cluster.skill_level}\n"
-        md_content += f"**Primary Concepts:** {', '.join(cluster.primary_concepts)}\n"
-        md_content += f"**Documents:** {len(cluster_docs)}\n\n"
-        md_content += "---\n\n"
-        
-        for doc in cluster_docs:
-            meta = doc['metadata']
-            md_content += f"## Document {doc['doc_id']}\n\n"
-            if meta:
-                md_content += f"**Source:** {meta.get('source_type', 'unknown')}\n"
-                md_content += f"**Topic:** {meta.get('primary_topic', 'N/A')}\n"
-                md_content += f"**Concepts:** {', '.join([c['name'] for c in meta.get('concepts', [])])}\n\n"
-            md_content += f"{doc['content']}\n\n"
-            md_content += "---\n\n"
-        
-        return JSONResponse({
-            "cluster_id": cluster_id,
-            "cluster_name": cluster.name,
-            "format": "markdown",
-            "content": md_content
-        })
-    
+        body = _stream_cluster_markdown(cluster, doc_ids, documents, metadata)
     else:  # JSON format
-        return {
-            "cluster_id": cluster_id,
-            "cluster": cluster.dict(),
-            "documents": cluster_docs,
-            "export_date": datetime.utcnow().isoformat()
-        }
+        body = _stream_cluster_json(cluster, doc_ids, documents, metadata)
+    
+    return StreamingResponse(body, media_type="application/json")
+
+
+def _json_string_part(text: str) -> bytes:
+    """Escape text for the inside of a JSON string literal.
+
+    JSON escaping is per character, so escaped parts concatenate into
+    the escape of the whole string.
+    """
+    return dumps_json(text)[1:-1]
+
+
+def _stream_cluster_json(cluster, doc_ids, documents, metadata):
+    """Yield a cluster's JSON export one document at a time."""
+    yield b'{"cluster_id":' + dumps_json(cluster.id) + b',"cluster":' + dumps_json(cluster.model_dump())
+    yield b',"documents":['
+    first = True
+    for doc_id in doc_ids:
+        content = documents.get(doc_id)
+        if content is None:  # Deleted while the export was streaming
+            continue
+        meta = metadata.get(doc_id)
+        entry = dumps_json({
+            "doc_id": doc_id,
+            "content": content,
+            "metadata": meta.cached_dump() if meta else None
+        })
+        yield entry if first else b"," + entry
+        first = False
+    yield b'],"export_date":' + dumps_json(datetime.utcnow().isoformat()) + b"}"
+
+
+def _stream_cluster_markdown(cluster, doc_ids, documents, metadata):
+    """Yield a cluster's markdown export as a JSON string, part by part."""
+    yield b'{"cluster_id":' + dumps_json(cluster.id) + b',"cluster_name":' + dumps_json(cluster.name)
+    yield b',"format":"markdown","content":"'
+    yield _json_string_part(
+        f"# {cluster.name}\n\n"
+        f"**Skill Level:** {cluster.skill_level}\n"
+        f"**Primary Concepts:** {', '.join(cluster.primary_concepts)}\n"
+        f"**Documents:** {len(doc_ids)}\n\n"
+        "---\n\n"
+    )
+    for doc_id in doc_ids:
+        content = documents.get(doc_id)
+        if content is None:
+            continue
+        meta = metadata.get(doc_id)
+        parts = [f"## Document {doc_id}\n\n"]
+        if meta:
+            # Read the few fields used straight off the model, without a dump
+            parts.append(f"**Source:** {meta.source_type}\n")
+            parts.append(f"**Topic:** {getattr(meta, 'primary_topic', 'N/A')}\n")
+            parts.append(f"**Concepts:** {', '.join(c.name for c in meta.concepts)}\n\n")
+        parts.append(f"{content}\n\n")
+        parts.append("---\n\n")
+        yield _json_string_part("".join(parts))
+    yield b'"}'
 
 # =============================================================================
 # Export All Endpoint
 # =============================================================================
 
+def _stream_export_json(doc_ids, documents, metadata, cluster_list):
+    """Yield the full JSON export one document at a time."""
+    cluster_names = {c.id: c.name for c in cluster_list}
+    yield b'{"documents":['
+    first = True
+    for doc_id in doc_ids:
+        content = documents.get(doc_id)
+        if content is None:  # Deleted while the export was streaming
+            continue
+        meta = metadata.get(doc_id)
+        entry = dumps_json({
+            "doc_id": doc_id,
+            "content": content,
+            "metadata": meta.cached_dump() if meta else None,
+            "cluster_name": cluster_names.get(meta.cluster_id) if meta else None
+        })
+        yield entry if first else b"," + entry
+        first = False
+    # Splice the trailing fields onto the open object
+    yield b"]," + dumps_json({
+        "clusters": [c.model_dump() for c in cluster_list],
+        "export_date": datetime.utcnow().isoformat(),
+        "total_documents": len(doc_ids),
+        "total_clusters": len(cluster_list)
+    })[1:]
+
+
+def _stream_export_markdown(doc_ids, documents, metadata, cluster_list):
+    """Yield the markdown export as a JSON string, escaped part by part."""
+    # Group by cluster in one pass over the documents
+    docs_by_cluster = {}
+    for doc_id in doc_ids:
+        meta = metadata.get(doc_id)
+        if meta:
+            docs_by_cluster.setdefault(meta.cluster_id, []).append(doc_id)
+
+    yield b'{"format":"markdown","content":"'
+    yield _json_string_part(
+        "# Knowledge Bank Export\n\n"
+        f"**Export Date:** {datetime.utcnow().isoformat()}\n"
+        f"**Total Documents:** {len(doc_ids)}\n"
+        f"**Total Clusters:** {len(cluster_list)}\n\n"
+        "---\n\n"
+    )
+    for cluster in cluster_list:
+        yield _json_string_part(f"# Cluster: {cluster.name}\n\n")
+        for doc_id in docs_by_cluster.get(cluster.id, []):
+            content = documents.get(doc_id)
+            meta = metadata.get(doc_id)
+            if content is None or meta is None:
+                continue
+            yield _json_string_part(
+                f"## Document {doc_id}\n\n"
+                f"**Topic:** {getattr(meta, 'primary_topic', 'N/A')}\n"
+                f"{content[:500]}...\n\n"
+                "---\n\n"
+            )
+    yield b'"}'
+
+
 @router.get("/export/all")
 async def export_all(
     format: str = "json",
@@ -216,6 +295,8 @@ async def export_all(
     """
     Export entire knowledge bank.
     
+    The body is streamed a document at a time rather than built in memory.
+    
     Args:
         format: Export format ("json" or "markdown")
         user: Authenticated user
@@ -227,49 +308,14 @@ async def export_all(
     metadata = get_metadata()
     clusters = get_clusters()
     
-    all_docs = []
-    for doc_id in sorted(documents.keys()):
-        meta = metadata.get(doc_id)
-        cluster_id = meta.cluster_id if meta else None
-        cluster_name = clusters[cluster_id].name if cluster_id in clusters else None
-        
-        all_docs.append({
-            "doc_id": doc_id,
-            "content": documents[doc_id],
-            "metadata": meta.dict() if meta else None,
-            "cluster_name": cluster_name
-        })
+    # Snapshot the keys: requests may mutate the store while this streams
+    doc_ids = sorted(documents.keys())
+    cluster_list = list(clusters.values())
     
     if format == "markdown":
-        md_content = f"# Knowledge Bank Export\n\n"
-        md_content += f"**Export Date:** {datetime.utcnow().isoformat()}\n"
-        md_content += f"**Total Documents:** {len(all_docs)}\n"
-        md_content += f"**Total Clusters:** {len(clusters)}\n\n"
-        md_content += "---\n\n"
-        
-        # Group by cluster
-        for cluster in clusters.values():
-            md_content += f"# Cluster: {cluster.name}\n\n"
-            cluster_docs = [d for d in all_docs if d['metadata'] and d['metadata']['cluster_id'] == cluster.id]
-            
-            for doc in cluster_docs:
-                meta = doc['metadata']
-                md_content += f"## Document {doc['doc_id']}\n\n"
-                if meta:
-                    md_content += f"**Topic:** {meta.get('primary_topic', 'N/A')}\n"
-                md_content += f"{doc['content'][:500]}...\n\n"
-                md_content += "---\n\n"
-        
-        return JSONResponse({
-            "format": "markdown",
-            "content": md_content
-        })
-    
+        body = _stream_export_markdown(doc_ids, documents, metadata, cluster_list)
     else:  # JSON
-        return {
-            "documents": all_docs,
-            "clusters": [c.dict() for c in clusters.values()],
-            "export_date": datetime.utcnow().isoformat(),
-            "total_documents": len(all_docs),
-            "total_clusters": len(clusters)
-        }
+        body = _stream_export_json(doc_ids, documents, metadata, cluster_list)
+    
+    # A sync iterator: Starlette encodes each chunk in the thread pool
+    return StreamingResponse(body, media_type="application/json")
@@ -16,11 +16,10 @@ from ..dependencies import (
     get_documents,
     get_metadata,
     get_clusters,
-    get_users,
     get_storage_lock,
+    persist_changes,
 )
 from ..constants import SKILL_LEVELS
-from ..db_storage_adapter import save_storage_to_db
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -75,7 +74,7 @@ async def get_document(
     return {
         "doc_id": doc_id,
         "content": documents[doc_id],
-        "metadata": meta.dict() if meta else None,
+        "metadata": meta.cached_dump() if meta else None,
         "cluster": cluster_info
     }
 
@@ -106,7 +105,6 @@ async def delete_document(
     documents = get_documents()
     metadata = get_metadata()
     clusters = get_clusters()
-    users = get_users()
     storage_lock = get_storage_lock()
 
     if doc_id not in documents:
@@ -128,8 +126,8 @@ async def delete_document(
             if cluster and doc_id in cluster.doc_ids:
                 cluster.doc_ids.remove(doc_id)
 
-        # Save to database
-        save_storage_to_db(documents, metadata, clusters, users)
+    # Save to database, outside the storage lock
+    await persist_changes(deleted_doc_ids=[doc_id])
 
     # Structured logging with request context
     logger.info(
@@ -165,7 +163,6 @@ async def update_document_metadata(
     documents = get_documents()
     metadata = get_metadata()
     clusters = get_clusters()
-    users = get_users()
     storage_lock = get_storage_lock()
 
     if doc_id not in documents:
@@ -204,8 +201,8 @@ async def update_document_metadata(
 
             meta.cluster_id = new_cluster_id
 
-        # Save to database
-        save_storage_to_db(documents, metadata, clusters, users)
+    # Save to database, outside the storage lock
+    await persist_changes(doc_ids=[doc_id])
 
     logger.info(f"Updated metadata for document {doc_id}")
-    return {"message": "Metadata updated", "metadata": meta.dict()}
+    return {"message": "Metadata updated", "metadata": meta.cached_dump()}
@@ -4,12 +4,21 @@ Duplicate Detection Router (Phase 7.2).
 Provides endpoints for finding and merging duplicate documents.
 """
 
+import asyncio
 import logging
 from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 
 from ..models import User
-from ..dependencies import get_current_user, get_vector_store
+from ..dependencies import (
+    get_current_user,
+    get_vector_store,
+    get_documents,
+    get_metadata,
+    get_clusters,
+    get_storage_lock,
+    persist_changes,
+)
 from ..database import get_db_context
 from ..duplicate_detection import DuplicateDetector
 from ..vector_store import VectorStore
@@ -37,14 +46,18 @@ async def find_duplicates(
         List of duplicate groups with similarity scores
     """
     try:
-        with get_db_context() as db:
-            detector = DuplicateDetector(db, vector_store)
-            duplicates = detector.find_duplicates(
-                username=current_user.username,
-                similarity_threshold=threshold,
-                limit=limit
-            )
-            return {"duplicate_groups": duplicates}
+        def find() -> list:
+            with get_db_context() as db:
+                detector = DuplicateDetector(db, vector_store)
+                return detector.find_duplicates(
+                    username=current_user.username,
+                    similarity_threshold=threshold,
+                    limit=limit
+                )
+
+        # Database query and similarity scoring block: keep them off the event loop
+        duplicates = await asyncio.to_thread(find)
+        return {"duplicate_groups": duplicates}
     except Exception as e:
         logger.error(f"Duplicate detection failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -101,14 +114,35 @@ async def merge_duplicates(
         if not delete_doc_ids:
             raise HTTPException(status_code=400, detail="delete_doc_ids list is required")
 
-        with get_db_context() as db:
-            detector = DuplicateDetector(db, vector_store)
-            result = detector.merge_duplicates(
-                keep_doc_id=keep_doc_id,
-                delete_doc_ids=delete_doc_ids,
-                username=current_user.username
-            )
-            return result
+        def merge() -> dict:
+            with get_db_context() as db:
+                detector = DuplicateDetector(db, vector_store)
+                return detector.merge_duplicates(
+                    keep_doc_id=keep_doc_id,
+                    delete_doc_ids=delete_doc_ids,
+                    username=current_user.username
+                )
+
+        # Database work blocks: keep it off the event loop
+        result = await asyncio.to_thread(merge)
+
+        # Drop the merged-away documents from the in-memory store too
+        documents = get_documents()
+        metadata = get_metadata()
+        clusters = get_clusters()
+        async with get_storage_lock():
+            for doc_id in delete_doc_ids:
+                documents.pop(doc_id, None)
+                meta = metadata.pop(doc_id, None)
+                cluster = clusters.get(meta.cluster_id) if meta else None
+                if cluster and doc_id in cluster.doc_ids:
+                    cluster.doc_ids.remove(doc_id)
+            # One vector rebuild for the whole batch
+            await asyncio.to_thread(vector_store.remove_documents, delete_doc_ids)
+
+        # Supersede any upserts still queued for these documents
+        await persist_changes(deleted_doc_ids=delete_doc_ids)
+        return result
     except HTTPException:
         raise
     except Exception as e:
@@ -5,14 +5,14 @@ Endpoints:
 - GET /search_full - Semantic search with filters
 """
 
+import asyncio
 import logging
 from typing import Optional
-from datetime import datetime
 from fastapi import APIRouter, HTTPException, Request, Depends
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from ..models import User
+from ..models import User, iso_to_epoch
 from ..dependencies import (
     get_current_user,
     get_documents,
@@ -93,67 +93,35 @@ async def search_full_content(
     if top_k < 1:
         top_k = DEFAULT_TOP_K
     
-    # Get user's documents
-    user_doc_ids = [
-        doc_id for doc_id, meta in metadata.items()
-        if meta.owner == current_user.username
-    ]
-    
-    if not user_doc_ids:
+    if not metadata.owns_any(current_user.username):
         return {"results": [], "grouped_by_cluster": {}}
     
-    # Apply filters
-    filtered_ids = user_doc_ids.copy()
-    
-    # Filter by cluster
-    if cluster_id is not None:
-        filtered_ids = [
-            doc_id for doc_id in filtered_ids
-            if metadata[doc_id].cluster_id == cluster_id
-        ]
+    # User's documents, narrowed by the source-type index when filtering on it
+    user_doc_ids = metadata.doc_ids_for(current_user.username, source_type=source_type or None)
     
-    # Filter by source type
-    if source_type:
-        filtered_ids = [
-            doc_id for doc_id in filtered_ids
-            if metadata[doc_id].source_type == source_type
-        ]
-    
-    # Filter by skill level
-    if skill_level:
+    # Parse date bounds once, up front
+    if date_from or date_to:
+        try:
+            from_ts = iso_to_epoch(date_from) if date_from else float('-inf')
+            to_ts = iso_to_epoch(date_to) if date_to else float('inf')
+        except ValueError:
+            raise HTTPException(400, "date_from/date_to must be ISO 8601 timestamps")
+        # Bisect the ingestion-time index instead of checking every document;
+        # documents with missing or invalid dates are not in it
+        in_range = set(metadata.doc_ids_between(from_ts, to_ts))
+        user_doc_ids = [doc_id for doc_id in user_doc_ids if doc_id in in_range]
+    
+    # Cluster and skill level are edited in place, so they are checked per
+    # document rather than indexed; with neither set there is nothing to check
+    if cluster_id is None and not skill_level:
+        filtered_ids = user_doc_ids
+    else:
         filtered_ids = [
-            doc_id for doc_id in filtered_ids
-            if metadata[doc_id].skill_level == skill_level
+            doc_id for doc_id in user_doc_ids
+            if (cluster_id is None or metadata[doc_id].cluster_id == cluster_id)
+            and (not skill_level or metadata[doc_id].skill_level == skill_level)
         ]
     
-    # Filter by date range
-    if date_from or date_to:
-        date_filtered = []
-        for doc_id in filtered_ids:
-            meta = metadata[doc_id]
-            if not meta.ingested_at:
-                continue
-            
-            try:
-                doc_date = datetime.fromisoformat(meta.ingested_at.replace('Z', '+00:00'))
-                
-                if date_from:
-                    from_date = datetime.fromisoformat(date_from.replace('Z', '+00:00'))
-                    if doc_date < from_date:
-                        continue
-                
-                if date_to:
-                    to_date = datetime.fromisoformat(date_to.replace('Z', '+00:00'))
-                    if doc_date > to_date:
-                        continue
-                
-                date_filtered.append(doc_id)
-            except:
-                # Skip documents with invalid dates
-                continue
-        
-        filtered_ids = date_filtered
-    
     if not filtered_ids:
         return {"results": [], "grouped_by_cluster": {}, "filters_applied": {
             "source_type": source_type,
@@ -163,35 +131,39 @@ async def search_full_content(
             "cluster_id": cluster_id
         }}
     
-    # Search
-    search_results = vector_store.search(
+    # Score in a worker thread: the vector store publishes its index
+    # atomically, so searching alongside a rebuild is safe
+    search_results = await asyncio.to_thread(
+        vector_store.search,
         query=q,
         top_k=top_k,
-        allowed_doc_ids=filtered_ids
+        allowed_doc_ids=filtered_ids,
+        snippet_length=SNIPPET_LENGTH
     )
     
     # Build response with metadata
     results = []
     cluster_groups = {}
+    # Hits often share clusters: serialize each cluster once per request
+    cluster_dumps = {}
     
     for doc_id, score, snippet in search_results:
         meta = metadata[doc_id]
-        cluster = clusters.get(meta.cluster_id) if meta.cluster_id else None
+        cluster_dump = None
+        if meta.cluster_id and meta.cluster_id in clusters:
+            cluster_dump = cluster_dumps.get(meta.cluster_id)
+            if cluster_dump is None:
+                cluster_dump = cluster_dumps[meta.cluster_id] = clusters[meta.cluster_id].model_dump()
         
-        # Return full content or snippet based on parameter
-        if full_content:
-            content = documents[doc_id]
-        else:
-            # Return 500 char snippet for performance
-            doc_text = documents[doc_id]
-            content = doc_text[:SNIPPET_LENGTH] + ("..." if len(doc_text) > SNIPPET_LENGTH else "")
+        # Return full content, or the snippet the vector store already cut
+        content = documents[doc_id] if full_content else snippet
         
         results.append({
             "doc_id": doc_id,
             "score": score,
             "content": content,
-            "metadata": meta.dict(),
-            "cluster": cluster.dict() if cluster else None
+            "metadata": meta.cached_dump(),
+            "cluster": cluster_dump
         })
         
         # Group by cluster
@@ -5,13 +5,17 @@ Endpoints:
 - POST /upload_text - Upload plain text content
 - POST /upload - Upload document via URL (YouTube, web article, etc)
 - POST /upload_file - Upload file (PDF, audio, etc) as base64
+- POST /upload_file_raw - Upload file as the raw request body (no base64)
 - POST /upload_image - Upload and process image with OCR
+- POST /upload_images - Upload several images, OCR'd in parallel
 """
 
-import base64
+import asyncio
+import binascii
+import hashlib
 import logging
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from fastapi import APIRouter, HTTPException, Request, Depends
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -21,21 +25,22 @@ from ..models import (
     DocumentUpload,
     FileBytesUpload,
     ImageUpload,
+    ImageBatchUpload,
     User,
     DocumentMetadata,
-    Concept,
 )
 from ..dependencies import (
     get_current_user,
     get_documents,
     get_metadata,
     get_clusters,
-    get_users,
     get_vector_store,
     get_storage_lock,
     get_concept_extractor,
     get_clustering_engine,
     get_image_processor,
+    get_ingest_semaphore,
+    persist_changes,
 )
 from ..sanitization import (
     sanitize_filename,
@@ -43,9 +48,9 @@ from ..sanitization import (
     sanitize_description,
     validate_url,
 )
-from ..constants import MAX_UPLOAD_SIZE_BYTES
+from ..constants import MAX_UPLOAD_SIZE_BYTES, MAX_BATCH_IMAGES
 from .. import ingest
-from ..db_storage_adapter import save_storage_to_db
+from ..singleflight import SingleFlight
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -98,6 +103,88 @@ async def find_or_create_cluster(
     
     return cluster_id
 
+# =============================================================================
+# Ingest Helpers
+# =============================================================================
+
+def _too_large(kind: str) -> HTTPException:
+    """413 error for an upload over MAX_UPLOAD_SIZE_BYTES."""
+    return HTTPException(
+        status_code=413,
+        detail=f"{kind} too large. Maximum size is {MAX_UPLOAD_SIZE_BYTES / (1024*1024):.0f}MB"
+    )
+
+
+def _decode_base64(content: str, kind: str) -> bytes:
+    """
+    Decode base64 upload content and enforce the upload size limit.
+    
+    Oversized payloads are rejected from the encoded length, before the
+    decoded buffer is allocated. Decoding is O(n): call it in a worker
+    thread for request-sized payloads.
+    
+    Raises:
+        HTTPException 400: If content is not valid base64
+        HTTPException 413: If the decoded size exceeds MAX_UPLOAD_SIZE_BYTES
+    """
+    too_large = _too_large(kind)
+    
+    # 4 base64 chars encode 3 bytes; allow for up to 2 padding characters
+    if len(content) * 3 // 4 - 2 > MAX_UPLOAD_SIZE_BYTES:
+        raise too_large
+    
+    try:
+        data = binascii.a2b_base64(content)
+    except (binascii.Error, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid base64: {e}")
+    
+    # Exact check for content the estimate could not bound (e.g. line breaks)
+    if len(data) > MAX_UPLOAD_SIZE_BYTES:
+        raise too_large
+    return data
+
+
+async def _read_body(request: Request, kind: str) -> bytes:
+    """
+    Read a raw request body, enforcing the upload size limit as it arrives.
+    
+    A declared Content-Length over the limit is rejected before anything is
+    read; otherwise the stream is cut off as soon as it passes the limit.
+    
+    Raises:
+        HTTPException 413: If the body exceeds MAX_UPLOAD_SIZE_BYTES
+    """
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_UPLOAD_SIZE_BYTES:
+        raise _too_large(kind)
+    
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_UPLOAD_SIZE_BYTES:
+            raise _too_large(kind)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _file_key(filename: str, file_bytes: bytes) -> tuple:
+    """Coalescing key of an uploaded file: its name and content digest."""
+    return ("file", filename, hashlib.blake2b(file_bytes, digest_size=16).digest())
+
+
+# Simultaneous uploads of the same URL or file download/parse it once
+_ingest_flights = SingleFlight()
+
+
+async def _run_ingest(key: tuple, func, *args) -> str:
+    """Run a blocking ingest call in a worker thread, coalescing duplicates."""
+    async def run() -> str:
+        async with get_ingest_semaphore():
+            return await asyncio.to_thread(func, *args)
+    
+    return await _ingest_flights.do(key, run)
+
 # =============================================================================
 # Text Upload Endpoint
 # =============================================================================
@@ -127,18 +214,17 @@ async def upload_text_content(
     
     documents = get_documents()
     metadata = get_metadata()
-    clusters = get_clusters()
-    users = get_users()
     vector_store = get_vector_store()
     storage_lock = get_storage_lock()
     concept_extractor = get_concept_extractor()
     
+    # Concept extraction is a slow LLM call that touches no shared state:
+    # run it before taking the storage lock so uploads don't queue behind it
+    extraction = await concept_extractor.extract(content, "text", owner=current_user.username)
+    
     async with storage_lock:
-        # Extract concepts
-        extraction = await concept_extractor.extract(content, "text")
-        
         # Add to vector store
-        doc_id = vector_store.add_document(content)
+        doc_id = await asyncio.to_thread(vector_store.add_document, content)
         documents[doc_id] = content
         
         # Create metadata
@@ -146,7 +232,7 @@ async def upload_text_content(
             doc_id=doc_id,
             owner=current_user.username,
             source_type="text",
-            concepts=[Concept(**c) for c in extraction.get("concepts", [])],
+            concepts=extraction.get("concepts", []),
             skill_level=extraction.get("skill_level", "unknown"),
             cluster_id=None,
             ingested_at=datetime.utcnow().isoformat(),
@@ -161,21 +247,21 @@ async def upload_text_content(
             concepts=extraction.get("concepts", [])
         )
         metadata[doc_id].cluster_id = cluster_id
-        
-        # Save
-        save_storage_to_db(documents, metadata, clusters, users)
-        
-        # Structured logging with request context
-        logger.info(
-            f"[{request.state.request_id}] User {current_user.username} uploaded text as doc {doc_id} "
-            f"(cluster: {cluster_id}, concepts: {len(extraction.get('concepts', []))})"
-        )
-        
-        return {
-            "document_id": doc_id,
-            "cluster_id": cluster_id,
-            "concepts": extraction.get("concepts", [])
-        }
+    
+    # Persist only this document and its cluster, outside the storage lock
+    await persist_changes(doc_ids=[doc_id], cluster_ids=[cluster_id])
+    
+    # Structured logging with request context
+    logger.info(
+        f"[{request.state.request_id}] User {current_user.username} uploaded text as doc {doc_id} "
+        f"(cluster: {cluster_id}, concepts: {len(extraction.get('concepts', []))})"
+    )
+    
+    return {
+        "document_id": doc_id,
+        "cluster_id": cluster_id,
+        "concepts": extraction.get("concepts", [])
+    }
 
 # =============================================================================
 # URL Upload Endpoint
@@ -205,24 +291,24 @@ async def upload_url(
     url = validate_url(str(doc.url))
     
     try:
-        document_text = ingest.download_url(url)
+        # Downloading and transcribing block; keep them off the event loop
+        document_text = await _run_ingest(("url", url), ingest.download_url, url)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to ingest URL: {exc}")
     
     documents = get_documents()
     metadata = get_metadata()
-    clusters = get_clusters()
-    users = get_users()
     vector_store = get_vector_store()
     storage_lock = get_storage_lock()
     concept_extractor = get_concept_extractor()
     
+    # Concept extraction is a slow LLM call that touches no shared state:
+    # run it before taking the storage lock so uploads don't queue behind it
+    extraction = await concept_extractor.extract(document_text, "url", owner=current_user.username)
+    
     async with storage_lock:
-        # Extract concepts
-        extraction = await concept_extractor.extract(document_text, "url")
-        
         # Add to vector store
-        doc_id = vector_store.add_document(document_text)
+        doc_id = await asyncio.to_thread(vector_store.add_document, document_text)
         documents[doc_id] = document_text
         
         # Create metadata
@@ -231,7 +317,7 @@ async def upload_url(
             owner=current_user.username,
             source_type="url",
             source_url=url,
-            concepts=[Concept(**c) for c in extraction.get("concepts", [])],
+            concepts=extraction.get("concepts", []),
             skill_level=extraction.get("skill_level", "unknown"),
             cluster_id=None,
             ingested_at=datetime.utcnow().isoformat(),
@@ -246,56 +332,28 @@ async def upload_url(
             concepts=extraction.get("concepts", [])
         )
         metadata[doc_id].cluster_id = cluster_id
-        
-        # Save
-        save_storage_to_db(documents, metadata, clusters, users)
-        
-        logger.info(f"User {current_user.username} uploaded URL as doc {doc_id}")
-        
-        return {
-            "document_id": doc_id,
-            "cluster_id": cluster_id,
-            "concepts": extraction.get("concepts", [])
-        }
+    
+    # Persist only this document and its cluster, outside the storage lock
+    await persist_changes(doc_ids=[doc_id], cluster_ids=[cluster_id])
+    
+    logger.info(f"User {current_user.username} uploaded URL as doc {doc_id}")
+    
+    return {
+        "document_id": doc_id,
+        "cluster_id": cluster_id,
+        "concepts": extraction.get("concepts", [])
+    }
 
 # =============================================================================
 # File Upload Endpoint
 # =============================================================================
 
-@router.post("/upload_file")
-@limiter.limit("5/minute")
-async def upload_file(
-    req: FileBytesUpload,
-    request: Request,
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Upload file (PDF, audio, etc) as base64.
-    
-    Rate limited to 5 uploads per minute.
-    
-    Args:
-        req: File upload request
-        request: FastAPI request (for rate limiting)
-        current_user: Authenticated user
-    
-    Returns:
-        Document ID, cluster ID, and extracted concepts
-    """
-    # Sanitize filename to prevent path traversal attacks
-    filename = sanitize_filename(req.filename)
-    
+async def _ingest_file(filename: str, file_bytes: bytes, file_key: tuple, username: str) -> Dict:
+    """Parse an uploaded file, store it as a document and cluster it."""
     try:
-        file_bytes = base64.b64decode(req.content)
-        
-        # Validate file size
-        if len(file_bytes) > MAX_UPLOAD_SIZE_BYTES:
-            raise HTTPException(
-                status_code=413,
-                detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE_BYTES / (1024*1024):.0f}MB"
-            )
-        
-        document_text = ingest.ingest_upload_file(filename, file_bytes)
+        # Parsing/transcription blocks (ffmpeg, Whisper, PDF parsing): run it
+        # in a worker thread so the event loop keeps serving requests
+        document_text = await _run_ingest(file_key, ingest.ingest_upload_file, filename, file_bytes)
     except HTTPException:
         raise
     except Exception as exc:
@@ -303,27 +361,26 @@ async def upload_file(
     
     documents = get_documents()
     metadata = get_metadata()
-    clusters = get_clusters()
-    users = get_users()
     vector_store = get_vector_store()
     storage_lock = get_storage_lock()
     concept_extractor = get_concept_extractor()
     
+    # Concept extraction is a slow LLM call that touches no shared state:
+    # run it before taking the storage lock so uploads don't queue behind it
+    extraction = await concept_extractor.extract(document_text, "file", owner=username)
+    
     async with storage_lock:
-        # Extract concepts
-        extraction = await concept_extractor.extract(document_text, "file")
-        
         # Add to vector store
-        doc_id = vector_store.add_document(document_text)
+        doc_id = await asyncio.to_thread(vector_store.add_document, document_text)
         documents[doc_id] = document_text
         
         # Create metadata
         meta = DocumentMetadata(
             doc_id=doc_id,
-            owner=current_user.username,
+            owner=username,
             source_type="file",
             filename=filename,
-            concepts=[Concept(**c) for c in extraction.get("concepts", [])],
+            concepts=extraction.get("concepts", []),
             skill_level=extraction.get("skill_level", "unknown"),
             cluster_id=None,
             ingested_at=datetime.utcnow().isoformat(),
@@ -338,22 +395,167 @@ async def upload_file(
             concepts=extraction.get("concepts", [])
         )
         metadata[doc_id].cluster_id = cluster_id
-        
-        # Save
-        save_storage_to_db(documents, metadata, clusters, users)
-        
-        logger.info(f"User {current_user.username} uploaded file {filename} as doc {doc_id}")
-        
-        return {
-            "document_id": doc_id,
-            "cluster_id": cluster_id,
-            "concepts": extraction.get("concepts", [])
-        }
+    
+    # Persist only this document and its cluster, outside the storage lock
+    await persist_changes(doc_ids=[doc_id], cluster_ids=[cluster_id])
+    
+    logger.info(f"User {username} uploaded file {filename} as doc {doc_id}")
+    
+    return {
+        "document_id": doc_id,
+        "cluster_id": cluster_id,
+        "concepts": extraction.get("concepts", [])
+    }
+
+
+@router.post("/upload_file")
+@limiter.limit("5/minute")
+async def upload_file(
+    req: FileBytesUpload,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload file (PDF, audio, etc) as base64.
+    
+    Rate limited to 5 uploads per minute.
+    
+    Args:
+        req: File upload request
+        request: FastAPI request (for rate limiting)
+        current_user: Authenticated user
+    
+    Returns:
+        Document ID, cluster ID, and extracted concepts
+    """
+    # Sanitize filename to prevent path traversal attacks
+    filename = sanitize_filename(req.filename)
+    
+    # Decoding and hashing are O(n) over up to MAX_UPLOAD_SIZE_BYTES: keep
+    # them off the event loop
+    file_bytes = await asyncio.to_thread(_decode_base64, req.content, "File")
+    file_key = await asyncio.to_thread(_file_key, filename, file_bytes)
+    return await _ingest_file(filename, file_bytes, file_key, current_user.username)
+
+
+@router.post("/upload_file_raw")
+@limiter.limit("5/minute")
+async def upload_file_raw(
+    filename: str,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload file (PDF, audio, etc) as the raw request body.
+    
+    Avoids base64's third more bytes on the wire and the JSON string and
+    decode buffers; oversized bodies are rejected from Content-Length.
+    Rate limited to 5 uploads per minute.
+    
+    Args:
+        filename: Original file name (query parameter)
+        request: FastAPI request (body and rate limiting)
+        current_user: Authenticated user
+    
+    Returns:
+        Document ID, cluster ID, and extracted concepts
+    """
+    filename = sanitize_filename(filename)
+    file_bytes = await _read_body(request, "File")
+    file_key = await asyncio.to_thread(_file_key, filename, file_bytes)
+    return await _ingest_file(filename, file_bytes, file_key, current_user.username)
 
 # =============================================================================
-# Image Upload Endpoint
+# Image Upload Endpoints
 # =============================================================================
 
+def _decode_image(content: str) -> bytes:
+    """Decode base64 image content and enforce the upload size limit."""
+    return _decode_base64(content, "Image")
+
+
+def _image_content(
+    image_bytes: bytes,
+    extracted_text: str,
+    description: Optional[str]
+) -> str:
+    """Build an image document's text from its description, OCR text and metadata."""
+    image_processor = get_image_processor()
+
+    # Get image metadata
+    img_meta = image_processor.get_image_metadata(image_bytes)
+
+    # Combine description + OCR text
+    full_content = ""
+    if description:
+        full_content += f"Description: {description}\n\n"
+    if extracted_text:
+        full_content += f"Extracted text: {extracted_text}\n\n"
+    full_content += f"Image metadata: {img_meta}"
+    return full_content
+
+
+async def _ingest_image(
+    doc_id: int,
+    image_bytes: bytes,
+    extracted_text: str,
+    full_content: str,
+    extraction: Dict,
+    filename: str,
+    username: str
+) -> Dict:
+    """
+    Store a prepared image as a document and cluster it.
+
+    doc_id is the ID the vector store assigned to full_content. Must be
+    called while holding the storage lock. Does not persist storage.
+    """
+    documents = get_documents()
+    metadata = get_metadata()
+    image_processor = get_image_processor()
+
+    documents[doc_id] = full_content
+
+    # Save physical image
+    image_path = await asyncio.to_thread(image_processor.store_image, image_bytes, doc_id)
+
+    # Create metadata
+    meta = DocumentMetadata(
+        doc_id=doc_id,
+        owner=username,
+        source_type="image",
+        filename=filename,
+        concepts=extraction.get("concepts", []),
+        skill_level=extraction.get("skill_level", "unknown"),
+        cluster_id=None,
+        ingested_at=datetime.utcnow().isoformat(),
+        content_length=len(full_content),
+        image_path=image_path
+    )
+    metadata[doc_id] = meta
+
+    # Cluster
+    cluster_id = await find_or_create_cluster(
+        doc_id=doc_id,
+        suggested_cluster=extraction.get("suggested_cluster", "Images"),
+        concepts=extraction.get("concepts", [])
+    )
+    metadata[doc_id].cluster_id = cluster_id
+
+    logger.info(
+        f"User {username} uploaded image {filename} as doc {doc_id} "
+        f"(OCR: {len(extracted_text)} chars)"
+    )
+
+    return {
+        "document_id": doc_id,
+        "cluster_id": cluster_id,
+        "ocr_text_length": len(extracted_text),
+        "image_path": image_path,
+        "concepts": extraction.get("concepts", [])
+    }
+
+
 @router.post("/upload_image")
 @limiter.limit("10/minute")
 async def upload_image(
@@ -380,89 +582,102 @@ async def upload_image(
     # Sanitize optional description
     description = sanitize_description(req.description)
     
-    try:
-        image_bytes = base64.b64decode(req.content)
-        
-        # Validate file size
-        if len(image_bytes) > MAX_UPLOAD_SIZE_BYTES:
-            raise HTTPException(
-                status_code=413,
-                detail=f"Image too large. Maximum size is {MAX_UPLOAD_SIZE_BYTES / (1024*1024):.0f}MB"
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid base64: {e}")
+    image_bytes = await asyncio.to_thread(_decode_image, req.content)
     
-    documents = get_documents()
-    metadata = get_metadata()
-    clusters = get_clusters()
-    users = get_users()
-    vector_store = get_vector_store()
     storage_lock = get_storage_lock()
-    concept_extractor = get_concept_extractor()
     image_processor = get_image_processor()
+    concept_extractor = get_concept_extractor()
+    
+    # OCR (CPU-bound) and concept extraction (LLM call) touch no shared
+    # state: run them outside the storage lock
+    async with get_ingest_semaphore():
+        extracted_text = await asyncio.to_thread(image_processor.extract_text_from_image, image_bytes)
+    full_content = await asyncio.to_thread(_image_content, image_bytes, extracted_text, description)
+    extraction = await concept_extractor.extract(full_content, "image", owner=current_user.username)
     
     async with storage_lock:
-        # Extract text via OCR
-        extracted_text = image_processor.extract_text_from_image(image_bytes)
-        
-        # Get image metadata
-        img_meta = image_processor.get_image_metadata(image_bytes)
-        
-        # Combine description + OCR text
-        full_content = ""
-        if description:
-            full_content += f"Description: {description}\n\n"
-        if extracted_text:
-            full_content += f"Extracted text: {extracted_text}\n\n"
-        full_content += f"Image metadata: {img_meta}"
-        
         # Add to vector store
-        doc_id = vector_store.add_document(full_content)
-        documents[doc_id] = full_content
-        
-        # Save physical image
-        image_path = image_processor.store_image(image_bytes, doc_id)
-        
-        # Extract concepts
-        extraction = await concept_extractor.extract(full_content, "image")
-        
-        # Create metadata
-        meta = DocumentMetadata(
-            doc_id=doc_id,
-            owner=current_user.username,
-            source_type="image",
-            filename=filename,
-            concepts=[Concept(**c) for c in extraction.get("concepts", [])],
-            skill_level=extraction.get("skill_level", "unknown"),
-            cluster_id=None,
-            ingested_at=datetime.utcnow().isoformat(),
-            content_length=len(full_content),
-            image_path=image_path
+        doc_id = await asyncio.to_thread(get_vector_store().add_document, full_content)
+        result = await _ingest_image(
+            doc_id, image_bytes, extracted_text, full_content, extraction, filename, current_user.username
         )
-        metadata[doc_id] = meta
-        
-        # Cluster
-        cluster_id = await find_or_create_cluster(
-            doc_id=doc_id,
-            suggested_cluster=extraction.get("suggested_cluster", "Images"),
-            concepts=extraction.get("concepts", [])
+    
+    # Persist only this document and its cluster, outside the storage lock
+    await persist_changes(doc_ids=[result["document_id"]], cluster_ids=[result["cluster_id"]])
+    
+    return result
+
+
+@router.post("/upload_images")
+@limiter.limit("5/minute")
+async def upload_images(
+    req: ImageBatchUpload,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload several images and OCR them in parallel.
+    
+    Rate limited to 5 batches per minute.
+    
+    Args:
+        req: Batch of image upload requests
+        request: FastAPI request (for rate limiting)
+        current_user: Authenticated user
+    
+    Returns:
+        Per-image results in upload order, as returned by /upload_image
+    """
+    if not req.images:
+        raise HTTPException(status_code=400, detail="No images provided")
+    if len(req.images) > MAX_BATCH_IMAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many images. Maximum is {MAX_BATCH_IMAGES} per request"
         )
-        metadata[doc_id].cluster_id = cluster_id
-        
-        # Save
-        save_storage_to_db(documents, metadata, clusters, users)
-        
-        logger.info(
-            f"User {current_user.username} uploaded image {filename} as doc {doc_id} "
-            f"(OCR: {len(extracted_text)} chars)"
+    
+    images = await asyncio.to_thread(lambda: [_decode_image(image.content) for image in req.images])
+    uploads = [
+        (sanitize_filename(image.filename), sanitize_description(image.description), image_bytes)
+        for image, image_bytes in zip(req.images, images)
+    ]
+    
+    storage_lock = get_storage_lock()
+    image_processor = get_image_processor()
+    concept_extractor = get_concept_extractor()
+    
+    # OCR is the slow part and touches no shared state: run it across
+    # worker threads before taking the storage lock
+    async with get_ingest_semaphore():
+        texts = await asyncio.to_thread(
+            image_processor.extract_text_batch, [image_bytes for _, _, image_bytes in uploads]
         )
+    
+    # Concept extraction for the whole batch at once, also before the lock
+    contents = await asyncio.to_thread(lambda: [
+        _image_content(image_bytes, extracted_text, description)
+        for (_, description, image_bytes), extracted_text in zip(uploads, texts)
+    ])
+    extractions = await concept_extractor.extract_many(
+        [(full_content, "image") for full_content in contents], owner=current_user.username
+    )
+    
+    async with storage_lock:
+        # One vector rebuild for the whole batch instead of one per image
+        doc_ids = await asyncio.to_thread(get_vector_store().add_documents_batch, contents)
         
-        return {
-            "document_id": doc_id,
-            "cluster_id": cluster_id,
-            "ocr_text_length": len(extracted_text),
-            "image_path": image_path,
-            "concepts": extraction.get("concepts", [])
-        }
+        results = []
+        for doc_id, (filename, _, image_bytes), extracted_text, full_content, extraction in zip(
+            doc_ids, uploads, texts, contents, extractions
+        ):
+            results.append(await _ingest_image(
+                doc_id, image_bytes, extracted_text, full_content, extraction, filename, current_user.username
+            ))
+    
+    # Save once for the whole batch
+    await persist_changes(
+        doc_ids=[result["document_id"] for result in results],
+        cluster_ids=[result["cluster_id"] for result in results]
+    )
+    
+    return {"results": results}
@@ -0,0 +1,136 @@
+"""
+Embedding-based semantic cache for LLM results.
+
+Serves a cached result when a new input's embedding is close enough
+(cosine similarity >= threshold) to one seen before. Catches near-duplicate
+inputs (re-uploads with different whitespace, URL variants, truncated
+files) that an exact hash cache misses.
+
+Vectors are L2-normalized and kept in one NumPy matrix per namespace, so a
+lookup is a single matrix-vector product (inner product == cosine). Each
+matrix grows by doubling up to maxsize and is then reused as a ring buffer,
+so inserting never copies the whole matrix.
+"""
+
+import time
+import logging
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """In-memory semantic cache partitioned by namespace (e.g. owner and source_type)."""
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl_seconds: float = 7 * 24 * 3600,
+        maxsize: int = 1000
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            ttl_seconds: Entry lifetime (default 7 days)
+            maxsize: Maximum entries per namespace (oldest evicted first)
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        # namespace -> {"vectors": (capacity, d) float32 matrix, "created": (capacity,)
+        # float64 timestamps, "results": [...], "size": filled rows, "next": row to write}
+        self._namespaces: Dict[Hashable, Dict] = {}
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        """Convert to a unit-length float32 vector (None for zero vectors)."""
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        if norm == 0.0:
+            return None
+        return vec / norm
+
+    def lookup(self, namespace: Hashable, embedding: List[float]) -> Optional[Dict]:
+        """
+        Return the cached result most similar to embedding, if above threshold.
+
+        Expired entries are skipped; their rows are overwritten as new
+        entries arrive.
+
+        Args:
+            namespace: Cache partition
+            embedding: Query embedding
+
+        Returns:
+            Cached result or None on miss
+        """
+        entry = self._namespaces.get(namespace)
+        if not entry or not entry["size"]:
+            return None
+
+        query = self._normalize(embedding)
+        if query is None or query.shape[0] != entry["vectors"].shape[1]:
+            return None
+
+        size = entry["size"]
+        scores = entry["vectors"][:size] @ query
+        scores[entry["created"][:size] <= time.time() - self.ttl_seconds] = -np.inf
+        best = int(np.argmax(scores))
+        if float(scores[best]) >= self.threshold:
+            logger.debug(f"Semantic cache hit in '{namespace}' (similarity: {scores[best]:.3f})")
+            return entry["results"][best]
+        return None
+
+    def store(self, namespace: Hashable, embedding: List[float], result: Dict) -> None:
+        """
+        Add a result to the cache.
+
+        Args:
+            namespace: Cache partition
+            embedding: Embedding of the input that produced result
+            result: Result to cache
+        """
+        vec = self._normalize(embedding)
+        if vec is None or self.maxsize <= 0:
+            return
+
+        entry = self._namespaces.get(namespace)
+        if entry is None or entry["vectors"].shape[1] != vec.shape[0]:
+            capacity = min(16, self.maxsize)
+            entry = {
+                "vectors": np.empty((capacity, vec.shape[0]), dtype=np.float32),
+                "created": np.empty(capacity, dtype=np.float64),
+                "results": [],
+                "size": 0,
+                "next": 0,
+            }
+            self._namespaces[namespace] = entry
+
+        capacity = len(entry["created"])
+        if entry["size"] == capacity and capacity < self.maxsize:
+            # Grow geometrically: amortized O(1) copying per insert
+            capacity = min(2 * capacity, self.maxsize)
+            vectors = np.empty((capacity, vec.shape[0]), dtype=np.float32)
+            vectors[:entry["size"]] = entry["vectors"]
+            created = np.empty(capacity, dtype=np.float64)
+            created[:entry["size"]] = entry["created"]
+            entry["vectors"], entry["created"] = vectors, created
+
+        # Write the next row; once full, that is the oldest entry
+        row = entry["next"]
+        entry["vectors"][row] = vec
+        entry["created"][row] = time.time()
+        if row == len(entry["results"]):
+            entry["results"].append(result)
+        else:
+            entry["results"][row] = result
+        entry["size"] = max(entry["size"], row + 1)
+        entry["next"] = (row + 1) % self.maxsize
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._namespaces.clear()
@@ -0,0 +1,65 @@
+"""
+Coalescing of concurrent duplicate work.
+
+When several coroutines ask for the same key at once, only the first runs
+the work; the rest await its result. Used so simultaneous uploads of the
+same URL, file or content download, parse and extract concepts once.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Run at most one in-flight call per key; duplicates share its outcome."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return fn()'s result, sharing one call among concurrent callers of key.
+
+        The leader's exception is re-raised in every waiting caller. If the
+        leader is cancelled (e.g. its client disconnected), a waiter takes
+        over and runs fn() itself.
+
+        Args:
+            key: Identity of the work (e.g. a content hash)
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            The result of fn()
+        """
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            try:
+                # Shield so a cancelled waiter does not cancel the shared call
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # This waiter itself was cancelled
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # Mark retrieved: there may be no waiters
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
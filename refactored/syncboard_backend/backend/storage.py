@@ -2,17 +2,252 @@
 Persistence layer for documents, metadata, clusters, and users.
 
 Simplified from board-based system to direct document storage with clustering.
+
+The JSON snapshot is paired with an append-only journal (<path>.log, one
+JSON record per line). Writes append O(changed) records; load_storage()
+replays them over the snapshot and save_storage() compacts them away.
 """
 
+import bisect
+import gzip
 import json
+import logging
+import mmap
 import os
+import sys
 import tempfile
-import shutil
-from typing import Tuple, Dict, List
+from typing import Any, Tuple, Dict, List, Optional
+
+from pydantic import TypeAdapter, ValidationError
 
 from .models import DocumentMetadata, Cluster, Concept
 from .vector_store import VectorStore
 
+# orjson is optional: without it snapshots and the journal use stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# zstandard is optional: only needed for snapshots saved to a *.zst path
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Frame header of zstd-compressed data (RFC 8878)
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+GZIP_MAGIC = b'\x1f\x8b'
+
+logger = logging.getLogger(__name__)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON from UTF-8 bytes."""
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def _zstandard_module():
+    """Return the zstandard module, or fail with an actionable error."""
+    if zstandard is None:
+        raise RuntimeError("zstd-compressed storage requires the zstandard package")
+    return zstandard
+
+
+def _load_json_file(path: str) -> Any:
+    """
+    Parse a JSON file, straight out of the page cache when orjson is available.
+
+    zstd- and gzip-compressed files (written to *.zst and *.gz paths) are
+    recognised by their magic number, whatever the path.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _json_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            if mm[:4] == ZSTD_MAGIC:
+                return _json_loads(_zstandard_module().ZstdDecompressor().decompress(mm))
+            if mm[:2] == GZIP_MAGIC:
+                return _json_loads(gzip.decompress(mm))
+            if orjson is None:
+                return _json_loads(mm[:])
+            # Parse the mapped file in place instead of first copying it
+            # into a file-sized bytes object
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes, non-ASCII characters kept as-is."""
+    if orjson is None:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return orjson.dumps(obj)
+
+
+class OwnerIndexedMetadata(dict):
+    """
+    Dict[doc_id, DocumentMetadata] that also indexes doc IDs by owner, by
+    source type and by ingestion time.
+
+    Per-user endpoints look up a user's documents in O(N_user) instead of
+    scanning every document's owner, and a source-type filter walks only
+    the smaller of the two index sets. The indexes are kept in step by the
+    dict mutators, so callers keep using it as a plain dict. A date range
+    is answered by bisecting the time index. Owner, source type and
+    ingestion time are assumed not to change after a document is stored
+    (unlike cluster_id and skill_level, which are edited in place).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        # owner -> {doc_id: None}: an insertion-ordered set
+        self._by_owner: Dict[str, Dict[int, None]] = {}
+        # source_type -> {doc_id: None}
+        self._by_source: Dict[str, Dict[int, None]] = {}
+        # Sorted (ingested_at epoch, doc_id); documents with unparseable
+        # dates are left out. _epochs remembers each entry for removal.
+        self._by_time: List[Tuple[float, int]] = []
+        self._epochs: Dict[int, float] = {}
+        self.update(*args, **kwargs)
+
+    def _index(self, doc_id: int, meta: DocumentMetadata) -> None:
+        self._by_owner.setdefault(meta.owner, {})[doc_id] = None
+        self._by_source.setdefault(meta.source_type, {})[doc_id] = None
+        epoch = meta.ingested_at_epoch
+        if epoch is not None:
+            bisect.insort(self._by_time, (epoch, doc_id))
+            self._epochs[doc_id] = epoch
+
+    def _unindex(self, doc_id: int, meta: DocumentMetadata) -> None:
+        for index, key in ((self._by_owner, meta.owner), (self._by_source, meta.source_type)):
+            members = index.get(key)
+            if members is not None:
+                members.pop(doc_id, None)
+                if not members:
+                    del index[key]
+        epoch = self._epochs.pop(doc_id, None)
+        if epoch is not None:
+            i = bisect.bisect_left(self._by_time, (epoch, doc_id))
+            del self._by_time[i]
+
+    def __setitem__(self, doc_id: int, meta: DocumentMetadata) -> None:
+        if doc_id in self:
+            self._unindex(doc_id, self[doc_id])
+        super().__setitem__(doc_id, meta)
+        self._index(doc_id, meta)
+
+    def __delitem__(self, doc_id: int) -> None:
+        self._unindex(doc_id, self[doc_id])
+        super().__delitem__(doc_id)
+
+    def pop(self, doc_id, *default):
+        if doc_id in self:
+            self._unindex(doc_id, self[doc_id])
+        return super().pop(doc_id, *default)
+
+    def popitem(self):
+        doc_id, meta = super().popitem()
+        self._unindex(doc_id, meta)
+        return doc_id, meta
+
+    def setdefault(self, doc_id, default=None):
+        if doc_id not in self:
+            self[doc_id] = default
+        return self[doc_id]
+
+    def update(self, *args, **kwargs) -> None:
+        for doc_id, meta in dict(*args, **kwargs).items():
+            self[doc_id] = meta
+
+    def clear(self) -> None:
+        super().clear()
+        self._by_owner.clear()
+        self._by_source.clear()
+        self._by_time.clear()
+        self._epochs.clear()
+
+    def doc_ids_for(self, owner: str, source_type: Optional[str] = None) -> List[int]:
+        """Return IDs of documents owned by owner (optionally of one source type), in insertion order."""
+        owned = self._by_owner.get(owner, {})
+        if source_type is None:
+            return list(owned)
+        of_source = self._by_source.get(source_type, {})
+        # Both indexes keep insertion order, so walking either keeps it
+        if len(of_source) < len(owned):
+            return [doc_id for doc_id in of_source if doc_id in owned]
+        return [doc_id for doc_id in owned if doc_id in of_source]
+
+    def doc_ids_between(self, start: float, end: float) -> List[int]:
+        """Return IDs of documents ingested within [start, end] (epoch seconds), oldest first."""
+        lo = bisect.bisect_left(self._by_time, (start, float('-inf')))
+        hi = bisect.bisect_right(self._by_time, (end, float('inf')))
+        return [doc_id for _, doc_id in self._by_time[lo:hi]]
+
+    def owns_any(self, owner: str) -> bool:
+        """Return whether owner has at least one document."""
+        return owner in self._by_owner
+
+
+def _metadata_from_dict(meta_data: Dict[str, Any]) -> DocumentMetadata:
+    """Rebuild DocumentMetadata from its stored dict form."""
+    # Convert concepts list to Concept objects
+    concepts = [Concept(**c) for c in meta_data.get('concepts', [])]
+    return DocumentMetadata(
+        doc_id=meta_data['doc_id'],
+        owner=meta_data['owner'],
+        source_type=meta_data['source_type'],
+        source_url=meta_data.get('source_url'),
+        filename=meta_data.get('filename'),
+        concepts=concepts,
+        skill_level=meta_data.get('skill_level', 'unknown'),
+        cluster_id=meta_data.get('cluster_id'),
+        ingested_at=meta_data['ingested_at'],
+        content_length=meta_data['content_length'],
+        image_path=meta_data.get('image_path')
+    )
+
+
+# Whole-section validators: one call into pydantic-core per list instead of
+# a Python-level constructor call per object
+_METADATA_LIST = TypeAdapter(List[DocumentMetadata])
+_CLUSTER_LIST = TypeAdapter(List[Cluster])
+
+
+def _intern_metadata_strings(items: List[Dict[str, Any]]) -> None:
+    """
+    Intern the low-cardinality strings of metadata records in place.
+
+    Owners, source types, skill levels and concept names/categories repeat
+    across thousands of records; the parser gives each occurrence its own
+    str object. Validation keeps str inputs as-is, so after interning all
+    equal values share one object.
+    """
+    intern = sys.intern
+    for meta_data in items:
+        for key in ('owner', 'source_type', 'skill_level'):
+            value = meta_data.get(key)
+            if type(value) is str:
+                meta_data[key] = intern(value)
+        for concept in meta_data.get('concepts') or ():
+            for key in ('name', 'category'):
+                value = concept.get(key)
+                if type(value) is str:
+                    concept[key] = intern(value)
+
+
+def _metadata_from_list(items: List[Dict[str, Any]]) -> List[DocumentMetadata]:
+    """Rebuild a snapshot's metadata section."""
+    _intern_metadata_strings(items)
+    try:
+        return _METADATA_LIST.validate_python(items)
+    except ValidationError:
+        # Older snapshots may lack fields that _metadata_from_dict defaults
+        return [_metadata_from_dict(meta_data) for meta_data in items]
+
 
 def load_storage(
     path: str,
@@ -21,6 +256,8 @@ def load_storage(
     """
     Load documents, metadata, clusters, and users from JSON file.
 
+    Records in the journal (<path>.log) are replayed over the snapshot.
+
     Args:
         path: Path to the JSON file
         vector_store: VectorStore instance where document embeddings will be added
@@ -37,46 +274,131 @@ def load_storage(
     clusters: Dict[int, Cluster] = {}
     users: Dict[str, str] = {}
     
-    if not os.path.exists(path):
-        return documents, metadata, clusters, users
+    if os.path.exists(path):
+        data = _load_json_file(path)
+        
+        # Load documents (older snapshots have no IDs: list position is the ID)
+        doc_texts: List[str] = data.get('documents', [])
+        doc_ids: List[int] = data.get('document_ids') or list(range(len(doc_texts)))
+        documents.update(zip(doc_ids, doc_texts))
+        
+        # Load metadata
+        for meta in _metadata_from_list(data.get('metadata', [])):
+            metadata[meta.doc_id] = meta
+        
+        # Load clusters
+        for cluster in _CLUSTER_LIST.validate_python(data.get('clusters', [])):
+            clusters[cluster.id] = cluster
+        
+        # Load users
+        users = data.get('users', {})
     
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    _replay_storage_log(storage_log_path(path), documents, metadata, clusters, users)
     
-    # Load documents and rebuild vector store
-    doc_texts: List[str] = data.get('documents', [])
-    for idx, text in enumerate(doc_texts):
-        vector_store.add_document(text)
-        documents[idx] = text
+    # Rebuild vector store once, in document ID order
+    ordered_ids = sorted(documents)
+    vector_store.add_documents_batch([documents[doc_id] for doc_id in ordered_ids], ordered_ids)
     
-    # Load metadata
-    for meta_data in data.get('metadata', []):
-        # Convert concepts list to Concept objects
-        concepts = [Concept(**c) for c in meta_data.get('concepts', [])]
-        meta = DocumentMetadata(
-            doc_id=meta_data['doc_id'],
-            owner=meta_data['owner'],
-            source_type=meta_data['source_type'],
-            source_url=meta_data.get('source_url'),
-            filename=meta_data.get('filename'),
-            concepts=concepts,
-            skill_level=meta_data.get('skill_level', 'unknown'),
-            cluster_id=meta_data.get('cluster_id'),
-            ingested_at=meta_data['ingested_at'],
-            content_length=meta_data['content_length'],
-            image_path=meta_data.get('image_path')
-        )
-        metadata[meta['doc_id']] = meta
-    
-    # Load clusters
-    for cluster_data in data.get('clusters', []):
-        cluster = Cluster(**cluster_data)
-        clusters[cluster.id] = cluster
+    return documents, metadata, clusters, users
+
+
+# =============================================================================
+# Storage Journal
+# =============================================================================
+
+def storage_log_path(path: str) -> str:
+    """Return the journal path for a storage snapshot path."""
+    return path + '.log'
+
+
+def document_record(doc_id: int, content: str, meta: Optional[DocumentMetadata]) -> Dict[str, Any]:
+    """Journal record adding or replacing a document and its metadata."""
+    return {'op': 'document', 'doc_id': doc_id, 'content': content,
+            'metadata': meta.cached_dump() if meta else None}
+
+
+def delete_document_record(doc_id: int) -> Dict[str, Any]:
+    """Journal record (tombstone) deleting a document."""
+    return {'op': 'delete_document', 'doc_id': doc_id}
+
+
+def cluster_record(cluster: Cluster) -> Dict[str, Any]:
+    """Journal record adding or replacing a cluster."""
+    return {'op': 'cluster', 'cluster': cluster.model_dump()}
+
+
+def user_record(username: str, hashed_password: str) -> Dict[str, Any]:
+    """Journal record adding or replacing a user."""
+    return {'op': 'user', 'username': username, 'hashed_password': hashed_password}
+
+
+def append_storage_log(path: str, records: List[Dict[str, Any]]) -> None:
+    """
+    Append change records to the journal of the snapshot at path.
+
+    Costs one small write and fsync, independent of the store size.
+
+    Args:
+        path: Path to the JSON snapshot (the journal sits next to it)
+        records: Records built by document_record(), cluster_record(), etc.
+    """
+    if not records:
+        return
+    lines = b''.join(_json_dumps(record) + b'\n' for record in records)
+    with open(storage_log_path(path), 'ab') as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _replay_storage_log(
+    log_path: str,
+    documents: Dict[int, str],
+    metadata: Dict[int, DocumentMetadata],
+    clusters: Dict[int, Cluster],
+    users: Dict[str, str]
+) -> int:
+    """Apply journal records in order; returns the number applied."""
+    if not os.path.exists(log_path):
+        return 0
     
-    # Load users
-    users = data.get('users', {})
+    applied = 0
+    with open(log_path, 'rb') as f:
+        for line in f:
+            try:
+                record = _json_loads(line)
+            except ValueError:  # JSONDecodeError, or a cut multi-byte character
+                # Torn final write from a crash: everything before it is intact
+                logger.warning(f"Ignoring incomplete record at end of {log_path}")
+                break
+            
+            op = record['op']
+            if op == 'document':
+                documents[record['doc_id']] = record['content']
+                if record['metadata'] is not None:
+                    metadata[record['doc_id']] = _metadata_from_dict(record['metadata'])
+            elif op == 'delete_document':
+                documents.pop(record['doc_id'], None)
+                metadata.pop(record['doc_id'], None)
+            elif op == 'cluster':
+                cluster = Cluster(**record['cluster'])
+                clusters[cluster.id] = cluster
+            elif op == 'user':
+                users[record['username']] = record['hashed_password']
+            applied += 1
     
-    return documents, metadata, clusters, users
+    return applied
+
+
+def _fsync_directory(dir_path: str) -> None:
+    """Flush a directory entry change (such as a rename) to disk, where supported."""
+    if not hasattr(os, 'O_DIRECTORY'):  # e.g. Windows: renames are not fsync-able
+        return
+    fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 def save_storage(
@@ -90,7 +412,10 @@ def save_storage(
     Persist documents, metadata, clusters, and users to disk atomically.
 
     Uses atomic write (write to temp file, then rename) to prevent corruption
-    if the process crashes mid-write.
+    if the process crashes mid-write. The journal is folded into the
+    snapshot, so it is removed afterwards. A path ending in .zst is written
+    zstd-compressed (needs the zstandard package), one ending in .gz
+    gzip-compressed.
 
     Args:
         path: Path to the JSON file to write
@@ -99,28 +424,55 @@ def save_storage(
         clusters: Mapping of cluster_id to Cluster
         users: Mapping of username to hashed password
     """
+    # document_ids pairs each text with its ID, so insertion order will do:
+    # no sort and no per-ID lookup
     data = {
-        'documents': [documents[idx] for idx in sorted(documents.keys())],
-        'metadata': [meta.dict() for meta in metadata.values()],
-        'clusters': [cluster.dict() for cluster in clusters.values()],
+        'documents': list(documents.values()),
+        'document_ids': list(documents),
+        'metadata': [meta.cached_dump() for meta in metadata.values()],
+        'clusters': [cluster.model_dump() for cluster in clusters.values()],
         'users': users,
     }
 
+    # Serialize fully before touching the disk: one write, one fsync.
+    # Compact output: the snapshot is machine-read, indentation only adds bytes
+    payload = _json_dumps(data)
+    if path.endswith('.zst'):
+        # One-shot compression records the content size in the frame,
+        # so loading decompresses into a single right-sized buffer
+        payload = _zstandard_module().ZstdCompressor(level=3).compress(payload)
+    elif path.endswith('.gz'):
+        # Level 1: most of the size win on repetitive JSON at little CPU cost
+        payload = gzip.compress(payload, compresslevel=1)
+
     # Atomic write: write to temp file in same directory, then rename
     # This ensures the file is never partially written
     dir_path = os.path.dirname(os.path.abspath(path)) or '.'
 
     with tempfile.NamedTemporaryFile(
-        mode='w',
-        encoding='utf-8',
+        mode='wb',
         dir=dir_path,
         delete=False,
         suffix='.tmp'
     ) as tmp_file:
-        json.dump(data, tmp_file, ensure_ascii=False, indent=2)
-        tmp_file.flush()
-        os.fsync(tmp_file.fileno())  # Force write to disk
         tmp_path = tmp_file.name
+        try:
+            tmp_file.write(payload)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())  # Force write to disk
+        except BaseException:
+            tmp_file.close()
+            os.remove(tmp_path)
+            raise
 
     # Atomic rename (POSIX systems guarantee atomicity)
-    shutil.move(tmp_path, path)
+    os.replace(tmp_path, path)
+    _fsync_directory(dir_path)
+    
+    # Replaying the journal over the new snapshot would be a no-op (records
+    # are idempotent upserts/tombstones), so a crash before this is harmless.
+    # The directory fsync above makes the rename durable first: otherwise a
+    # crash could keep the journal's removal but lose the new snapshot.
+    log_path = storage_log_path(path)
+    if os.path.exists(log_path):
+        os.remove(log_path)
@@ -14,7 +14,7 @@ hash‑based embeddings by importing and using the previous version of
 this module.
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -41,10 +41,24 @@ class VectorStore:
         # List of document IDs in insertion order, paralleling rows of
         # ``doc_matrix``
         self.doc_ids: List[int] = []
-        # TF‑IDF vectoriser and document matrix; initialised on first
-        # insertion
-        self.vectorizer: TfidfVectorizer | None = None
-        self.doc_matrix = None  # type: ignore
+        # Next ID to assign.  Only ever grows: removals and explicit IDs
+        # with gaps must never make a live (or deleted) ID reusable.
+        self._next_id = 0
+        # Fitted index: (row document IDs, TF‑IDF vectoriser, document
+        # matrix, doc_id -> row), published as one tuple so a search
+        # running while a worker thread rebuilds it never mixes old and
+        # new parts. None until the first insertion.
+        self._index: Tuple[List[int], TfidfVectorizer, object, Dict[int, int]] | None = None
+
+    @property
+    def vectorizer(self) -> TfidfVectorizer | None:
+        """TF‑IDF vectoriser of the current index, if any."""
+        return self._index[1] if self._index is not None else None
+
+    @property
+    def doc_matrix(self):
+        """TF‑IDF document matrix of the current index, if any."""
+        return self._index[2] if self._index is not None else None
 
     def _rebuild_vectors(self) -> None:
         """(Re)fit the TF‑IDF vectoriser and document matrix.
@@ -52,13 +66,17 @@ class VectorStore:
         Called whenever documents are added or removed.  Uses the
         current list of texts to build the vocabulary.
         """
-        texts = [self.docs[doc_id] for doc_id in self.doc_ids]
+        row_ids = list(self.doc_ids)
+        texts = [self.docs[doc_id] for doc_id in row_ids]
         if not texts:
-            self.vectorizer = None
-            self.doc_matrix = None
+            self._index = None
             return
-        self.vectorizer = TfidfVectorizer()
-        self.doc_matrix = self.vectorizer.fit_transform(texts)
+        # float32 halves the matrix (and the bandwidth of every search)
+        # versus the float64 default; scores only need ~7 digits
+        vectorizer = TfidfVectorizer(dtype=np.float32)
+        doc_matrix = vectorizer.fit_transform(texts)
+        row_of = {doc_id: row for row, doc_id in enumerate(row_ids)}
+        self._index = (row_ids, vectorizer, doc_matrix, row_of)
 
     def add_document(self, text: str) -> int:
         """Add a document to the vector store and rebuild vectors.
@@ -69,14 +87,15 @@ class VectorStore:
         Returns:
             Assigned document ID.
         """
-        doc_id = len(self.docs)
+        doc_id = self._next_id
+        self._next_id += 1
         self.docs[doc_id] = text
         self.doc_ids.append(doc_id)
         # Rebuild vectoriser and document matrix
         self._rebuild_vectors()
         return doc_id
 
-    def add_documents_batch(self, texts: List[str]) -> List[int]:
+    def add_documents_batch(self, texts: List[str], ids: List[int] | None = None) -> List[int]:
         """Add multiple documents in batch and rebuild vectors once.
 
         This is much more efficient than calling add_document() multiple
@@ -84,13 +103,21 @@ class VectorStore:
 
         Args:
             texts: List of document texts.
+            ids: Optional explicit IDs (e.g. when restoring a store with
+                gaps left by deletions); assigned sequentially otherwise.
+                Later assigned IDs continue after the highest one.
 
         Returns:
             List of assigned document IDs.
         """
         doc_ids = []
-        for text in texts:
-            doc_id = len(self.docs)
+        for i, text in enumerate(texts):
+            if ids is not None:
+                doc_id = ids[i]
+                self._next_id = max(self._next_id, doc_id + 1)
+            else:
+                doc_id = self._next_id
+                self._next_id += 1
             self.docs[doc_id] = text
             self.doc_ids.append(doc_id)
             doc_ids.append(doc_id)
@@ -119,7 +146,32 @@ class VectorStore:
         # Rebuild vectors from remaining docs
         self._rebuild_vectors()
 
-    def search(self, query: str, top_k: int = 5, allowed_doc_ids: List[int] | None = None) -> List[Tuple[int, float, str]]:
+    def remove_documents(self, doc_ids: Iterable[int]) -> None:
+        """Remove several documents and rebuild vectors once.
+
+        Unknown IDs are ignored.  The vocabulary (and so every row's
+        weights) depends on the whole corpus, so removal refits rather
+        than dropping rows from the matrix; batching makes that one
+        refit instead of one per document.
+
+        Args:
+            doc_ids: IDs of the documents to remove.
+        """
+        removed = {doc_id for doc_id in doc_ids if doc_id in self.docs}
+        if not removed:
+            return
+        for doc_id in removed:
+            del self.docs[doc_id]
+        self.doc_ids = [d for d in self.doc_ids if d not in removed]
+        self._rebuild_vectors()
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        allowed_doc_ids: List[int] | None = None,
+        snippet_length: int = 100,
+    ) -> List[Tuple[int, float, str]]:
         """Return documents semantically similar to the query.
 
         Args:
@@ -128,32 +180,48 @@ class VectorStore:
             allowed_doc_ids: Optional list of document IDs to restrict
                 search to (e.g., documents belonging to a particular
                 board).
+            snippet_length: Characters of each hit's text to return,
+                followed by "..." when the text is longer.
 
         Returns:
             A list of tuples ``(document_id, similarity_score, snippet)``
             sorted by descending similarity.
         """
-        if self.vectorizer is None or self.doc_matrix is None:
+        index = self._index
+        if index is None:
+            return []
+        row_ids, vectorizer, doc_matrix, row_of = index
+        if allowed_doc_ids is None:
+            rows = np.arange(len(row_ids))
+        else:
+            # Map allowed IDs to matrix rows instead of scanning every row
+            rows = np.array(
+                sorted({row_of[doc_id] for doc_id in allowed_doc_ids if doc_id in row_of}),
+                dtype=np.intp,
+            )
+            doc_matrix = doc_matrix[rows]
+        if top_k <= 0 or len(rows) == 0:
             return []
         # Transform query using existing vocabulary
-        q_vec = self.vectorizer.transform([query])
-        # Compute cosine similarities between query and all documents
-        scores = cosine_similarity(self.doc_matrix, q_vec).flatten()
-        # Build list of candidate (index, score) pairs
-        candidates: List[Tuple[int, float]] = []
-        for idx, score in enumerate(scores):
-            # Map row index to document ID
-            doc_id = self.doc_ids[idx]
-            if allowed_doc_ids is not None and doc_id not in allowed_doc_ids:
-                continue
-            candidates.append((idx, float(score)))
-        # Sort candidates by score descending
-        candidates.sort(key=lambda x: x[1], reverse=True)
+        q_vec = vectorizer.transform([query])
+        # TF‑IDF rows are L2‑normalised, so one sparse product gives the
+        # cosine similarities without re-normalising the whole matrix
+        scores = (doc_matrix @ q_vec.T).toarray().ravel()
+        # Select the top_k in O(n), then order just those by descending
+        # score (ties by insertion order, as a stable sort would)
+        if top_k < len(scores):
+            kth = scores[np.argpartition(-scores, top_k - 1)[top_k - 1]]
+            # Keep every row tied with the k-th score so ties resolve by order
+            top = np.flatnonzero(scores >= kth)
+        else:
+            top = np.arange(len(scores))
+        top = top[np.lexsort((top, -scores[top]))][:top_k]
         results: List[Tuple[int, float, str]] = []
-        for row_idx, score in candidates[:top_k]:
-            doc_id = self.doc_ids[row_idx]
+        for i in top:
+            doc_id = row_ids[rows[i]]
+            score = float(scores[i])
             text = self.docs[doc_id]
-            snippet = text[:100] + ("..." if len(text) > 100 else "")
+            snippet = text[:snippet_length] + ("..." if len(text) > snippet_length else "")
             results.append((doc_id, score, snippet))
         return results
 
@@ -167,32 +235,73 @@ class VectorStore:
         Returns:
             List of tuples (document_id, similarity_score) sorted by similarity
         """
-        if self.vectorizer is None or self.doc_matrix is None:
-            return []
-
-        if doc_id not in self.docs:
+        index = self._index
+        if index is None:
             return []
+        row_ids, _, doc_matrix, row_of = index
 
         # Find the row index for this document
-        try:
-            row_idx = self.doc_ids.index(doc_id)
-        except ValueError:
+        row_idx = row_of.get(doc_id)
+        if row_idx is None:
             return []
 
         # Get the document's vector
-        doc_vec = self.doc_matrix[row_idx]
+        doc_vec = doc_matrix[row_idx]
 
         # Compute cosine similarities between this doc and all others
-        scores = cosine_similarity(self.doc_matrix, doc_vec).flatten()
+        scores = cosine_similarity(doc_matrix, doc_vec).flatten()
 
         # Build list of (doc_id, score) pairs, excluding the query document itself
         results = []
         for idx, score in enumerate(scores):
-            other_doc_id = self.doc_ids[idx]
+            other_doc_id = row_ids[idx]
             if other_doc_id != doc_id:
                 results.append((other_doc_id, float(score)))
 
         # Sort by similarity descending
         results.sort(key=lambda x: x[1], reverse=True)
 
-        return results[:top_k]
\ No newline at end of file
+        return results[:top_k]
+
+    def similar_pairs(
+        self, doc_ids: List[int], threshold: float
+    ) -> Dict[int, List[Tuple[int, float]]]:
+        """Find, for each of ``doc_ids``, the others at least ``threshold`` similar.
+
+        One sparse product of the documents' rows with themselves scores
+        every pair at once.  Only pairs sharing a term are ever stored,
+        so the cost follows the overlap between documents rather than
+        the square of their number; pairs with no shared term (similarity
+        0) are never reported.
+
+        Args:
+            doc_ids: Documents to compare with each other.
+            threshold: Minimum cosine similarity of a reported pair.
+
+        Returns:
+            Mapping of document ID to ``(other_id, similarity)`` tuples,
+            most similar first (ties in insertion order).  Documents
+            without a match are omitted.
+        """
+        index = self._index
+        if index is None:
+            return {}
+        _, _, doc_matrix, row_of = index
+        present = [doc_id for doc_id in doc_ids if doc_id in row_of]
+        rows = np.array([row_of[doc_id] for doc_id in present], dtype=np.intp)
+        if len(rows) < 2:
+            return {}
+        sub = doc_matrix[rows]
+        # TF‑IDF rows are L2‑normalised: the product is the cosine matrix
+        sims = (sub @ sub.T).tocsr()
+        results: Dict[int, List[Tuple[int, float]]] = {}
+        for i, doc_id in enumerate(present):
+            start, end = sims.indptr[i], sims.indptr[i + 1]
+            cols = sims.indices[start:end]
+            scores = sims.data[start:end]
+            keep = (scores >= threshold) & (cols != i)
+            cols, scores = cols[keep], scores[keep]
+            if len(cols):
+                order = np.lexsort((rows[cols], -scores))
+                results[doc_id] = [(present[cols[j]], float(scores[j])) for j in order]
+        return results
\ No newline at end of file
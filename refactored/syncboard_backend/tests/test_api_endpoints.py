@@ -257,6 +257,23 @@ def test_upload_file_too_large(client, auth_headers):
     assert response.status_code == 413
 
 
+def test_oversized_base64_rejected_before_decoding(monkeypatch):
+    """Test the size limit is enforced from the encoded length, before decoding."""
+    from fastapi import HTTPException
+    from backend.routers import uploads
+
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_SIZE_BYTES", 30)
+    assert uploads._decode_base64(base64.b64encode(b"x" * 30).decode(), "File") == b"x" * 30
+
+    decoded = []
+    monkeypatch.setattr(uploads.binascii, "a2b_base64", lambda content: decoded.append(content))
+    with pytest.raises(HTTPException) as exc:
+        uploads._decode_base64(base64.b64encode(b"x" * 40).decode(), "File")
+
+    assert exc.value.status_code == 413
+    assert decoded == []
+
+
 @patch('backend.main.image_processor.extract_text_from_image')
 @patch('backend.main.image_processor.get_image_metadata')
 @patch('backend.main.image_processor.store_image')
@@ -731,6 +748,27 @@ def test_health_check(client):
     assert "openai_configured" in data["dependencies"]
 
 
+def test_health_check_caches_probes(client, monkeypatch):
+    """Test repeated health checks reuse the disk and database probes."""
+    from backend import main
+
+    probes = []
+    monkeypatch.setattr(main, "_health_cache", {"ts": 0.0, "data": None})
+
+    async def probe():
+        probes.append(1)
+        return {"disk_healthy": True}
+
+    monkeypatch.setattr(main, "_probe_dependencies", probe)
+
+    first = client.get("/health").json()
+    second = client.get("/health").json()
+
+    assert len(probes) == 1
+    assert second["dependencies"]["disk_healthy"] is True
+    assert second["statistics"] == first["statistics"]
+
+
 # =============================================================================
 # INTEGRATION TEST - FULL WORKFLOW
 # =============================================================================
@@ -818,3 +856,81 @@ async def test_full_workflow(mock_extract, client):
     # 10. Check health
     health_response = client.get("/health")
     assert health_response.status_code == 200
+
+
+def test_default_response_encodes_int_keys():
+    """Test the default orjson response renders like stdlib json, int keys included."""
+    import json
+    from backend.responses import FastJSONResponse
+
+    payload = {"grouped_by_cluster": {3: [1, 2]}, "score": 0.5, "name": "naïve"}
+    response = FastJSONResponse(payload)
+
+    assert json.loads(response.body) == json.loads(json.dumps(payload))
+
+
+async def test_raw_body_rejected_from_content_length(monkeypatch):
+    """Test raw uploads are refused from the declared length, before reading."""
+    from fastapi import HTTPException
+    from backend.routers import uploads
+
+    monkeypatch.setattr(uploads, "MAX_UPLOAD_SIZE_BYTES", 10)
+    streamed = []
+
+    class FakeRequest:
+        def __init__(self, headers, chunks):
+            self.headers = headers
+            self._chunks = chunks
+
+        async def stream(self):
+            for chunk in self._chunks:
+                streamed.append(chunk)
+                yield chunk
+
+    assert await uploads._read_body(FakeRequest({"content-length": "8"}, [b"abcd", b"efgh"]), "File") == b"abcdefgh"
+
+    streamed.clear()
+    with pytest.raises(HTTPException) as exc:
+        await uploads._read_body(FakeRequest({"content-length": "11"}, [b"x" * 11]), "File")
+    assert exc.value.status_code == 413
+    assert streamed == []
+
+    # Without a usable Content-Length the stream is cut off at the limit
+    with pytest.raises(HTTPException):
+        await uploads._read_body(FakeRequest({}, [b"x" * 6, b"x" * 6, b"x" * 6]), "File")
+    assert len(streamed) == 2
+
+
+def test_export_streams_valid_json():
+    """Test the streamed exports join into the same JSON documents."""
+    import json
+    from backend.models import Cluster, DocumentMetadata
+    from backend.routers import clusters as clusters_router
+
+    documents = {0: 'Quote " and\nnewline', 1: "naïve text"}
+    metadata = {
+        doc_id: DocumentMetadata(
+            doc_id=doc_id, owner="alice", source_type="text", skill_level="beginner",
+            cluster_id=0, ingested_at="2024-01-01T00:00:00", content_length=len(text)
+        )
+        for doc_id, text in documents.items()
+    }
+    cluster_list = [Cluster(id=0, name="Notes", doc_ids=[0, 1], primary_concepts=[], skill_level="beginner", doc_count=2)]
+
+    data = json.loads(b"".join(clusters_router._stream_export_json([0, 1], documents, metadata, cluster_list)))
+    assert [d["content"] for d in data["documents"]] == [documents[0], documents[1]]
+    assert data["documents"][0]["cluster_name"] == "Notes"
+    assert data["total_documents"] == 2 and data["total_clusters"] == 1
+
+    data = json.loads(b"".join(clusters_router._stream_cluster_json(cluster_list[0], [0, 1], documents, metadata)))
+    assert data["cluster"]["name"] == "Notes"
+    assert [d["content"] for d in data["documents"]] == [documents[0], documents[1]]
+
+    data = json.loads(b"".join(clusters_router._stream_cluster_markdown(cluster_list[0], [0, 1], documents, metadata)))
+    assert data["cluster_name"] == "Notes"
+    assert 'Quote " and\nnewline\n\n' in data["content"]
+
+    data = json.loads(b"".join(clusters_router._stream_export_markdown([0, 1], documents, metadata, cluster_list)))
+    assert data["format"] == "markdown"
+    assert "# Cluster: Notes" in data["content"]
+    assert 'Quote " and\nnewline...' in data["content"]
@@ -267,6 +267,52 @@ async def test_delete_nonexistent_document(repository):
     assert result is False
 
 
+@pytest.mark.asyncio
+async def test_add_after_restart_with_deleted_row_gets_fresh_id(db_session, repository, sample_metadata):
+    """Test a document added after reloading a database with a gap reuses no live ID."""
+    for content in ["alice doc zero", "alice doc one", "bob doc two"]:
+        await repository.add_document(content, sample_metadata)
+    await repository.delete_document(0)
+
+    # Restart: a new repository reloads the vector store from the database
+    restarted = DatabaseKnowledgeBankRepository(db_session=db_session)
+    assert restarted.vector_store.doc_ids == [1, 2]
+
+    doc_id = await restarted.add_document("bob new upload", sample_metadata)
+
+    assert doc_id == 3
+    assert await restarted.get_document(2) == "bob doc two"
+
+
+def test_load_storage_from_db_then_upload_gets_fresh_id(db_session, monkeypatch):
+    """Test uploads after load_storage_from_db never reuse an ID still in the database."""
+    from contextlib import contextmanager
+    from backend import db_storage_adapter
+    from backend.vector_store import VectorStore
+
+    # Row 1 was deleted: the database holds doc_ids 0 and 2
+    db_session.add_all([
+        DBVectorDocument(doc_id=0, content="alice secret doc zero"),
+        DBVectorDocument(doc_id=2, content="bob doc two"),
+    ])
+    db_session.commit()
+
+    @contextmanager
+    def test_db_context():
+        yield db_session
+
+    monkeypatch.setattr(db_storage_adapter, "get_db_context", test_db_context)
+    vector_store = VectorStore()
+    documents, _, _, _ = db_storage_adapter.load_storage_from_db(vector_store)
+
+    doc_id = vector_store.add_document("bob new upload")
+    batch_ids = vector_store.add_documents_batch(["batch upload"])
+
+    assert doc_id not in documents and batch_ids[0] not in documents
+    assert vector_store.docs[0] == "alice secret doc zero"
+    assert vector_store.docs[2] == "bob doc two"
+
+
 @pytest.mark.asyncio
 async def test_delete_document_cascade_deletes_concepts(repository, sample_metadata):
     """Test that deleting document cascades to concepts."""
@@ -677,6 +723,78 @@ def test_document_concepts_relationship(db_session, sample_user, sample_cluster)
     assert doc.concepts[0].name in ["Python", "Tutorial"]
 
 
+def test_merge_duplicates_deletes_rows_in_bulk(db_session, sample_user, sample_cluster):
+    """Merging removes the deleted documents with their concepts and vectors."""
+    from backend.duplicate_detection import DuplicateDetector
+
+    docs = [
+        DBDocument(doc_id=i, owner_username=sample_user.username, cluster_id=sample_cluster.id, source_type="text")
+        for i in range(3)
+    ]
+    db_session.add_all(docs)
+    db_session.flush()
+    for doc in docs:
+        db_session.add(DBConcept(document_id=doc.id, name=f"Concept {doc.doc_id}", category="topic", confidence=0.9))
+        db_session.add(DBVectorDocument(doc_id=doc.doc_id, content=f"content {doc.doc_id}"))
+    db_session.commit()
+
+    result = DuplicateDetector(db_session, None).merge_duplicates(0, [1, 2], sample_user.username)
+
+    assert result["deleted_count"] == 2
+    assert [d.doc_id for d in db_session.query(DBDocument)] == [0]
+    assert [v.doc_id for v in db_session.query(DBVectorDocument)] == [0]
+    assert db_session.query(DBConcept).count() == 1
+
+
+def test_concept_names_share_one_term(db_session, sample_user, sample_cluster):
+    """Test repeated concept names are stored once in concept_terms."""
+    from backend.db_models import DBConceptTerm
+
+    doc1 = DBDocument(doc_id=0, owner_username=sample_user.username, cluster_id=sample_cluster.id, source_type="text")
+    doc2 = DBDocument(doc_id=1, owner_username=sample_user.username, cluster_id=sample_cluster.id, source_type="text")
+    db_session.add_all([doc1, doc2])
+    db_session.flush()
+
+    db_session.add_all([
+        DBConcept(document_id=doc1.id, name="python", category="language", confidence=0.9),
+        DBConcept(document_id=doc2.id, name="python", category="language", confidence=0.7),
+    ])
+    db_session.commit()
+
+    db_session.add(DBConcept(document_id=doc2.id, name="python", category="language", confidence=0.5))
+    db_session.commit()
+
+    assert db_session.query(DBConceptTerm).count() == 1
+    assert db_session.query(DBConcept).filter(DBConcept.name == "python").count() == 3
+
+
+def test_concept_term_keeps_category_per_name(db_session, sample_user, sample_cluster):
+    """Test one name saved under two categories keeps both categories."""
+    from backend.db_models import DBConceptTerm
+
+    doc = DBDocument(doc_id=0, owner_username=sample_user.username, cluster_id=sample_cluster.id, source_type="text")
+    db_session.add(doc)
+    db_session.flush()
+
+    db_session.add(DBConcept(document_id=doc.id, name="python", category="language", confidence=0.9))
+    db_session.commit()
+    tool = DBConcept(document_id=doc.id, name="python", category="tool", confidence=0.8)
+    db_session.add(tool)
+    db_session.commit()
+    db_session.expire_all()
+
+    categories = sorted(c.category for c in db_session.query(DBConcept).all())
+    assert categories == ["language", "tool"]
+    assert db_session.query(DBConceptTerm).count() == 2
+
+    # Re-categorizing a loaded concept moves it to the matching term
+    tool.category = "language"
+    db_session.commit()
+    db_session.expire_all()
+    assert db_session.get(DBConcept, tool.id).category == "language"
+    assert db_session.get(DBConcept, tool.id).name == "python"
+
+
 # =============================================================================
 # EDGE CASES
 # =============================================================================
@@ -746,5 +864,82 @@ async def test_empty_repository_operations(repository):
     assert isinstance(all_clusters, dict)
 
 
+# =============================================================================
+# INCREMENTAL STORAGE SAVES
+# =============================================================================
+
+@pytest.fixture
+def adapter_db(db_engine, monkeypatch):
+    """Point db_storage_adapter at the test database."""
+    from contextlib import contextmanager
+    from backend import db_storage_adapter
+
+    SessionLocal = sessionmaker(bind=db_engine)
+
+    @contextmanager
+    def db_context():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    monkeypatch.setattr(db_storage_adapter, "get_db_context", db_context)
+    return SessionLocal
+
+
+def test_save_changes_writes_only_named_entries(adapter_db):
+    """Test incremental saves upsert the named rows and delete removed documents, then reload."""
+    from backend.db_storage_adapter import save_changes_to_db
+
+    users = {"alice": "hash1", "bob": "hash2"}
+    clusters = {1: Cluster(id=1, name="Python", primary_concepts=["python"], doc_ids=[10, 11], skill_level="beginner", doc_count=2)}
+    documents = {10: "first doc", 11: "second doc"}
+    metadata = {
+        doc_id: DocumentMetadata(
+            doc_id=doc_id, owner="alice", source_type="text", cluster_id=1,
+            concepts=[Concept(name="Python", category="language", confidence=0.9)],
+            skill_level="beginner", ingested_at=datetime.utcnow().isoformat(), content_length=9
+        )
+        for doc_id in documents
+    }
+
+    save_changes_to_db(documents, metadata, clusters, users, usernames=["alice"], cluster_ids=[1], doc_ids=[10, 11])
+
+    db = adapter_db()
+    assert [u.username for u in db.query(DBUser)] == ["alice"]
+    assert sorted(d.doc_id for d in db.query(DBDocument)) == [10, 11]
+    assert db.query(DBConcept).count() == 2
+    db.close()
+
+    # Update one document, delete the other
+    documents[10] = "edited doc"
+    metadata[10].skill_level = "advanced"
+    del documents[11], metadata[11]
+    save_changes_to_db(documents, metadata, clusters, users, doc_ids=[10], deleted_doc_ids=[11])
+
+    db = adapter_db()
+    assert [d.doc_id for d in db.query(DBDocument)] == [10]
+    assert db.query(DBDocument).one().skill_level == "advanced"
+    assert [v.content for v in db.query(DBVectorDocument)] == ["edited doc"]
+    assert db.query(DBConcept).count() == 1
+    db.close()
+
+    # Loading rebuilds the vector store once, under the database doc_ids
+    from backend.db_storage_adapter import load_storage_from_db
+    from backend.vector_store import VectorStore
+
+    vector_store = VectorStore()
+    rebuilds = []
+    original_rebuild = vector_store._rebuild_vectors
+    vector_store._rebuild_vectors = lambda: (rebuilds.append(1), original_rebuild())
+
+    loaded_docs, loaded_meta, _, loaded_users = load_storage_from_db(vector_store)
+    assert loaded_docs == {10: "edited doc"}
+    assert vector_store.doc_ids == [10]
+    assert len(rebuilds) == 1
+    assert vector_store.search("edited", top_k=1)[0][0] == 10
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -474,5 +474,43 @@ class TestIntegration:
             assert merge_result["status"] == "merged"
 
 
+
+@pytest.mark.asyncio
+async def test_upload_after_merge_gets_fresh_id(monkeypatch):
+    """Test the merge route's vector store removal never lets a live ID be reused."""
+    import asyncio
+    from contextlib import contextmanager
+    from unittest.mock import AsyncMock
+    from backend.models import User
+    from backend.routers import duplicates as duplicates_router
+
+    vector_store = VectorStore()
+    ids = vector_store.add_documents_batch(["keep me", "duplicate of keep me", "bob doc two"])
+    documents = dict(zip(ids, vector_store.docs.values()))
+
+    @contextmanager
+    def fake_db_context():
+        yield Mock()
+
+    detector = Mock()
+    detector.merge_duplicates.return_value = {"status": "merged"}
+    monkeypatch.setattr(duplicates_router, "get_db_context", fake_db_context)
+    monkeypatch.setattr(duplicates_router, "DuplicateDetector", Mock(return_value=detector))
+    monkeypatch.setattr(duplicates_router, "get_documents", lambda: documents)
+    monkeypatch.setattr(duplicates_router, "get_metadata", lambda: {})
+    monkeypatch.setattr(duplicates_router, "get_clusters", lambda: {})
+    monkeypatch.setattr(duplicates_router, "get_storage_lock", lambda: asyncio.Lock())
+    monkeypatch.setattr(duplicates_router, "persist_changes", AsyncMock())
+
+    await duplicates_router.merge_duplicates(
+        {"keep_doc_id": ids[1], "delete_doc_ids": [ids[0]]},
+        current_user=User(username="alice"),
+        vector_store=vector_store,
+    )
+
+    new_id = vector_store.add_document("next upload")
+    assert new_id not in ids
+    assert vector_store.docs[ids[2]] == "bob doc two"
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
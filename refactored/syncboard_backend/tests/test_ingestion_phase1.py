@@ -362,3 +362,15 @@ class TestIntegrationWithIngest:
 
         assert 'SOURCE CODE FILE' in result
         assert 'Language: Python' in result
+
+    def test_text_file_encodings_detected(self):
+        """Test that BOM-marked and legacy-encoded text files decode correctly."""
+        from backend.ingest import ingest_upload_file
+
+        french = "Le café était très bon, déjà vu à la crème brûlée. Naïve façade — “quoted” résumé."
+        russian = "Привет, как дела? Это тестовый текст на русском языке для проверки кодировки файла."
+
+        assert ingest_upload_file('notes.txt', french.encode('utf-16')) == french
+        assert ingest_upload_file('notes.txt', b'\xef\xbb\xbf' + french.encode('utf-8')) == french
+        assert ingest_upload_file('notes.txt', french.encode('cp1252')) == french
+        assert ingest_upload_file('notes.md', russian.encode('cp1251')) == russian
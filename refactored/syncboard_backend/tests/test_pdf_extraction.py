@@ -0,0 +1,79 @@
+"""
+Tests for PDF text extraction.
+
+PDFs are generated in memory, one Helvetica text line per page.
+"""
+
+import pytest
+
+from backend import ingest
+from backend.ingest import extract_pdf_text
+
+
+def _make_pdf(page_texts):
+    """Build a minimal PDF with one line of text per page ("" = no text layer)."""
+    page_count = len(page_texts)
+    font_id = 3 + 2 * page_count
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(
+            f"{3 + 2 * i} 0 R".encode() for i in range(page_count)
+        ) + f"] /Count {page_count} >>".encode(),
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode() if text else b""
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return pdf
+
+
+class TestPdfExtraction:
+    """Test extract_pdf_text()."""
+
+    def test_extracts_text_per_page(self):
+        """Test each page's text is labelled with its page number."""
+        result = extract_pdf_text(_make_pdf(["Docker basics", "Kubernetes pods"]))
+
+        assert result.startswith("PDF DOCUMENT (2 pages)")
+        assert "--- Page 1 ---\nDocker basics" in result
+        assert "--- Page 2 ---\nKubernetes pods" in result
+
+    def test_pdfium_matches_pypdf(self):
+        """Test the PDFium backend extracts the same page text as pypdf."""
+        pytest.importorskip("pypdfium2")
+        pdf = _make_pdf(["First page", "Second page"])
+
+        pdfium_pages = [text.strip() for text in ingest._extract_pdf_pages_pdfium(pdf)]
+        pypdf_pages = [text.strip() for text in ingest._extract_pdf_pages_pypdf(pdf)]
+
+        assert pdfium_pages == pypdf_pages == ["First page", "Second page"]
+
+    def test_scanned_pages_are_ocrd(self, monkeypatch):
+        """Test pages without a text layer are rendered and OCR'd."""
+        pytest.importorskip("pypdfium2")
+        rendered = []
+
+        def fake_ocr(images):
+            rendered.extend(images)
+            return ["scanned text"] * len(images)
+
+        monkeypatch.setattr(ingest, "_ocr_pdf_pages", fake_ocr)
+        result = extract_pdf_text(_make_pdf(["Typed page", ""]))
+
+        assert len(rendered) == 1
+        assert "--- Page 1 ---\nTyped page" in result
+        assert "--- Page 2 ---\nscanned text" in result
@@ -0,0 +1,65 @@
+"""
+Unit tests for the proactive LLM rate limiter.
+
+Tests TokenBucket accounting and token estimation.
+"""
+
+import time
+import pytest
+
+# Add parent directory to path
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.rate_limiter import TokenBucket, estimate_tokens, estimate_message_tokens
+
+
+@pytest.mark.asyncio
+async def test_acquire_consumes_budget():
+    """Test acquire() deducts one request and the requested tokens."""
+    bucket = TokenBucket(max_requests_per_minute=100, max_tokens_per_minute=1000)
+
+    await bucket.acquire(250)
+
+    assert bucket.available_requests == pytest.approx(99, abs=0.1)
+    assert bucket.available_tokens == pytest.approx(750, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_refill():
+    """Test acquire() blocks until the request budget refills."""
+    # 6000 RPM = 100 requests/second, so one extra request waits ~10ms
+    bucket = TokenBucket(max_requests_per_minute=6000, max_tokens_per_minute=10**9)
+    bucket.available_requests = 0.0
+
+    start = time.monotonic()
+    await bucket.acquire(1)
+    elapsed = time.monotonic() - start
+
+    assert elapsed >= 0.005
+
+
+@pytest.mark.asyncio
+async def test_acquire_oversized_request_does_not_deadlock():
+    """Test a request larger than the TPM limit is capped to the bucket size."""
+    bucket = TokenBucket(max_requests_per_minute=100, max_tokens_per_minute=100)
+
+    await bucket.acquire(10_000)
+
+    assert bucket.available_tokens < 1
+
+
+def test_estimate_tokens_positive():
+    """Test token estimation returns a positive count for non-empty text."""
+    assert estimate_tokens("hello world, this is a test", "gpt-5-nano") > 0
+
+
+def test_estimate_message_tokens_includes_all_messages():
+    """Test message estimation grows with every message."""
+    one = estimate_message_tokens([{"role": "user", "content": "hi"}], "gpt-5-nano")
+    two = estimate_message_tokens(
+        [{"role": "system", "content": "hi"}, {"role": "user", "content": "hi"}],
+        "gpt-5-nano"
+    )
+    assert two > one
@@ -9,11 +9,14 @@ Tests security features:
 - HTTPS enforcement (in production mode)
 """
 
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 from backend.main import app
 from backend import dependencies
-from backend.auth import hash_password
+from backend import auth
+from backend.auth import hash_password, pwd_context, verify_and_update_password
 
 # =============================================================================
 # Test Client Setup
@@ -105,7 +108,7 @@ class TestAuthenticationSecurity:
         if "weak_user" in dependencies.users:
             hashed = dependencies.users["weak_user"]
             assert hashed != "123"  # Not plaintext
-            assert hashed.startswith("$2b$")  # Bcrypt format
+            assert pwd_context.identify(hashed) == pwd_context.default_scheme()
     
     def test_login_with_wrong_password_fails(self):
         """Test that wrong password is rejected."""
@@ -121,6 +124,21 @@ class TestAuthenticationSecurity:
         assert response.status_code == 401
         assert "incorrect" in response.json()["detail"].lower()
     
+    def test_login_upgrades_deprecated_hash(self):
+        """Test that a legacy bcrypt hash is rehashed with the default scheme on login."""
+        if pwd_context.default_scheme() == "bcrypt":
+            pytest.skip("argon2-cffi not installed; bcrypt is the default scheme")
+        dependencies.users.clear()
+        dependencies.users["legacy_user"] = pwd_context.hash("legacy_password", scheme="bcrypt")
+        
+        response = client.post(
+            "/token",
+            json={"username": "legacy_user", "password": "legacy_password"}
+        )
+        
+        assert response.status_code == 200
+        assert pwd_context.identify(dependencies.users["legacy_user"]) == "argon2"
+    
     def test_login_with_nonexistent_user_fails(self):
         """Test that nonexistent user is rejected."""
         dependencies.users.clear()
@@ -132,6 +150,85 @@ class TestAuthenticationSecurity:
         
         assert response.status_code == 401
     
+    def test_login_unknown_user_runs_dummy_verification(self, monkeypatch):
+        """Test that missing users cost one hash verification, like wrong passwords."""
+        calls = []
+        monkeypatch.setattr(pwd_context, "dummy_verify", lambda *args: calls.append("dummy"))
+        dependencies.users.clear()
+        
+        response = client.post(
+            "/token",
+            json={"username": "ghost_user", "password": "password"}
+        )
+        
+        assert response.status_code == 401
+        assert calls == ["dummy"]
+    
+    def test_password_hashing_runs_off_event_loop(self, monkeypatch):
+        """Test that registration and login hash in a worker thread, not on the loop."""
+        from backend.routers import auth as auth_router
+        loops = []
+        
+        def record_loop(func):
+            def wrapper(*args, **kwargs):
+                try:
+                    loops.append(asyncio.get_running_loop())
+                except RuntimeError:
+                    loops.append(None)
+                return func(*args, **kwargs)
+            return wrapper
+        
+        monkeypatch.setattr(auth_router, "hash_password", record_loop(hash_password))
+        monkeypatch.setattr(
+            auth_router, "verify_and_update_password", record_loop(verify_and_update_password)
+        )
+        monkeypatch.setattr(dependencies, "save_changes_to_db", lambda *args, **kwargs: None)
+        dependencies.users.clear()
+        
+        credentials = {"username": "threaded_user", "password": "threaded_password1"}
+        assert client.post("/users", json=credentials).status_code == 200
+        assert client.post("/token", json=credentials).status_code == 200
+        assert loops == [None, None]
+    
+    def test_concurrent_registration_keeps_first_user(self, monkeypatch):
+        """Test that a name claimed while the password was hashing is not overwritten."""
+        from backend.routers import auth as auth_router
+        dependencies.users.clear()
+        
+        def hash_while_racing(password):
+            dependencies.users["racy_user"] = "winner_hash"
+            return hash_password(password)
+        
+        monkeypatch.setattr(auth_router, "hash_password", hash_while_racing)
+        response = client.post(
+            "/users", json={"username": "racy_user", "password": "racy_password1"}
+        )
+        
+        assert response.status_code == 400
+        assert dependencies.users["racy_user"] == "winner_hash"
+    
+    def test_repeat_verification_skips_kdf(self, monkeypatch):
+        """Test that a recent successful verification is served from the cache."""
+        stored_hash = hash_password("cached_password")
+        calls = []
+        real_verify = pwd_context.verify_and_update
+        
+        def counting_verify(*args, **kwargs):
+            calls.append(args[0])
+            return real_verify(*args, **kwargs)
+        
+        monkeypatch.setattr(pwd_context, "verify_and_update", counting_verify)
+        
+        assert verify_and_update_password("cached_password", stored_hash) == (True, None)
+        assert verify_and_update_password("cached_password", stored_hash) == (True, None)
+        assert calls == ["cached_password"]
+        
+        # Failures are never cached, and a new stored hash invalidates the entry
+        assert not verify_and_update_password("wrong_password", stored_hash)[0]
+        assert not verify_and_update_password("wrong_password", stored_hash)[0]
+        assert verify_and_update_password("cached_password", hash_password("cached_password"))[0]
+        assert len(calls) == 4
+    
     def test_access_without_token_fails(self):
         """Test that endpoints require authentication."""
         response = client.get("/clusters")
@@ -139,6 +236,18 @@ class TestAuthenticationSecurity:
         assert response.status_code == 401
         assert "not authenticated" in response.json()["detail"].lower()
     
+    def test_cached_token_still_expires(self, monkeypatch):
+        """Test that a cached token payload is rejected once its exp passes."""
+        token = auth.create_access_token({"sub": "cached_user"})
+        payload = auth.decode_access_token(token)
+        assert token in auth._token_cache
+        assert auth.decode_access_token(token) == payload
+        
+        monkeypatch.setattr(auth.time, "time", lambda: payload["exp"] + 1)
+        with pytest.raises(ValueError):
+            auth.decode_access_token(token)
+        assert token not in auth._token_cache
+    
     def test_access_with_invalid_token_fails(self):
         """Test that invalid tokens are rejected."""
         response = client.get(
@@ -23,7 +23,16 @@ from backend.services import (
 )
 from backend.llm_providers import MockLLMProvider
 from backend.concept_extractor import ConceptExtractor
+from backend.semantic_cache import SemanticCache
 from backend.build_suggester import BuildSuggester
+from backend.models import DocumentMetadata
+
+
+def make_meta(doc_id, owner="alice", source_type="text", ingested_at="2024-01-01T00:00:00"):
+    return DocumentMetadata(
+        doc_id=doc_id, owner=owner, source_type=source_type, skill_level="unknown",
+        ingested_at=ingested_at, content_length=1
+    )
 
 
 @pytest.fixture
@@ -33,8 +42,9 @@ def temp_storage():
     os.close(fd)
     yield path
     # Cleanup
-    if os.path.exists(path):
-        os.remove(path)
+    for leftover in (path, path + '.log'):
+        if os.path.exists(leftover):
+            os.remove(leftover)
 
 
 @pytest.fixture
@@ -259,6 +269,834 @@ async def test_build_suggestion_service_empty_knowledge(build_suggestion_service
     assert result["knowledge_summary"]["total_docs"] == 0
 
 
+# =============================================================================
+# ConceptExtractor Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+async def test_concept_extractor_extract_many_concurrent(concept_extractor):
+    """Test extract_many returns one result per input, in order."""
+    items = [(f"Document {i}", "text") for i in range(5)]
+
+    results = await concept_extractor.extract_many(items)
+
+    assert len(results) == 5
+    assert all(r["primary_topic"] == "testing" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_concept_extractor_extract_many_uses_batch_api():
+    """Test extract_many delegates large inputs to the provider's batch API."""
+    class BatchProvider(MockLLMProvider):
+        def __init__(self):
+            self.batch_calls = 0
+
+        async def extract_concepts_batch(self, items):
+            self.batch_calls += 1
+            return [{"concepts": [], "primary_topic": content} for content, _ in items]
+
+    provider = BatchProvider()
+    extractor = ConceptExtractor(llm_provider=provider, batch_threshold=2)
+    items = [(f"doc {i}", "text") for i in range(3)]
+
+    results = await extractor.extract_many(items)
+
+    assert provider.batch_calls == 1
+    assert [r["primary_topic"] for r in results] == ["doc 0", "doc 1", "doc 2"]
+
+
+@pytest.mark.asyncio
+async def test_concept_extractor_caches_identical_content():
+    """Test repeated content is served from the cache without another LLM call."""
+    class CountingProvider(MockLLMProvider):
+        def __init__(self):
+            self.calls = 0
+
+        async def extract_concepts(self, content, source_type):
+            self.calls += 1
+            return await super().extract_concepts(content, source_type)
+
+    provider = CountingProvider()
+    extractor = ConceptExtractor(llm_provider=provider, cache_maxsize=2)
+
+    first = await extractor.extract("Python tutorial", "text")
+    second = await extractor.extract("Python tutorial", "text")
+    assert provider.calls == 1
+    assert first == second
+
+    # Different source type is a different cache key
+    await extractor.extract("Python tutorial", "pdf")
+    assert provider.calls == 2
+
+    # Oldest entry is evicted once maxsize is exceeded
+    await extractor.extract("Docker guide", "text")
+    await extractor.extract("Python tutorial", "text")
+    assert provider.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_concept_extractor_semantic_cache_near_duplicates():
+    """Test near-duplicate content is served from the semantic cache."""
+    class EmbeddingProvider(MockLLMProvider):
+        def __init__(self):
+            self.calls = 0
+
+        async def extract_concepts(self, content, source_type):
+            self.calls += 1
+            return await super().extract_concepts(content, source_type)
+
+        async def embed_text(self, text):
+            # Whitespace-insensitive "embedding" so reformatted text matches
+            return [1.0, 0.0] if "python" in text.lower() else [0.0, 1.0]
+
+    # Off by default: every miss would pay for an embeddings call
+    assert ConceptExtractor(llm_provider=EmbeddingProvider()).semantic_cache is None
+
+    provider = EmbeddingProvider()
+    extractor = ConceptExtractor(llm_provider=provider, semantic_cache=SemanticCache())
+
+    await extractor.extract("Python tutorial", "text", owner="alice")
+    await extractor.extract("Python   tutorial\n", "text", owner="alice")
+    assert provider.calls == 1
+
+    # Dissimilar content and other namespaces still miss
+    await extractor.extract("Docker guide", "text", owner="alice")
+    await extractor.extract("Python tutorial", "pdf", owner="alice")
+    assert provider.calls == 3
+
+    # allow_cache=False always goes to the provider
+    await extractor.extract("Python tutorial", "text", allow_cache=False, owner="alice")
+    assert provider.calls == 4
+
+    # Another user's near-duplicate is not served alice's result
+    await extractor.extract("Python  tutorial", "text", owner="bob")
+    assert provider.calls == 5
+
+    # A semantic hit is not pinned in the (shared) exact cache
+    await extractor.extract("Python tutorial!", "text", owner="alice")
+    await extractor.extract("Python tutorial!", "text", owner="carol")
+    assert provider.calls == 6
+
+
+def test_semantic_cache_enabled_by_env(monkeypatch):
+    """Test SEMANTIC_CACHE_ENABLED turns the semantic cache on for embedding providers."""
+    class EmbeddingProvider(MockLLMProvider):
+        async def embed_text(self, text):
+            return [1.0, 0.0]
+
+    monkeypatch.setenv("SEMANTIC_CACHE_ENABLED", "true")
+
+    assert isinstance(ConceptExtractor(llm_provider=EmbeddingProvider()).semantic_cache, SemanticCache)
+    assert ConceptExtractor(llm_provider=MockLLMProvider()).semantic_cache is None
+
+
+@pytest.mark.asyncio
+async def test_concept_extractor_coalesces_concurrent_duplicates():
+    """Test simultaneous requests for the same content share one LLM call."""
+    class SlowProvider(MockLLMProvider):
+        def __init__(self):
+            self.calls = 0
+
+        async def extract_concepts(self, content, source_type):
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return await super().extract_concepts(content, source_type)
+
+    provider = SlowProvider()
+    extractor = ConceptExtractor(llm_provider=provider)
+
+    results = await asyncio.gather(
+        *(extractor.extract("Shared study notes", "text") for _ in range(5)),
+        extractor.extract("Other notes", "text")
+    )
+
+    assert provider.calls == 2
+    assert all(result == results[0] for result in results[:5])
+    assert len(extractor._flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_waiter_takes_over_cancelled_leader():
+    """Test a waiter reruns the work if the leader is cancelled, and errors propagate."""
+    from backend.singleflight import SingleFlight
+
+    flights = SingleFlight()
+    started = asyncio.Event()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        started.set()
+        await asyncio.sleep(0.01)
+        return len(runs)
+
+    leader = asyncio.create_task(flights.do("key", work))
+    await started.wait()
+    waiter = asyncio.create_task(flights.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == 2
+    assert leader.cancelled()
+
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await flights.do("key", fail)
+    assert len(flights) == 0
+
+
+def test_semantic_cache_ttl_expiry():
+    """Test expired semantic cache entries are not served."""
+    from backend.semantic_cache import SemanticCache
+
+    cache = SemanticCache(threshold=0.95, ttl_seconds=0)
+    cache.store("text", [1.0, 0.0], {"primary_topic": "python"})
+
+    assert cache.lookup("text", [1.0, 0.0]) is None
+
+    cache = SemanticCache(threshold=0.95)
+    cache.store("text", [1.0, 0.0], {"primary_topic": "python"})
+    assert cache.lookup("text", [0.99, 0.05]) == {"primary_topic": "python"}
+    assert cache.lookup("text", [0.5, 0.5]) is None
+
+
+def test_semantic_cache_evicts_oldest_at_maxsize():
+    """Test a full namespace overwrites its oldest entry and keeps the rest."""
+    cache = SemanticCache(threshold=0.99, maxsize=40)
+    vectors = [[float(i == j) for j in range(50)] for i in range(50)]
+    for i, vec in enumerate(vectors):
+        cache.store("text", vec, {"i": i})
+
+    assert len(cache._namespaces["text"]["results"]) == 40
+    assert [cache.lookup("text", vec) for vec in vectors[:10]] == [None] * 10
+    assert [cache.lookup("text", vec) for vec in vectors[10:]] == [{"i": i} for i in range(10, 50)]
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_bounds_concurrency(monkeypatch):
+    """Test OpenAIProvider never exceeds OPENAI_MAX_CONCURRENCY in-flight calls."""
+    from types import SimpleNamespace
+    from backend.llm_providers import OpenAIProvider
+
+    monkeypatch.setenv("OPENAI_MAX_CONCURRENCY", "2")
+    provider = OpenAIProvider(api_key="sk-test")
+    state = {"active": 0, "peak": 0}
+
+    async def fake_create(**kwargs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        message = SimpleNamespace(content='{"concepts": []}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    provider.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=fake_create))
+    )
+
+    await asyncio.gather(*(provider.extract_concepts(f"doc {i}", "text") for i in range(6)))
+
+    assert state["peak"] == 2
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_strips_markdown_fences():
+    """Test fenced JSON responses are parsed instead of discarded."""
+    from types import SimpleNamespace
+    from backend.llm_providers import OpenAIProvider
+
+    provider = OpenAIProvider(api_key="sk-test")
+
+    async def fake_create(**kwargs):
+        content = '```json\n{"concepts": [{"name": "docker", "relevance": 0.9}]}\n```'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    provider.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=fake_create))
+    )
+
+    result = await provider.extract_concepts("Docker guide", "text")
+
+    assert result["concepts"][0]["name"] == "docker"
+
+
+@pytest.mark.asyncio
+async def test_openai_provider_requests_json_mode_and_unwraps_suggestions():
+    """Test JSON mode is requested and the suggestions wrapper is unwrapped."""
+    from types import SimpleNamespace
+    from backend.llm_providers import OpenAIProvider
+
+    provider = OpenAIProvider(api_key="sk-test")
+    seen = {}
+
+    async def fake_create(**kwargs):
+        seen.update(kwargs)
+        content = '{"suggestions": [{"title": "CLI tool"}]}'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    provider.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=fake_create))
+    )
+
+    suggestions = await provider.generate_build_suggestions("summary", 1)
+
+    assert seen["response_format"] == {"type": "json_object"}
+    assert seen["max_tokens"] == 450  # sized for one suggestion, not the 2000 cap
+    assert suggestions == [{"title": "CLI tool"}]
+
+
+def test_openai_provider_concept_prompt_matches_template():
+    """Test precomputed prompt prefixes render the same prompt as the template."""
+    from backend.llm_providers import OpenAIProvider, CONCEPT_PROMPT_TEMPLATE
+
+    provider = OpenAIProvider(api_key="sk-test")
+    content = "x" * 2500
+
+    for source_type in ("pdf", "podcast"):
+        messages = provider._concept_messages(content, source_type)
+        assert messages[1]["content"] == CONCEPT_PROMPT_TEMPLATE.format(
+            source_type=source_type, sample=content[:2000]
+        )
+
+
+def test_openai_provider_trims_knowledge_summary_to_context(monkeypatch):
+    """Test oversized knowledge summaries are trimmed by whole clusters."""
+    from backend import llm_providers
+    from backend.llm_providers import OpenAIProvider
+
+    provider = OpenAIProvider(api_key="sk-test")
+    summary = "\n".join(f"\nCLUSTER {i}: name\n  - Documents: 1" + " word" * 200 for i in range(10))
+
+    assert provider._fit_knowledge_summary(summary, 100) == summary
+
+    monkeypatch.setattr(llm_providers, "LLM_CONTEXT_WINDOW", 1500)
+    trimmed = provider._fit_knowledge_summary(summary, 100)
+
+    assert trimmed.startswith("\nCLUSTER 0")
+    assert 0 < trimmed.count("CLUSTER ") < 10
+
+
+def test_openai_provider_knowledge_summary_empty_when_no_budget(monkeypatch):
+    """Test a summary gets no room (not a negative slice) when output + prompt fill the window."""
+    from backend import llm_providers
+    from backend.llm_providers import OpenAIProvider
+
+    provider = OpenAIProvider(api_key="sk-test")
+    summary = "\nCLUSTER 0: name\n  - Documents: 1" + " word" * 200
+
+    monkeypatch.setattr(llm_providers, "LLM_CONTEXT_WINDOW", 100)
+
+    assert provider._fit_knowledge_summary(summary, 1000) == ""
+
+
+@pytest.mark.asyncio
+async def test_local_concept_provider_extracts_keyphrases():
+    """Test the local provider extracts concepts without an LLM call."""
+    from backend.local_provider import LocalConceptProvider
+
+    provider = LocalConceptProvider(use_keybert=False)
+    text = "Docker tutorial. Docker containers run images. Build Docker images with a Dockerfile. " * 3
+
+    result = await provider.extract_concepts(text, "text")
+
+    assert result["primary_topic"] == "docker"
+    assert result["skill_level"] == "beginner"
+    assert all(0 <= c["confidence"] <= 1 for c in result["concepts"])
+
+
+@pytest.mark.asyncio
+async def test_local_concept_provider_falls_back_when_unsure(mock_llm_provider):
+    """Test low-confidence extractions are delegated to the fallback provider."""
+    from backend.local_provider import LocalConceptProvider
+
+    provider = LocalConceptProvider(fallback=mock_llm_provider, use_keybert=False)
+
+    result = await provider.extract_concepts("a the and", "text")
+
+    assert result["primary_topic"] == "testing"
+
+
+# =============================================================================
+# BuildSuggester Tests
+# =============================================================================
+
+def _fake_suggestion_stream(chunks, fail=None):
+    """Stand-in for an OpenAI streamed completion yielding text chunks."""
+    from types import SimpleNamespace
+
+    class FakeStream:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def __aiter__(self):
+            for text in chunks:
+                await asyncio.sleep(0)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+            if fail is not None:
+                raise fail
+
+    async def fake_create(**kwargs):
+        return FakeStream()
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=fake_create)))
+
+
+@pytest.mark.asyncio
+async def test_openai_stream_frees_concurrency_slot_while_consumer_waits(monkeypatch):
+    """Test the OpenAI slot is released once the completion is read, not when the consumer finishes."""
+    from backend.llm_providers import OpenAIProvider
+
+    monkeypatch.setenv("OPENAI_MAX_CONCURRENCY", "1")
+    provider = OpenAIProvider(api_key="sk-test")
+    provider.client = _fake_suggestion_stream(['{"suggestions": [{"title": "A"},', ' {"title": "B"}]}'])
+
+    stream = provider.stream_build_suggestions("CLUSTER 1: Python", 2)
+    assert await stream.__anext__() == {"title": "A"}
+
+    # The consumer is parked mid-stream; the reader has finished and let go
+    await asyncio.sleep(0.01)
+    assert not provider._semaphore.locked()
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_openai_stream_errors_propagate(monkeypatch):
+    """Test a failure mid-stream reaches the caller instead of ending the stream quietly."""
+    from backend.llm_providers import OpenAIProvider
+
+    provider = OpenAIProvider(api_key="sk-test")
+    provider.client = _fake_suggestion_stream(['{"suggestions": [{"title": "A"},'], fail=RuntimeError("boom"))
+
+    received = []
+    with pytest.raises(RuntimeError, match="boom"):
+        async for suggestion in provider.stream_build_suggestions("CLUSTER 1: Python", 2):
+            received.append(suggestion)
+
+    assert received == [{"title": "A"}]
+    assert not provider._semaphore.locked()
+
+
+def test_json_array_stream_parser_yields_objects_incrementally():
+    """Test streamed array elements are emitted as soon as they close."""
+    from backend.llm_providers import JSONArrayStreamParser
+
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[{"title": "A {weird} \\"title\\"", "steps": ["x"]') == []
+    assert parser.feed('}, {"title": "B"') == [{"title": 'A {weird} "title"', "steps": ["x"]}]
+    assert parser.feed('}]') == [{"title": "B"}]
+
+    # Object wrapper produced by JSON mode is skipped
+    parser = JSONArrayStreamParser()
+    assert parser.feed('{"suggestions": [{"title": "C"}]}') == [{"title": "C"}]
+
+
+@pytest.mark.asyncio
+async def test_build_suggester_stream_suggestions():
+    """Test stream_suggestions yields valid BuildSuggestion objects and skips invalid ones."""
+    from backend.models import Cluster
+
+    class StreamingProvider(MockLLMProvider):
+        async def stream_build_suggestions(self, knowledge_summary, max_suggestions):
+            yield {"title": "Broken"}
+            for i in range(3):
+                yield {
+                    "title": f"Project {i}",
+                    "description": "desc",
+                    "feasibility": "high",
+                    "effort_estimate": "1 day",
+                    "required_skills": [],
+                    "missing_knowledge": [],
+                    "relevant_clusters": [0],
+                    "starter_steps": []
+                }
+
+    suggester = BuildSuggester(llm_provider=StreamingProvider())
+    clusters = {0: Cluster(id=0, name="Testing", primary_concepts=["pytest"], doc_ids=[], skill_level="beginner", doc_count=0)}
+
+    suggestions = [s async for s in suggester.stream_suggestions(clusters, {}, max_suggestions=2)]
+
+    assert [s.title for s in suggestions] == ["Project 0", "Project 1"]
+
+
+# =============================================================================
+# ImageProcessor Tests
+# =============================================================================
+
+def test_image_processor_reuses_tesseract_api(monkeypatch):
+    """Test OCR reuses one in-process Tesseract engine instead of reinitializing."""
+    from io import BytesIO
+    from PIL import Image
+    from backend import image_processor as image_module
+
+    created = []
+
+    class FakeAPI:
+        def __init__(self, **kwargs):
+            self.ended = False
+            created.append(self)
+
+        def SetImage(self, image):
+            self.image = image
+
+        def GetUTF8Text(self):
+            return " hello \n"
+
+        def End(self):
+            self.ended = True
+
+    monkeypatch.setattr(image_module, "PyTessBaseAPI", FakeAPI)
+    monkeypatch.setattr(image_module, "PSM", type("PSM", (), {"AUTO": 3}), raising=False)
+
+    buffer = BytesIO()
+    Image.new("RGB", (20, 10), "white").save(buffer, "PNG")
+
+    processor = image_module.ImageProcessor()
+    assert processor.extract_text_from_image(buffer.getvalue()) == "hello"
+    assert processor.extract_text_from_image(buffer.getvalue()) == "hello"
+    assert len(created) == 1
+
+    processor.close()
+    assert created[0].ended
+
+
+def test_image_processor_batch_ocr_preserves_order(monkeypatch):
+    """Test batch OCR returns one text per image in input order."""
+    from io import BytesIO
+    from PIL import Image
+    from backend import image_processor as image_module
+
+    monkeypatch.setattr(image_module, "PyTessBaseAPI", None)
+    monkeypatch.setattr(
+        image_module.pytesseract, "image_to_string", lambda image, config="": f"width {image.width}"
+    )
+
+    images = []
+    for width in (10, 20, 30):
+        buffer = BytesIO()
+        Image.new("RGB", (width, 10), "white").save(buffer, "PNG")
+        images.append(buffer.getvalue())
+
+    processor = image_module.ImageProcessor()
+    try:
+        assert processor.extract_text_batch(images) == ["width 10", "width 20", "width 30"]
+        assert processor.extract_text_batch([]) == []
+    finally:
+        processor.close()
+
+
+def test_image_processor_preprocesses_to_grayscale():
+    """Test OCR input is single-channel, and binarized when requested."""
+    import numpy as np
+    from PIL import Image
+    from backend.image_processor import ImageProcessor
+
+    pixels = np.array([[20, 30, 200, 220]] * 4, dtype=np.uint8)
+    image = Image.fromarray(pixels, mode="L").convert("RGB")
+
+    assert ImageProcessor()._preprocess(image).mode == "L"
+
+    binarized = np.asarray(ImageProcessor(binarize=True)._preprocess(image))
+    assert set(np.unique(binarized)) == {0, 255}
+    assert (binarized[:, :2] == 0).all() and (binarized[:, 2:] == 255).all()
+
+
+def test_image_processor_drafts_large_jpegs(monkeypatch):
+    """Test large JPEGs are decoded downscaled, with the DPI scaled to match."""
+    from io import BytesIO
+    from PIL import Image
+    from backend.image_processor import ImageProcessor
+
+    buffer = BytesIO()
+    Image.new("RGB", (4000, 400), "white").save(buffer, "JPEG", dpi=(300, 300))
+
+    processor = ImageProcessor()
+    seen = {}
+
+    def fake_ocr(image, dpi=None):
+        seen.update(size=image.size, dpi=dpi)
+        return "text"
+
+    monkeypatch.setattr(processor, "_ocr", fake_ocr)
+    processor.extract_text_from_image(buffer.getvalue())
+
+    assert seen["size"] == (2000, 200)
+    assert seen["dpi"] == 150
+
+
+def test_image_processor_stores_original_bytes(monkeypatch, tmp_path):
+    """Test web formats are stored as uploaded and others re-encoded to JPEG."""
+    from io import BytesIO
+    from pathlib import Path
+    from PIL import Image
+    from backend.image_processor import ImageProcessor
+
+    monkeypatch.chdir(tmp_path)
+    processor = ImageProcessor()
+
+    def encode(fmt):
+        buffer = BytesIO()
+        Image.new("RGB", (8, 8), "red").save(buffer, fmt)
+        return buffer.getvalue()
+
+    jpeg = encode("JPEG")
+    path = processor.store_image(jpeg, 1)
+    assert path.endswith("doc_1.jpg")
+    assert Path(path).read_bytes() == jpeg
+
+    path = processor.store_image(encode("BMP"), 2)
+    assert path.endswith("doc_2.jpg")
+    with Image.open(path) as stored:
+        assert stored.format == "JPEG"
+
+    path = processor.store_image(jpeg, 3, format_hint="png")
+    assert path.endswith("doc_3.png")
+
+
+def test_image_processor_caches_ocr_by_content(monkeypatch):
+    """Test identical image bytes are only OCR'd once."""
+    from io import BytesIO
+    from PIL import Image
+    from backend.image_processor import ImageProcessor
+
+    processor = ImageProcessor(cache_maxsize=1)
+    calls = []
+
+    def fake_ocr(image, dpi=None):
+        calls.append(image.size)
+        return f"size {image.size[0]}"
+
+    monkeypatch.setattr(processor, "_ocr", fake_ocr)
+
+    def encode(width):
+        buffer = BytesIO()
+        Image.new("RGB", (width, 8), "white").save(buffer, "PNG")
+        return buffer.getvalue()
+
+    assert processor.extract_text_from_image(encode(8)) == "size 8"
+    assert processor.extract_text_from_image(encode(8)) == "size 8"
+    assert len(calls) == 1
+
+    # LRU bound: a second image evicts the first
+    processor.extract_text_from_image(encode(16))
+    processor.extract_text_from_image(encode(8))
+    assert len(calls) == 3
+
+
+def test_image_processor_ships_images_via_shared_memory(monkeypatch):
+    """Test process-mode OCR passes bytes through shared memory and unlinks it."""
+    from concurrent.futures import ThreadPoolExecutor
+    from multiprocessing import shared_memory
+    from backend import image_processor as image_module
+
+    # Stand-ins for the worker process: same protocol, run on a thread
+    worker = image_module.ImageProcessor(cache_maxsize=0)
+    monkeypatch.setattr(worker, "_recognize", lambda image_bytes: image_bytes.decode())
+    monkeypatch.setattr(image_module, "_worker_processor", worker)
+
+    names = []
+    real_shared_image = image_module._ocr_shared_image
+
+    def ocr_shared_image(name, size):
+        names.append(name)
+        return real_shared_image(name, size)
+
+    monkeypatch.setattr(image_module, "_ocr_shared_image", ocr_shared_image)
+
+    processor = image_module.ImageProcessor(processes=2)
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(processor, "_get_process_pool", lambda: pool)
+    try:
+        assert processor.extract_text_from_image(b"shared text") == "shared text"
+    finally:
+        pool.shutdown()
+        processor.close()
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=names[0])
+
+
+# =============================================================================
+# OwnerIndexedMetadata Tests
+# =============================================================================
+
+def test_owner_index_tracks_dict_mutations():
+    """Test the owner index follows every way metadata is added or removed."""
+    from backend.storage import OwnerIndexedMetadata
+
+    metadata = OwnerIndexedMetadata({1: make_meta(1, "alice")})
+    metadata[2] = make_meta(2, "bob")
+    metadata.update({3: make_meta(3, "alice"), 4: make_meta(4, "bob")})
+    assert metadata.doc_ids_for("alice") == [1, 3]
+    assert metadata.doc_ids_for("carol") == []
+
+    # Replacing an entry moves it between owners
+    metadata[2] = make_meta(2, "alice")
+    assert metadata.doc_ids_for("alice") == [1, 3, 2]
+    assert metadata.doc_ids_for("bob") == [4]
+
+    del metadata[1]
+    metadata.pop(4)
+    assert metadata.pop(99, None) is None
+    assert metadata.doc_ids_for("alice") == [3, 2]
+    assert metadata.doc_ids_for("bob") == []
+
+    metadata.clear()
+    assert metadata.doc_ids_for("alice") == []
+    assert not metadata.owns_any("alice")
+
+
+def test_source_type_index_narrows_owner_lookup():
+    """Test filtering a user's documents by source type through the index."""
+    from backend.storage import OwnerIndexedMetadata
+
+    metadata = OwnerIndexedMetadata({
+        1: make_meta(1, "alice", source_type="text"), 2: make_meta(2, "alice", source_type="url"),
+        3: make_meta(3, "bob", source_type="url"), 4: make_meta(4, "alice", source_type="url"),
+    })
+    assert metadata.doc_ids_for("alice", source_type="url") == [2, 4]
+    assert metadata.doc_ids_for("bob", source_type="text") == []
+    assert metadata.owns_any("bob")
+
+    metadata[2] = make_meta(2, "alice", source_type="text")
+    del metadata[4]
+    assert metadata.doc_ids_for("alice", source_type="url") == []
+    assert metadata.doc_ids_for("alice", source_type="text") == [1, 2]
+
+
+def test_time_index_answers_date_ranges():
+    """Test date ranges come from the sorted ingestion-time index."""
+    from backend.storage import OwnerIndexedMetadata
+
+    metadata = OwnerIndexedMetadata({
+        1: make_meta(1, ingested_at="2024-03-01T00:00:00"), 2: make_meta(2, ingested_at="2024-01-01T00:00:00"),
+        3: make_meta(3, ingested_at="not a date"), 4: make_meta(4, ingested_at="2024-02-01T00:00:00Z"),
+    })
+    jan, feb, mar = 1704067200.0, 1706745600.0, 1709251200.0
+
+    assert metadata.doc_ids_between(jan, feb) == [2, 4]
+    assert metadata.doc_ids_between(float('-inf'), float('inf')) == [2, 4, 1]
+
+    metadata[4] = make_meta(4, ingested_at="2024-03-01T00:00:00")
+    del metadata[2]
+    assert metadata.doc_ids_between(jan, feb) == []
+    assert metadata.doc_ids_between(mar, mar) == [1, 4]
+
+
+# =============================================================================
+# Metadata and Persistence Tests
+# =============================================================================
+
+def test_ingested_at_epoch_parsed_once():
+    """Test ingestion timestamps normalise to UTC epochs and are cached."""
+    from unittest.mock import patch
+    from backend.models import iso_to_epoch
+
+    meta = make_meta(1)
+
+    assert meta.ingested_at_epoch == iso_to_epoch("2024-01-01T00:00:00Z") == 1704067200.0
+    assert "ingested_at_epoch" not in meta.dict()
+
+    with patch("backend.models.iso_to_epoch") as parse:
+        assert meta.ingested_at_epoch == 1704067200.0
+    parse.assert_not_called()
+
+    meta.ingested_at = "not a date"
+    assert meta.ingested_at_epoch is None
+
+
+def test_cached_dump_invalidated_on_assignment():
+    """Test metadata serialization is reused until a field is reassigned."""
+    meta = make_meta(1)
+
+    first = meta.cached_dump()
+    assert first == meta.model_dump()
+    assert meta.cached_dump() is first
+
+    meta.skill_level = "advanced"
+    assert meta.cached_dump() is not first
+    assert meta.cached_dump()["skill_level"] == "advanced"
+
+
+@pytest.mark.asyncio
+async def test_persist_changes_writes_only_named_rows(monkeypatch):
+    """Test persistence snapshots just the named entries and serialises same-row writes."""
+    from backend import dependencies
+
+    monkeypatch.setattr(dependencies, "documents", {1: "one", 2: "two"})
+    monkeypatch.setattr(dependencies, "clusters", {})
+    monkeypatch.setattr(dependencies, "users", {})
+    calls = []
+    active = []
+
+    def fake_save(documents, metadata, clusters, users, **changes):
+        active.append(changes["doc_ids"])
+        assert len(active) == 1  # Same-row writes never overlap
+        calls.append((documents, changes))
+        active.pop()
+
+    monkeypatch.setattr(dependencies, "save_changes_to_db", fake_save)
+
+    await asyncio.gather(
+        dependencies.persist_changes(doc_ids=[1]),
+        dependencies.persist_changes(doc_ids=[1]),
+    )
+
+    assert [documents for documents, _ in calls] == [{1: "one"}, {1: "one"}]
+    assert calls[0][1]["deleted_doc_ids"] == []
+
+
+@pytest.mark.asyncio
+async def test_persist_flusher_batches_changes(monkeypatch):
+    """Test the background flusher coalesces a burst of changes into one write."""
+    from backend import dependencies
+
+    monkeypatch.setattr(dependencies, "documents", {1: "one", 2: "two"})
+    monkeypatch.setattr(dependencies, "clusters", {})
+    monkeypatch.setattr(dependencies, "users", {})
+    monkeypatch.setenv("SYNCBOARD_PERSIST_FLUSH_INTERVAL", "0.01")
+    calls = []
+    monkeypatch.setattr(
+        dependencies, "save_changes_to_db", lambda *args, **changes: calls.append(changes)
+    )
+
+    dependencies.start_persist_flusher()
+    try:
+        await dependencies.persist_changes(doc_ids=[1])
+        await dependencies.persist_changes(doc_ids=[2])
+        await dependencies.persist_changes(doc_ids=[3])
+        await dependencies.persist_changes(deleted_doc_ids=[3])
+        assert calls == []
+        await asyncio.sleep(0.1)
+    finally:
+        await dependencies.stop_persist_flusher()
+
+    assert len(calls) == 1
+    assert sorted(calls[0]["doc_ids"]) == [1, 2]
+    assert calls[0]["deleted_doc_ids"] == [3]
+
+
+def test_owned_documents_view_filters_without_copying():
+    """Test the build-suggestion document view exposes only the user's documents."""
+    from backend.routers.build_suggestions import _OwnedDocuments
+
+    documents = {1: "mine", 2: "theirs", 3: "also mine"}
+    view = _OwnedDocuments(documents, {1: None, 3: None, 4: None})
+
+    assert dict(view) == {1: "mine", 3: "also mine"}
+    assert len(view) == 2
+    assert 2 not in view
+    with pytest.raises(KeyError):
+        view[2]
+
+    documents[4] = "added later"
+    assert view[4] == "added later"
+
+
 # =============================================================================
 # Integration Tests
 # =============================================================================
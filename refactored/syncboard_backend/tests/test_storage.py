@@ -0,0 +1,206 @@
+"""
+Tests for the JSON storage layer (snapshot + append-only journal).
+
+Tests cover:
+- Snapshot save/load round trip
+- Journal replay over a snapshot, including a torn final record
+- Repository writes journaled, replayed on load, and compacted
+"""
+
+import gzip
+import json
+import os
+
+import pytest
+
+from backend import storage
+from backend.models import DocumentMetadata, Cluster, Concept
+from backend.repository import KnowledgeBankRepository
+from backend.storage import (
+    load_storage,
+    save_storage,
+    append_storage_log,
+    storage_log_path,
+    document_record,
+    delete_document_record,
+)
+from backend.vector_store import VectorStore
+
+
+def make_meta(doc_id: int, owner: str = "alice") -> DocumentMetadata:
+    return DocumentMetadata(
+        doc_id=doc_id,
+        owner=owner,
+        source_type="text",
+        concepts=[Concept(name="Python", category="language", confidence=0.9)],
+        skill_level="beginner",
+        cluster_id=0,
+        ingested_at="2024-01-01T00:00:00",
+        content_length=10,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A saved snapshot with two documents, one cluster and one user."""
+    path = str(tmp_path / "storage.json")
+    documents = {0: "Python basics", 2: "Café naïve ünïcode"}
+    metadata = {doc_id: make_meta(doc_id) for doc_id in documents}
+    clusters = {0: Cluster(id=0, name="Python", primary_concepts=["Python"],
+                           doc_ids=[0, 2], skill_level="beginner", doc_count=2)}
+    users = {"alice": "hash"}
+    save_storage(path, documents, metadata, clusters, users)
+    return path, documents, metadata, clusters, users
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_snapshot_round_trip(store, monkeypatch, use_orjson):
+    """Test a saved snapshot loads back unchanged."""
+    if not use_orjson:
+        monkeypatch.setattr(storage, "orjson", None)
+    path, documents, metadata, clusters, users = store
+
+    vector_store = VectorStore()
+    loaded_docs, loaded_meta, loaded_clusters, loaded_users = load_storage(path, vector_store)
+
+    assert loaded_docs == documents
+    assert {k: v.model_dump() for k, v in loaded_meta.items()} == {k: v.model_dump() for k, v in metadata.items()}
+    assert loaded_clusters[0].model_dump() == clusters[0].model_dump()
+    assert loaded_users == users
+    assert vector_store.doc_ids == [0, 2]
+    # Repeated strings share one object after loading
+    assert loaded_meta[0].owner is loaded_meta[2].owner
+    assert loaded_meta[0].concepts[0].name is loaded_meta[2].concepts[0].name
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_journal_replayed_over_snapshot(store, monkeypatch, use_orjson):
+    """Test journal records apply in order and a torn last line is ignored."""
+    if not use_orjson:
+        monkeypatch.setattr(storage, "orjson", None)
+    path, *_ = store
+
+    append_storage_log(path, [
+        document_record(3, "Añadido después", make_meta(3)),
+        delete_document_record(0),
+    ])
+    with open(storage_log_path(path), "ab") as f:
+        f.write('{"op": "delete_document", "doc_id": 2, "note": "é'.encode("utf-8")[:-1])
+
+    loaded_docs, loaded_meta, _, _ = load_storage(path, VectorStore())
+
+    assert loaded_docs == {2: "Café naïve ünïcode", 3: "Añadido después"}
+    assert sorted(loaded_meta) == [2, 3]
+
+
+def test_snapshot_metadata_missing_skill_level_defaults(store):
+    """Test older snapshot metadata without skill_level still loads."""
+    path, *_ = store
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    for meta in data["metadata"]:
+        del meta["skill_level"]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    _, loaded_meta, _, _ = load_storage(path, VectorStore())
+
+    assert {meta.skill_level for meta in loaded_meta.values()} == {"unknown"}
+
+
+def test_zst_snapshot_round_trip(tmp_path):
+    """Test snapshots saved to a .zst path are compressed and load back."""
+    pytest.importorskip("zstandard")
+    path = str(tmp_path / "storage.json.zst")
+    documents = {0: "Python basics " * 100}
+
+    save_storage(path, documents, {0: make_meta(0)}, {}, {"alice": "hash"})
+
+    with open(path, "rb") as f:
+        assert f.read(4) == storage.ZSTD_MAGIC
+    loaded_docs, loaded_meta, _, loaded_users = load_storage(path, VectorStore())
+    assert loaded_docs == documents
+    assert loaded_meta[0].owner == "alice"
+    assert loaded_users == {"alice": "hash"}
+
+
+def test_gz_snapshot_round_trip(tmp_path):
+    """Test snapshots saved to a .gz path are compact, gzip-compressed and load back."""
+    path = str(tmp_path / "storage.json.gz")
+    documents = {0: "Python basics " * 100}
+
+    save_storage(path, documents, {0: make_meta(0)}, {}, {"alice": "hash"})
+
+    with open(path, "rb") as f:
+        assert f.read(2) == storage.GZIP_MAGIC
+    with gzip.open(path, "rb") as f:
+        assert b"\n" not in f.read()
+    loaded_docs, loaded_meta, _, loaded_users = load_storage(path, VectorStore())
+    assert loaded_docs == documents
+    assert loaded_meta[0].owner == "alice"
+    assert loaded_users == {"alice": "hash"}
+
+
+def test_zst_snapshot_without_zstandard(tmp_path, monkeypatch):
+    """Test a compressed snapshot fails clearly when zstandard is missing."""
+    monkeypatch.setattr(storage, "zstandard", None)
+    path = str(tmp_path / "storage.json")
+    with open(path, "wb") as f:
+        f.write(storage.ZSTD_MAGIC + b"\x00" * 8)
+
+    with pytest.raises(RuntimeError, match="zstandard"):
+        load_storage(path, VectorStore())
+
+
+def test_failed_save_keeps_snapshot_and_cleans_up(store, tmp_path, monkeypatch):
+    """Test a save that fails mid-write leaves the old snapshot and no temp file."""
+    path, documents, metadata, clusters, users = store
+    with open(path, "rb") as f:
+        before = f.read()
+
+    def failing_fsync(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(storage.os, "fsync", failing_fsync)
+    with pytest.raises(OSError):
+        save_storage(path, {0: "changed"}, {}, {}, {})
+
+    with open(path, "rb") as f:
+        assert f.read() == before
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_repository_changes_replayed_from_journal(tmp_path, monkeypatch):
+    """Test writes append to the journal, replay on load, and compact."""
+    from backend import repository as repository_module
+
+    path = str(tmp_path / "storage.json")
+    repo = KnowledgeBankRepository(storage_path=path)
+    await repo.add_document("Docker basics", make_meta(0))
+    await repo.add_document("Kubernetes pods", make_meta(1))
+    await repo.add_user("alice", "hash")
+    await repo.delete_document(0)
+
+    # Only the journal was written
+    assert not os.path.exists(path)
+    assert os.path.exists(path + ".log")
+
+    reloaded = KnowledgeBankRepository(storage_path=path)
+    assert reloaded.documents == {1: "Kubernetes pods"}
+    assert list(reloaded.metadata) == [1]
+    assert reloaded.users == {"alice": "hash"}
+    assert reloaded.vector_store.search("kubernetes", top_k=1)[0][0] == 1
+
+    # Reaching the threshold folds the journal into the snapshot
+    monkeypatch.setattr(repository_module, "STORAGE_LOG_COMPACT_RECORDS", 1)
+    await reloaded.add_user("bob", "hash2")
+    assert not os.path.exists(path + ".log")
+
+    compacted = KnowledgeBankRepository(storage_path=path)
+    assert compacted.documents == {1: "Kubernetes pods"}
+    assert compacted.users == {"alice": "hash", "bob": "hash2"}
+
+    # Deleting doc 0 left a gap: a new document must not take the live ID 1
+    assert await compacted.add_document("Helm charts", make_meta(2)) == 2
+    assert compacted.documents[1] == "Kubernetes pods"
@@ -0,0 +1,188 @@
+"""
+Tests for Whisper transcription helpers.
+
+The OpenAI client is patched out; no network calls or API key needed.
+"""
+
+import asyncio
+import subprocess
+import pytest
+from unittest.mock import patch
+
+from backend import ingest
+
+
+class FakeTranscriptions:
+    """Stand-in for client.audio.transcriptions tracking concurrency."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, model, file, response_format):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        name = file.name if hasattr(file, "name") else file[0]
+        # Later chunks finish first, to check results stay in order
+        await asyncio.sleep(0.05 if "000" in str(name) else 0.01)
+        self.active -= 1
+        return f"text of {str(name).rsplit('/', 1)[-1]}"
+
+
+class FakeAsyncOpenAI:
+    """Stand-in for openai.AsyncOpenAI."""
+
+    transcriptions = None
+
+    def __init__(self, api_key=None):
+        self.audio = type("Audio", (), {"transcriptions": FakeAsyncOpenAI.transcriptions})()
+
+    async def close(self):
+        pass
+
+
+class TestChunkedTranscription:
+    """Test transcribe_audio_chunks()."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_transcribed_concurrently_in_order(self, tmp_path, monkeypatch):
+        """Test chunks are sent in parallel (bounded) and reassembled in order."""
+        chunks = []
+        for i in range(6):
+            chunk = tmp_path / f"audio_chunk_{i:03d}.mp3"
+            chunk.write_bytes(b"audio")
+            chunks.append(chunk)
+
+        FakeAsyncOpenAI.transcriptions = FakeTranscriptions()
+        monkeypatch.setattr(ingest, "WHISPER_MAX_CONCURRENCY", 3)
+
+        with patch("openai.AsyncOpenAI", FakeAsyncOpenAI):
+            result = await ingest.transcribe_audio_chunks(
+                chunks, "Title", "Channel", 7200, "https://youtu.be/x"
+            )
+
+        assert FakeAsyncOpenAI.transcriptions.peak == 3
+        positions = [result.index(f"[Part {i}]\ntext of audio_chunk_{i - 1:03d}.mp3") for i in range(1, 7)]
+        assert positions == sorted(positions)
+        assert "split into 6 parts" in result
+
+    @pytest.mark.asyncio
+    async def test_chunks_compressed_before_upload(self, tmp_path):
+        """Test compressed chunks are uploaded as Ogg in sequence order."""
+        chunks = []
+        for i in range(3):
+            chunk = tmp_path / f"audio_chunk_{i:03d}.webm"
+            chunk.write_bytes(f"raw {i}".encode())
+            chunks.append(chunk)
+
+        FakeAsyncOpenAI.transcriptions = FakeTranscriptions()
+
+        with patch("openai.AsyncOpenAI", FakeAsyncOpenAI), \
+                patch.object(ingest, "compress_audio_for_whisper", lambda data, fmt: data.upper()):
+            result = await ingest.transcribe_audio_chunks(
+                chunks, "Title", "Channel", 900, "https://youtu.be/x", compress=True
+            )
+
+        assert result.index("text of audio_chunk_000.ogg") < result.index("text of audio_chunk_002.ogg")
+
+    @pytest.mark.asyncio
+    async def test_upload_failure_cancels_pipeline(self, tmp_path):
+        """Test a Whisper error propagates instead of hanging the pipeline."""
+        chunks = []
+        for i in range(10):
+            chunk = tmp_path / f"audio_chunk_{i:03d}.webm"
+            chunk.write_bytes(b"raw")
+            chunks.append(chunk)
+
+        class FailingTranscriptions:
+            async def create(self, **kwargs):
+                raise RuntimeError("rate limited")
+
+        FakeAsyncOpenAI.transcriptions = FailingTranscriptions()
+
+        with patch("openai.AsyncOpenAI", FakeAsyncOpenAI):
+            with pytest.raises(Exception, match="rate limited"):
+                await asyncio.wait_for(
+                    ingest.transcribe_audio_chunks(chunks, "T", "C", 1, "u"), timeout=5
+                )
+
+
+class TestAudioCompression:
+    """Test compress_audio_for_whisper()."""
+
+    def test_audio_piped_through_ffmpeg(self):
+        """Test audio goes through ffmpeg's stdin/stdout without temp files."""
+        calls = []
+
+        def fake_run(cmd, input=None, **kwargs):
+            calls.append((cmd, input))
+            return subprocess.CompletedProcess(cmd, 0, stdout=b"mp3", stderr=b"")
+
+        with patch("subprocess.run", fake_run):
+            assert ingest.compress_audio_for_whisper(b"original audio") == b"mp3"
+
+        cmd, stdin_bytes = calls[0]
+        assert cmd[cmd.index("-i") + 1] == "pipe:0"
+        assert cmd[-1] == "pipe:1"
+        assert stdin_bytes == b"original audio"
+
+    def test_unseekable_input_falls_back_to_temp_file(self):
+        """Test formats ffmpeg can't decode from a pipe are read from a file."""
+        inputs = []
+
+        def fake_run(cmd, input=None, **kwargs):
+            source = cmd[cmd.index("-i") + 1]
+            if source == "pipe:0":
+                raise subprocess.CalledProcessError(1, cmd, stderr=b"moov atom not found")
+            with open(source, "rb") as f:
+                inputs.append(f.read())
+            return subprocess.CompletedProcess(cmd, 0, stdout=b"mp3", stderr=b"")
+
+        with patch("subprocess.run", fake_run):
+            assert ingest.compress_audio_for_whisper(b"m4a audio") == b"mp3"
+
+        assert inputs == [b"m4a audio"]
+
+
+class TestYouTubeTranscription:
+    """Test transcribe_youtube() with yt-dlp and Whisper patched out."""
+
+    def test_native_audio_stream_sent_without_transcode(self, monkeypatch):
+        """Test the downloaded opus/webm stream goes to Whisper as-is."""
+        seen = {}
+
+        class FakeYoutubeDL:
+            def __init__(self, opts):
+                seen["opts"] = opts
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def extract_info(self, url, download):
+                with open(seen["opts"]["outtmpl"].replace("%(ext)s", "webm"), "wb") as f:
+                    f.write(b"opus audio")
+                return {"title": "Talk", "duration": 60, "channel": "Chan"}
+
+        class FakeOpenAI:
+            def __init__(self, api_key=None):
+                self.audio = self
+
+            @property
+            def transcriptions(self):
+                return self
+
+            def create(self, model, file, response_format):
+                seen["file"] = file
+                return "hello world"
+
+        monkeypatch.setattr(ingest, "OPENAI_API_KEY", "sk-test")
+        with patch("yt_dlp.YoutubeDL", FakeYoutubeDL), patch("openai.OpenAI", FakeOpenAI):
+            result = ingest.transcribe_youtube("https://youtu.be/x")
+
+        assert seen["opts"]["postprocessors"] == []
+        assert "acodec=opus" in seen["opts"]["format"]
+        assert seen["file"] == ("audio.webm", b"opus audio")
+        assert "Title: Talk" in result and "hello world" in result
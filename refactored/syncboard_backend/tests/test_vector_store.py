@@ -163,6 +163,11 @@ def test_search_snippet_generation():
     assert len(long_result[2]) == 103  # 100 chars + "..."
     assert long_result[2].endswith("...")
 
+    # Callers can ask for longer snippets (search_full uses SNIPPET_LENGTH)
+    results = vs.search("document", top_k=2, snippet_length=150)
+    long_result = [r for r in results if r[0] == 1][0]
+    assert long_result[2] == "A" * 150 + "..."
+
 
 def test_search_with_allowed_doc_ids():
     """Test filtering search results by allowed document IDs."""
@@ -221,6 +226,42 @@ def test_remove_document():
     assert id3 in vs.docs
 
 
+def test_remove_documents_rebuilds_once():
+    """Test removing several documents refits the index a single time."""
+    vs = VectorStore()
+    ids = vs.add_documents_batch(["Python programming", "JavaScript development", "Data science"])
+
+    rebuilds = []
+    original_rebuild = vs._rebuild_vectors
+    vs._rebuild_vectors = lambda: (rebuilds.append(1), original_rebuild())
+
+    vs.remove_documents([ids[0], ids[2], 99])
+
+    assert vs.doc_ids == [ids[1]]
+    assert len(rebuilds) == 1
+    assert [hit[0] for hit in vs.search("development", top_k=10)] == [ids[1]]
+
+
+def test_similar_pairs_matches_search_by_doc_id():
+    """Test pairwise similarities agree with per-document ranking."""
+    vs = VectorStore()
+    ids = vs.add_documents_batch([
+        "Python web framework tutorial",
+        "Python web framework guide",
+        "Baking sourdough bread at home",
+        "Python tutorial for the web",
+    ])
+
+    pairs = vs.similar_pairs(ids, threshold=0.1)
+
+    for doc_id in ids:
+        expected = [(other, score) for other, score in vs.search_by_doc_id(doc_id, top_k=10) if score >= 0.1]
+        assert [other for other, _ in pairs.get(doc_id, [])] == [other for other, _ in expected]
+        for (_, got), (_, want) in zip(pairs.get(doc_id, []), expected):
+            assert got == pytest.approx(want, abs=1e-5)
+    assert ids[2] not in pairs
+
+
 def test_remove_document_updates_search():
     """Test that search results update after document removal."""
     vs = VectorStore()
@@ -242,6 +283,35 @@ def test_remove_document_updates_search():
     assert len(results) == 1
 
 
+def test_add_after_gapped_batch_load_gets_fresh_id():
+    """Test IDs assigned after a load with gaps never reuse a live ID."""
+    vs = VectorStore()
+    vs.add_documents_batch(["alice secret doc zero", "bob doc two"], [0, 2])
+
+    new_id = vs.add_document("bob new upload")
+    batch_ids = vs.add_documents_batch(["more", "uploads"])
+
+    assert new_id == 3
+    assert batch_ids == [4, 5]
+    assert vs.docs[0] == "alice secret doc zero"
+    assert vs.docs[2] == "bob doc two"
+
+
+def test_add_after_remove_gets_fresh_id():
+    """Test a removed document's ID, and live IDs, are not handed out again."""
+    vs = VectorStore()
+    ids = [vs.add_document(text) for text in ["zero", "one", "two"]]
+
+    vs.remove_document(ids[0])
+    new_id = vs.add_document("three")
+
+    assert new_id == 3
+    assert vs.docs[ids[2]] == "two"
+
+    vs.remove_documents([new_id])
+    assert vs.add_document("four") == 4
+
+
 def test_remove_nonexistent_document():
     """Test removing non-existent document doesn't crash."""
     vs = VectorStore()
@@ -624,5 +694,41 @@ def test_batch_add_performance():
     assert batch_time < sequential_time / 2
 
 
+
+def test_search_uses_published_index_during_rebuild():
+    """Test a search mid-insertion sees the last complete index, not a mix."""
+    vs = VectorStore()
+    vs.add_documents_batch(["python programming", "java programming"])
+
+    # State an add_document running in a worker thread has before refitting
+    vs.docs[2] = "rust programming"
+    vs.doc_ids.append(2)
+
+    results = vs.search("programming", top_k=5)
+    assert sorted(doc_id for doc_id, _, _ in results) == [0, 1]
+    assert [doc_id for doc_id, _ in vs.search_by_doc_id(0)] == [1]
+
+
+
+def test_search_top_k_ties_keep_insertion_order():
+    """Test partial top-k selection orders ties like a full stable sort."""
+    vs = VectorStore()
+    vs.add_documents_batch(["apple"] * 6 + ["banana"] * 2)
+
+    assert [doc_id for doc_id, _, _ in vs.search("apple", top_k=3)] == [0, 1, 2]
+    assert [doc_id for doc_id, _, _ in vs.search("apple", top_k=2, allowed_doc_ids=[5, 3, 7])] == [3, 5]
+    assert vs.search("apple", top_k=3, allowed_doc_ids=[42]) == []
+
+
+
+def test_index_stored_as_float32():
+    """Test the TF-IDF matrix is kept in single precision."""
+    vs = VectorStore()
+    vs.add_documents_batch(["python programming", "java programming"])
+
+    assert vs.doc_matrix.dtype == np.float32
+    assert vs.search("python", top_k=1)[0][0] == 0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
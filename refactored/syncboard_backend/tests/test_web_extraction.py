@@ -0,0 +1,141 @@
+"""
+Tests for web article extraction.
+
+Tests extract_web_article() with the HTTP layer patched out:
+- Main content selection and boilerplate stripping
+- Streaming download size cap
+- Conditional GET revalidation of cached pages
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from backend import ingest
+from backend.ingest import extract_web_article
+
+
+@pytest.fixture(autouse=True)
+def web_cache(monkeypatch):
+    """Replace the database-backed web cache with a dict."""
+    cache = {}
+    monkeypatch.setattr(ingest, "_load_web_cache", cache.get)
+    monkeypatch.setattr(
+        ingest, "_store_web_cache",
+        lambda url, etag, last_modified, text: cache.__setitem__(
+            url, {"etag": etag, "last_modified": last_modified, "text": text}
+        )
+    )
+    return cache
+
+
+@pytest.fixture
+def http_get(monkeypatch):
+    """Patch the shared HTTP session; set .return_value to the fake response."""
+    session = MagicMock()
+    monkeypatch.setattr(ingest, "_http_session", lambda: session)
+    return session.get
+
+
+def _fake_response(body: bytes, chunk_size: int = 4, status_code: int = 200, headers=None):
+    """Build a streaming requests response yielding body in chunks."""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.iter_content.side_effect = lambda size: (
+        body[i:i + chunk_size] for i in range(0, len(body), chunk_size)
+    )
+    return response
+
+
+class TestWebArticleExtraction:
+    """Test extract_web_article()."""
+
+    def test_extracts_main_content(self, http_get):
+        """Test the article body is extracted and navigation stripped."""
+        html = b"""<html><head><title>Docker Guide</title></head><body>
+            <nav>Home | About</nav>
+            <article><h1>Containers</h1><p>Docker packages apps.</p><script>x()</script></article>
+            <footer>Copyright</footer>
+        </body></html>"""
+
+        http_get.return_value = _fake_response(html)
+        result = extract_web_article("https://example.com/docker")
+
+        assert http_get.call_args.kwargs["stream"] is True
+        assert "Title: Docker Guide" in result
+        assert "Containers\nDocker packages apps." in result
+        assert "Home | About" not in result
+        assert "x()" not in result
+        assert "Copyright" not in result
+
+    def test_parsers_agree(self):
+        """Test the selectolax and BeautifulSoup parsers extract the same text."""
+        pytest.importorskip("selectolax")
+        html = b"""<html><head><title>Guide</title></head><body>
+            <header>Site</header>
+            <main><p>Main text</p></main>
+            <article><p>First</p><style>p {}</style><p>Second</p></article>
+        </body></html>"""
+
+        title, lines = ingest._parse_article_selectolax(html)
+
+        assert (title, lines) == ingest._parse_article_bs4(html)
+        assert lines == ["First", "Second"]
+
+    def test_content_selector_priority(self):
+        """Test selector priority wins over document order in the single pass."""
+        html = b"""<html><body>
+            <div class="content"><p>Wrapper intro</p><article><p>Story</p></article></div>
+            <main><p>Main text</p></main>
+        </body></html>"""
+
+        parsers = [ingest._parse_article_bs4]
+        try:
+            import selectolax  # noqa: F401
+            parsers.append(ingest._parse_article_selectolax)
+        except ImportError:
+            pass
+
+        for parse in parsers:
+            assert parse(html)[1] == ["Story"]
+
+    def test_oversized_page_is_rejected(self, monkeypatch, http_get):
+        """Test downloads abort once the size cap is exceeded."""
+        monkeypatch.setattr(ingest, "WEB_MAX_SIZE_BYTES", 16)
+        http_get.return_value = _fake_response(b"<html>" + b"a" * 64 + b"</html>")
+
+        with pytest.raises(Exception, match="limit"):
+            extract_web_article("https://example.com/huge")
+
+    def test_unchanged_page_served_from_cache(self, web_cache, http_get):
+        """Test a 304 on revalidation returns the cached article."""
+        html = b"<html><head><title>Doc</title></head><body><main>Body</main></body></html>"
+        http_get.return_value = _fake_response(
+            html, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        )
+        original = extract_web_article("https://example.com/doc")
+
+        assert web_cache["https://example.com/doc"]["etag"] == '"v1"'
+
+        http_get.return_value = _fake_response(b"", status_code=304)
+        cached = extract_web_article("https://example.com/doc")
+
+        sent = http_get.call_args.kwargs["headers"]
+        assert sent["If-None-Match"] == '"v1"'
+        assert sent["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert cached == original
+
+    def test_pages_without_validators_not_cached(self, web_cache, http_get):
+        """Test pages lacking ETag/Last-Modified are not stored."""
+        http_get.return_value = _fake_response(b"<html><body>x</body></html>")
+        extract_web_article("https://example.com/dynamic")
+
+        assert web_cache == {}
+
+    def test_http_session_is_shared(self):
+        """Test web ingest reuses one pooled session with retries."""
+        session = ingest._http_session()
+
+        assert ingest._http_session() is session
+        assert session.get_adapter("https://example.com").max_retries.total == 2